@@ -0,0 +1,147 @@
+"""Local store of daily BTC/USD closes
+
+Backfill it from a dump, e.g.:
+
+    python btc_history.py backfill btc-usd.csv
+
+CSV files need `date` and `close` columns (YYYY-MM-DD). JSON files can be a
+list of {"date", "close"} objects, a list of [date, close] pairs, or a
+CoinGecko market_chart response ({"prices": [[unix_ms, price], ...]}).
+"""
+import csv
+import json
+import os
+import sqlite3
+import sys
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from settings import settings
+
+BTC_HISTORY_DB = settings.btc_history_db
+
+class BtcHistoryStore:
+    """Daily BTC closes in SQLite, mirrored into sorted in-memory arrays for lookups"""
+
+    def __init__(self, path: str = BTC_HISTORY_DB):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._dates: Optional[List[str]] = None
+        self._closes: List[float] = []
+        # Bumped when a close other than today's changes (new day, backfill)
+        self.version = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS btc_daily (date TEXT PRIMARY KEY, close REAL NOT NULL)"
+            )
+        return self._conn
+
+    def _load(self) -> None:
+        try:
+            rows = self._connect().execute("SELECT date, close FROM btc_daily ORDER BY date").fetchall()
+        except (OSError, sqlite3.Error) as e:
+            # e.g. read-only filesystem: behave as an empty history
+            print(f"Warning: BTC history unavailable at {self.path}: {e}")
+            rows = []
+        self._dates = [row[0] for row in rows]
+        self._closes = [row[1] for row in rows]
+
+    def upsert(self, rows: Iterable[Tuple[str, float]]) -> int:
+        """Insert or replace (date, close) rows; returns the number written"""
+        rows = list(rows)
+        conn = self._connect()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO btc_daily (date, close) VALUES (?, ?)", rows)
+        # Re-read lazily on the next lookup
+        self._dates = None
+        self.version += 1
+        return len(rows)
+
+    def record_price(self, price: float, when: Optional[datetime] = None) -> None:
+        """Store a spot price as the close of its UTC day (later calls overwrite it)"""
+        when = when or datetime.now(timezone.utc)
+        date = when.strftime("%Y-%m-%d")
+        conn = self._connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO btc_daily (date, close) VALUES (?, ?)", (date, price))
+        if self._dates is not None:
+            if self._dates and self._dates[-1] == date:
+                self._closes[-1] = price
+            elif not self._dates or self._dates[-1] < date:
+                self._dates.append(date)
+                self._closes.append(price)
+                self.version += 1
+            else:
+                self._dates = None
+                self.version += 1
+        else:
+            self.version += 1
+
+    def close_on_or_before(self, date: str) -> Optional[float]:
+        """Close for the given YYYY-MM-DD date, or the latest one before it"""
+        return self.closes_on_or_before([date])[0]
+
+    def closes_on_or_before(self, dates: List[str]) -> List[Optional[float]]:
+        """Closes for many dates with one pass over the sorted index"""
+        if self._dates is None:
+            self._load()
+        closes = []
+        for date in dates:
+            index = bisect_right(self._dates, date) - 1
+            closes.append(self._closes[index] if index >= 0 else None)
+        return closes
+
+    def starts_on_or_before(self, date: str) -> bool:
+        """Whether the stored closes go back to the given date"""
+        if self._dates is None:
+            self._load()
+        return bool(self._dates) and self._dates[0] <= date
+
+    def __len__(self) -> int:
+        if self._dates is None:
+            self._load()
+        return len(self._dates)
+
+    def backfill_from_file(self, path: str) -> int:
+        """Load closes from a CSV or JSON dump; returns the number of rows written"""
+        if path.endswith(".csv"):
+            with open(path, newline="") as f:
+                rows = [(row["date"][:10], float(row["close"])) for row in csv.DictReader(f)]
+        else:
+            with open(path) as f:
+                data = json.load(f)
+            rows = parse_json_dump(data)
+        return self.upsert(rows)
+
+def parse_json_dump(data) -> List[Tuple[str, float]]:
+    """Turn a JSON dump into (date, close) rows, keeping the last price of each day"""
+    if isinstance(data, dict) and "prices" in data:
+        daily = {}
+        for timestamp_ms, price in data["prices"]:
+            date = datetime.fromtimestamp(timestamp_ms / 1000, timezone.utc).strftime("%Y-%m-%d")
+            daily[date] = float(price)
+        return sorted(daily.items())
+    rows = []
+    for entry in data:
+        if isinstance(entry, dict):
+            rows.append((entry["date"][:10], float(entry["close"])))
+        else:
+            rows.append((str(entry[0])[:10], float(entry[1])))
+    return rows
+
+# Shared store used by the app
+btc_history = BtcHistoryStore()
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] != "backfill":
+        print("Usage: python btc_history.py backfill <file.csv|file.json>")
+        sys.exit(1)
+    written = btc_history.backfill_from_file(sys.argv[2])
+    print(f"Stored {written} daily closes in {btc_history.path} ({len(btc_history)} total)")
@@ -0,0 +1,164 @@
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from http_client import HTTP_CONNECT_TIMEOUT, HTTP_TIMEOUT, get_http_client
+from settings import settings
+
+# "hedged": ask the next source if the current one hasn't answered within
+# BTC_HEDGE_DELAY seconds, first answer wins. "median": ask every source and
+# take the weighted median of the quotes that aren't outliers.
+BTC_PRICE_MODE = settings.btc_price_mode
+BTC_HEDGE_DELAY = settings.btc_hedge_delay
+# Quotes further than this fraction from the median are dropped in median mode
+BTC_OUTLIER_TOLERANCE = settings.btc_outlier_tolerance
+
+class PriceSource:
+    """An HTTP JSON endpoint quoting BTC in USD"""
+
+    def __init__(self, name: str, url: str, path: Sequence[str],
+                 timeout: float = HTTP_TIMEOUT, weight: float = 1.0):
+        self.name = name
+        self.url = url
+        self.path = list(path)  # keys (or list indexes) leading to the price
+        self.timeout = timeout
+        self.weight = weight
+
+    async def fetch(self) -> float:
+        """Fetch the quote, giving up after this source's timeout"""
+        return await asyncio.wait_for(self._fetch(), self.timeout)
+
+    async def _fetch(self) -> float:
+        client = get_http_client()
+        response = await client.get(
+            self.url, timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, HTTP_CONNECT_TIMEOUT))
+        )
+        response.raise_for_status()
+        value: Any = response.json()
+        for key in self.path:
+            value = value[int(key)] if isinstance(value, list) else value[key]
+        price = float(value)
+        if price <= 0:
+            raise ValueError(f"{self.name} returned a non-positive price: {price}")
+        return price
+
+# Sources that can be enabled by name in BTC_PRICE_SOURCES
+KNOWN_SOURCES: Dict[str, Dict[str, Any]] = {
+    "coingecko": {
+        "url": "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd",
+        "path": ["bitcoin", "usd"]
+    },
+    "coinbase": {
+        "url": "https://api.coinbase.com/v2/prices/BTC-USD/spot",
+        "path": ["data", "amount"]
+    },
+    "kraken": {
+        "url": "https://api.kraken.com/0/public/Ticker?pair=XBTUSD",
+        "path": ["result", "XXBTZUSD", "c", "0"]
+    }
+}
+
+def load_price_sources(config: Optional[str] = None) -> List[PriceSource]:
+    """Sources from BTC_PRICE_SOURCES, in the order they are tried
+
+    Either comma-separated names from KNOWN_SOURCES, or a JSON list of
+    objects with name, url, path and optional timeout and weight (a name
+    from KNOWN_SOURCES may omit url and path).
+    """
+    if config is None:
+        config = settings.btc_price_sources
+    if config.strip().startswith("["):
+        entries = json.loads(config)
+    else:
+        entries = [{"name": name.strip()} for name in config.split(",") if name.strip()]
+
+    sources = []
+    for entry in entries:
+        spec = {**KNOWN_SOURCES.get(entry["name"], {}), **entry}
+        if "url" not in spec or "path" not in spec:
+            print(f"Warning: unknown BTC price source {entry['name']!r}, skipping")
+            continue
+        sources.append(PriceSource(
+            spec["name"], spec["url"], spec["path"],
+            timeout=float(spec.get("timeout", HTTP_TIMEOUT)),
+            weight=float(spec.get("weight", 1.0))
+        ))
+    return sources
+
+def weighted_median(quotes: List[Tuple[float, float]]) -> float:
+    """Median of (price, weight) pairs, each price counted by its weight"""
+    quotes = sorted(quotes)
+    half = sum(weight for _, weight in quotes) / 2
+    cumulative = 0.0
+    for price, weight in quotes:
+        cumulative += weight
+        if cumulative >= half:
+            return price
+    return quotes[-1][0]
+
+class BtcPriceAggregator:
+    """BTC price from several sources, hedged or by median"""
+
+    def __init__(self, sources: List[PriceSource], mode: str = BTC_PRICE_MODE,
+                 hedge_delay: float = BTC_HEDGE_DELAY, outlier_tolerance: float = BTC_OUTLIER_TOLERANCE):
+        if not sources:
+            raise ValueError("At least one BTC price source is required")
+        if mode not in ("hedged", "median"):
+            raise ValueError(f"Unknown BTC price mode: {mode}")
+        self.sources = sources
+        self.mode = mode
+        self.hedge_delay = hedge_delay
+        self.outlier_tolerance = outlier_tolerance
+
+    async def fetch(self) -> float:
+        if self.mode == "median":
+            return await self._median()
+        return await self._hedged()
+
+    async def _hedged(self) -> float:
+        remaining = iter(self.sources)
+        pending: Dict[asyncio.Task, PriceSource] = {}
+        errors = []
+
+        def start_next() -> None:
+            source = next(remaining, None)
+            if source is not None:
+                pending[asyncio.ensure_future(source.fetch())] = source
+
+        start_next()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, timeout=self.hedge_delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    source = pending.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    errors.append(f"{source.name}: {task.exception()!r}")
+                # Either nothing answered in time or a source failed: try the next one too
+                start_next()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise RuntimeError(f"All BTC price sources failed ({'; '.join(errors)})")
+
+    async def _median(self) -> float:
+        results = await asyncio.gather(
+            *(source.fetch() for source in self.sources), return_exceptions=True
+        )
+        quotes = [
+            (price, source.weight) for source, price in zip(self.sources, results)
+            if not isinstance(price, BaseException)
+        ]
+        if not quotes:
+            errors = "; ".join(f"{s.name}: {e!r}" for s, e in zip(self.sources, results))
+            raise RuntimeError(f"All BTC price sources failed ({errors})")
+        median = weighted_median(quotes)
+        kept = [(price, weight) for price, weight in quotes
+                if abs(price - median) <= median * self.outlier_tolerance]
+        return weighted_median(kept)
+
+btc_price_aggregator = BtcPriceAggregator(load_price_sources() or load_price_sources("coingecko"))
@@ -0,0 +1,195 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from refresher import REFRESH_AHEAD
+from settings import settings
+
+# How long a node may hold a refresh lock (longer than the slowest upstream timeout)
+LOCK_TTL = settings.cache_lock_ttl
+# How long a node waits for another node's refresh when it has nothing to serve
+LOCK_WAIT = settings.cache_lock_wait
+LOCK_POLL_INTERVAL = 0.05
+
+Entry = Tuple[Any, float]  # (value, fetched_at unix time)
+
+class CacheBackend(ABC):
+    """Storage shared by every node: prices plus a lock per key"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Entry]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, fetched_at: float) -> None:
+        ...
+
+    @abstractmethod
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        """Take the lock for key; returns a token, or None if another node holds it"""
+
+    @abstractmethod
+    async def release_lock(self, key: str, token: str) -> None:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process backend, for a single node or as a test stand-in for Redis"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._entries: Dict[str, Entry] = {}
+        self._locks: Dict[str, Tuple[str, float]] = {}
+
+    async def get(self, key: str) -> Optional[Entry]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: Any, fetched_at: float) -> None:
+        self._entries[key] = (value, fetched_at)
+
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        held = self._locks.get(key)
+        if held is not None and self.clock() < held[1]:
+            return None
+        token = uuid.uuid4().hex
+        self._locks[key] = (token, self.clock() + ttl)
+        return token
+
+    async def release_lock(self, key: str, token: str) -> None:
+        held = self._locks.get(key)
+        if held is not None and held[0] == token:
+            del self._locks[key]
+
+# Delete the lock only if it is still ours (it may have expired and been retaken)
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+class RedisCacheBackend(CacheBackend):
+    """Backend for any Redis-protocol server, using a redis.asyncio client
+
+    Values are JSON with their fetch time; locks are SET NX PX keys released
+    with a compare-and-delete script.
+    """
+
+    def __init__(self, client: Any, prefix: str = "pricing-bitcoin:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "pricing-bitcoin:") -> "RedisCacheBackend":
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND_URL needs the redis package (pip install redis)")
+        return cls(redis.from_url(url), prefix)
+
+    async def get(self, key: str) -> Optional[Entry]:
+        raw = await self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return data["value"], data["fetched_at"]
+
+    async def set(self, key: str, value: Any, fetched_at: float) -> None:
+        await self.client.set(self.prefix + key, json.dumps({"value": value, "fetched_at": fetched_at}))
+
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        acquired = await self.client.set(f"{self.prefix}lock:{key}", token, nx=True, px=int(ttl * 1000))
+        return token if acquired else None
+
+    async def release_lock(self, key: str, token: str) -> None:
+        await self.client.eval(_RELEASE_SCRIPT, 1, f"{self.prefix}lock:{key}", token)
+
+    async def close(self) -> None:
+        close = getattr(self.client, "aclose", None) or self.client.close
+        await close()
+
+def create_cache_backend(url: Optional[str]) -> Optional[CacheBackend]:
+    """Backend for CACHE_BACKEND_URL (redis:// or rediss://), or None for node-local caching"""
+    if not url:
+        return None
+    if url == "memory://":
+        return MemoryCacheBackend()
+    try:
+        return RedisCacheBackend.from_url(url)
+    except Exception as e:
+        print(f"Warning: cache backend disabled: {e}")
+        return None
+
+class DistributedPriceCache:
+    """Fetch prices through a backend shared by every node
+
+    A value fetched by any node within the refresh-ahead part of its TTL is
+    reused. Otherwise one node takes the key's lock and fetches while the
+    others serve the previous value, or wait for the new one if there is
+    none. Without a backend, every call goes straight to the fetch.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None,
+                 lock_ttl: float = LOCK_TTL, lock_wait: float = LOCK_WAIT):
+        self.backend = backend
+        self.lock_ttl = lock_ttl
+        self.lock_wait = lock_wait
+
+    async def load(self, key: str, ttl: Optional[float],
+                   fetch: Callable[[], Awaitable[Any]]) -> Entry:
+        """(value, fetched_at) for key, calling fetch only if no node has a recent value"""
+        if self.backend is None or ttl is None:
+            return await fetch(), time.time()
+        try:
+            entry = await self.backend.get(key)
+            if entry is not None and time.time() - entry[1] < ttl * REFRESH_AHEAD:
+                return entry
+            token = await self.backend.acquire_lock(key, self.lock_ttl)
+        except Exception as e:
+            print(f"Warning: cache backend unavailable, fetching {key} directly: {e}")
+            return await fetch(), time.time()
+
+        if token is None:
+            # Another node is refreshing: serve what it last stored, or wait for it
+            if entry is not None:
+                return entry
+            return await self._wait_for_refresh(key, fetch)
+
+        try:
+            value = await fetch()
+            fetched_at = time.time()
+            await self._quietly(self.backend.set(key, value, fetched_at))
+            return value, fetched_at
+        finally:
+            await self._quietly(self.backend.release_lock(key, token))
+
+    async def _wait_for_refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Entry:
+        deadline = time.monotonic() + self.lock_wait
+        try:
+            while time.monotonic() < deadline:
+                await asyncio.sleep(LOCK_POLL_INTERVAL)
+                entry = await self.backend.get(key)
+                if entry is not None:
+                    return entry
+        except Exception as e:
+            print(f"Warning: cache backend unavailable, fetching {key} directly: {e}")
+        return await fetch(), time.time()
+
+    async def _quietly(self, operation: Awaitable[Any]) -> None:
+        try:
+            await operation
+        except Exception as e:
+            print(f"Warning: cache backend write failed: {e}")
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+# Shared across nodes when CACHE_BACKEND_URL is set (e.g. redis://cache:6379/0)
+distributed_cache = DistributedPriceCache(create_cache_backend(settings.cache_backend_url))
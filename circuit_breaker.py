@@ -0,0 +1,149 @@
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+import httpx
+
+from settings import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Breaker settings, overridable through the environment
+BREAKER_WINDOW = settings.breaker_window  # recent calls considered
+BREAKER_MIN_CALLS = settings.breaker_min_calls
+BREAKER_FAILURE_RATE = settings.breaker_failure_rate
+BREAKER_SLOW_CALL_SECONDS = settings.breaker_slow_call_seconds
+BREAKER_OPEN_SECONDS = settings.breaker_open_seconds
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of calling an upstream whose breaker is open"""
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one upstream host
+
+    Errors, 5xx/429 responses and calls slower than slow_call_seconds count
+    as failures. Once at least min_calls of the last window calls have a
+    failure rate of failure_rate or more, the breaker opens and calls are
+    refused for open_seconds. Then a single probe is let through
+    (half-open): success closes the breaker, failure opens it again.
+    """
+
+    def __init__(self, name: str, window: int = BREAKER_WINDOW, min_calls: int = BREAKER_MIN_CALLS,
+                 failure_rate: float = BREAKER_FAILURE_RATE,
+                 slow_call_seconds: float = BREAKER_SLOW_CALL_SECONDS,
+                 open_seconds: float = BREAKER_OPEN_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.clock = clock
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.rejected = 0
+        self._calls: Deque[Tuple[bool, float]] = deque(maxlen=window)  # (failed, latency)
+        self._probe_in_flight = False
+
+    def is_open(self) -> bool:
+        """True while calls are being refused (without taking a half-open probe)"""
+        if self.state == OPEN:
+            return self.clock() - self.opened_at < self.open_seconds
+        return self.state == HALF_OPEN and self._probe_in_flight
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead; in half-open only one probe at a time"""
+        if self.state == OPEN and self.clock() - self.opened_at >= self.open_seconds:
+            self.state = HALF_OPEN
+        if self.state == CLOSED or (self.state == HALF_OPEN and not self._probe_in_flight):
+            self._probe_in_flight = self.state == HALF_OPEN
+            return True
+        self.rejected += 1
+        return False
+
+    def record(self, failed: bool, latency: float) -> None:
+        failed = failed or latency >= self.slow_call_seconds
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = False
+            if failed:
+                self._open()
+            else:
+                self.state = CLOSED
+                self._calls.clear()
+            return
+        self._calls.append((failed, latency))
+        if len(self._calls) >= self.min_calls and self._failure_rate() >= self.failure_rate:
+            self._open()
+
+    def abandon(self) -> None:
+        """Forget a call that never finished, freeing the half-open probe"""
+        self._probe_in_flight = False
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_at = self.clock()
+        self._calls.clear()
+
+    def _failure_rate(self) -> float:
+        if not self._calls:
+            return 0.0
+        return sum(failed for failed, _ in self._calls) / len(self._calls)
+
+    def status(self) -> Dict[str, Any]:
+        latencies = sorted(latency for _, latency in self._calls)
+        state = self.state
+        if state == OPEN and self.clock() - self.opened_at >= self.open_seconds:
+            state = HALF_OPEN  # the next call will be let through as a probe
+        return {
+            "state": state,
+            "failure_rate": round(self._failure_rate(), 4),
+            "calls": len(latencies),
+            "median_latency": round(latencies[len(latencies) // 2], 4) if latencies else None,
+            "retry_in": (
+                round(max(0.0, self.open_seconds - (self.clock() - self.opened_at)), 3)
+                if state == OPEN else None
+            ),
+            "rejected": self.rejected
+        }
+
+class CircuitBreakerTransport(httpx.AsyncBaseTransport):
+    """Transport that sends requests through a breaker before the real transport"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, breaker: CircuitBreaker):
+        self.transport = transport
+        self.breaker = breaker
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {self.breaker.name}", request=request)
+        started = self.breaker.clock()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except Exception:
+            self.breaker.record(True, self.breaker.clock() - started)
+            raise
+        except BaseException:
+            # Cancelled: neither a success nor a failure of the upstream
+            self.breaker.abandon()
+            raise
+        failed = response.status_code >= 500 or response.status_code == 429
+        self.breaker.record(failed, self.breaker.clock() - started)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+# One breaker per upstream host, shared by every client
+circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    if host not in circuit_breakers:
+        circuit_breakers[host] = CircuitBreaker(host)
+    return circuit_breakers[host]
+
+def upstream_available(host: str) -> bool:
+    """False while the host's breaker is refusing calls"""
+    breaker = circuit_breakers.get(host)
+    return breaker is None or not breaker.is_open()
@@ -0,0 +1,10 @@
+import os
+import tempfile
+
+# Keep persisted quota, price, history and snapshot state out of the real locations
+_state_dir = tempfile.mkdtemp(prefix="pricing-bitcoin-tests-")
+os.environ.setdefault("QUOTA_STATE_DIR", _state_dir)
+os.environ.setdefault("PRICE_STORE_PATH", os.path.join(_state_dir, "prices.sqlite3"))
+os.environ.setdefault("BTC_HISTORY_DB", os.path.join(_state_dir, "btc_history.sqlite3"))
+os.environ.setdefault("SHARED_PRICES_PATH", os.path.join(_state_dir, "shared_prices.bin"))
+os.environ.setdefault("PRICE_SNAPSHOT_PATH", os.path.join(_state_dir, "price_snapshot.json"))
@@ -0,0 +1,67 @@
+from typing import NamedTuple
+
+# Conversions run on integers: amounts in sats, prices in micro-USD (1e-6 USD)
+# and item quantities in millionths. Every result is rounded half-to-even
+# exactly once, at its output precision.
+SATS_PER_BTC = 100_000_000
+MICROS = 1_000_000
+MICROS_PER_CENT = 10_000
+
+class Conversion(NamedTuple):
+    quantity: float  # items (6 decimals), BTC (8 decimals) or whole sats
+    usd_item: float  # cents
+    usd_total: float  # cents
+    btc_price: float  # cents
+
+def div_round(numerator: int, denominator: int) -> int:
+    """numerator / denominator rounded half-to-even (both non-negative)"""
+    quotient, remainder = divmod(numerator, denominator)
+    if 2 * remainder > denominator or (2 * remainder == denominator and quotient & 1):
+        quotient += 1
+    return quotient
+
+def to_sats(amount: float, sats: bool) -> int:
+    """A BTC amount (or a sats amount if sats is True) as whole sats"""
+    return round(amount) if sats else round(amount * SATS_PER_BTC)
+
+def to_micros(value: float) -> int:
+    """A USD price or item quantity in millionths"""
+    return round(value * MICROS)
+
+def _cents(micro_usd: int) -> float:
+    return div_round(micro_usd, MICROS_PER_CENT) / 100
+
+def btc_to_item(amount: float, sats: bool, btc_price: float, item_price: float) -> Conversion:
+    """How many items a BTC (or sats) amount buys"""
+    amount_sats = to_sats(amount, sats)
+    btc_micro = to_micros(btc_price)
+    item_micro = to_micros(item_price)
+    # usd_total = sats * btc_price / 1e8, kept exact as a numerator until rounding
+    usd_numerator = amount_sats * btc_micro
+    return Conversion(
+        quantity=div_round(usd_numerator * MICROS, SATS_PER_BTC * item_micro) / MICROS,
+        usd_item=_cents(item_micro),
+        usd_total=div_round(usd_numerator, SATS_PER_BTC * MICROS_PER_CENT) / 100,
+        btc_price=_cents(btc_micro)
+    )
+
+def item_to_btc(quantity: float, sats: bool, btc_price: float, item_price: float) -> Conversion:
+    """How much BTC (or how many sats) a quantity of an item costs"""
+    quantity_micro = to_micros(quantity)
+    btc_micro = to_micros(btc_price)
+    item_micro = to_micros(item_price)
+    # usd_total = quantity * item_price, in micro-USD times MICROS
+    usd_numerator = quantity_micro * item_micro
+    btc_needed_sats = div_round(usd_numerator * SATS_PER_BTC, MICROS * btc_micro)
+    return Conversion(
+        quantity=float(btc_needed_sats) if sats else btc_needed_sats / SATS_PER_BTC,
+        usd_item=_cents(item_micro),
+        usd_total=div_round(usd_numerator, MICROS * MICROS_PER_CENT) / 100,
+        btc_price=_cents(btc_micro)
+    )
+
+def convert_amount(direction: str, amount: float, sats: bool, btc_price: float, item_price: float) -> Conversion:
+    """Convert amount (BTC/sats for btc_to_item, item quantity for item_to_btc)"""
+    if direction == "btc_to_item":
+        return btc_to_item(amount, sats, btc_price, item_price)
+    return item_to_btc(amount, sats, btc_price, item_price)
@@ -0,0 +1,127 @@
+import json
+import re
+import time
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+Point = Tuple[str, float]  # (YYYY-MM-DD date, value)
+
+# Start of the points array in an Alpha Vantage commodity response:
+# {"name": ..., "interval": "daily", "unit": ..., "data": [{"date": ..., "value": ...}, ...]}
+_DATA_ARRAY = re.compile(r'"data"\s*:\s*\[')
+_SEPARATORS = " \t\r\n,"
+
+class DailySeries:
+    """One series of daily values, sorted by date for range lookups"""
+    __slots__ = ("dates", "values", "fetched_at")
+
+    def __init__(self, points: Iterable[Point], fetched_at: Optional[float] = None):
+        # Later points for the same date win
+        by_date = dict(points)
+        self.dates: List[str] = sorted(by_date)
+        self.values: List[float] = [by_date[day] for day in self.dates]
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def latest(self) -> Point:
+        return self.dates[-1], self.values[-1]
+
+    def slice(self, start: str, end: str) -> List[Point]:
+        """Points dated within [start, end]"""
+        lo = bisect_left(self.dates, start)
+        hi = bisect_right(self.dates, end)
+        return list(zip(self.dates[lo:hi], self.values[lo:hi]))
+
+    def expires_in(self, ttl: Optional[float]) -> float:
+        """Seconds until the series is ttl seconds old (0 once it is)"""
+        if ttl is None:
+            return float("inf")
+        return max(0.0, ttl - (time.time() - self.fetched_at))
+
+class DailySeriesParser:
+    """Incremental parser for an Alpha Vantage daily commodity response
+
+    Text is fed in chunks as it is downloaded. Each {"date", "value"} point
+    is decoded as soon as it is complete and the text before it dropped,
+    so the whole document is never held or turned into a dict. Points with
+    no value (".") are skipped.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._in_data = False
+        self._done = False
+        self._points: List[Point] = []
+
+    def feed(self, text: str) -> None:
+        self._buffer += text
+        if not self._in_data:
+            match = _DATA_ARRAY.search(self._buffer)
+            if match is None:
+                # Still in the short header (or an error response): keep it
+                return
+            self._buffer = self._buffer[match.end():]
+            self._in_data = True
+
+        buffer = self._buffer
+        pos = 0
+        while not self._done:
+            while pos < len(buffer) and buffer[pos] in _SEPARATORS:
+                pos += 1
+            if pos == len(buffer):
+                break
+            if buffer[pos] == "]":
+                self._done = True
+                pos += 1
+                break
+            try:
+                point, end = self._decoder.raw_decode(buffer, pos)
+            except ValueError:
+                # The point continues in the next chunk
+                break
+            self._add(point)
+            pos = end
+        self._buffer = "" if self._done else buffer[pos:]
+
+    def _add(self, point: Any) -> None:
+        try:
+            self._points.append((str(point["date"])[:10], float(point["value"])))
+        except (KeyError, TypeError, ValueError):
+            pass
+
+    def close(self, fetched_at: Optional[float] = None) -> Optional[DailySeries]:
+        """The parsed series, or None if the response had no data array
+
+        Raises ValueError if the data array was cut off.
+        """
+        if not self._in_data:
+            return None
+        if not self._done:
+            raise ValueError("Truncated daily series")
+        return DailySeries(self._points, fetched_at)
+
+    def document(self) -> Dict[str, Any]:
+        """The response as a dict when it had no data array (error and rate-limit messages)"""
+        return json.loads(self._buffer)
+
+class DailySeriesStore:
+    """Latest full daily series per upstream series ID"""
+
+    def __init__(self):
+        self._series: Dict[str, DailySeries] = {}
+
+    def get(self, series_id: str) -> Optional[DailySeries]:
+        return self._series.get(series_id)
+
+    def put(self, series_id: str, series: DailySeries) -> None:
+        # A full-history fetch replaces the previous one
+        self._series[series_id] = series
+
+    def clear(self) -> None:
+        self._series.clear()
+
+# Shared store filled by the Alpha Vantage fetchers
+daily_series = DailySeriesStore()
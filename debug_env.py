@@ -43,6 +43,15 @@ def check_env_vars():
     
     return all(var_value for var_value in env_vars.values())
 
+async def report_item_price(item_name: str, unit: str) -> None:
+    from items import fetch_item_price
+    from price_cache import FallbackPrice
+    try:
+        price = await fetch_item_price(item_name)
+        print(f"   ✅ Success: ${price:.2f} per {unit}")
+    except FallbackPrice as e:
+        print(f"   ⚠️  Using fallback price: ${e.price:.2f} (API key might be invalid)")
+
 async def test_api_calls():
     """Test actual API calls to verify keys work"""
     print("\n🧪 Testing API Calls...\n")
@@ -53,30 +62,15 @@ async def test_api_calls():
     try:
         # Test Alpha Vantage - Oil
         print("🛢️  Testing Alpha Vantage (Oil)...")
-        from items import fetch_oil_usd
-        oil_price = await fetch_oil_usd()
-        if oil_price != 75.0:  # Not the fallback price
-            print(f"   ✅ Success: ${oil_price:.2f} per barrel")
-        else:
-            print(f"   ⚠️  Using fallback price: ${oil_price:.2f} (API key might be invalid)")
+        await report_item_price("oil", "barrel")
         
         # Test Alpha Vantage - Gold
         print("🏆 Testing Alpha Vantage (Gold)...")
-        from items import fetch_gold_usd
-        gold_price = await fetch_gold_usd()
-        if gold_price != 2000.0:  # Not the fallback price
-            print(f"   ✅ Success: ${gold_price:.2f} per ounce")
-        else:
-            print(f"   ⚠️  Using fallback price: ${gold_price:.2f} (API key might be invalid)")
+        await report_item_price("gold", "ounce")
         
         # Test FRED - Bread
         print("🍞 Testing FRED API (Bread)...")
-        from items import fetch_bread_usd
-        bread_price = await fetch_bread_usd()
-        if bread_price != 2.50:  # Not the fallback price
-            print(f"   ✅ Success: ${bread_price:.2f} per loaf")
-        else:
-            print(f"   ⚠️  Using fallback price: ${bread_price:.2f} (API key might be invalid)")
+        await report_item_price("bread", "loaf")
         
     except Exception as e:
         print(f"❌ Error testing APIs: {e}")
@@ -89,14 +83,19 @@ async def test_conversion():
     print("\n💱 Testing Conversion API...\n")
     
     try:
-        from index import convert
+        from fastapi.testclient import TestClient
+        from main import app
         
         # Test conversion with oil
-        result = await convert(btc_amount=0.1, item='oil', direction='btc_to_item')
-        print(f"💰 Conversion Test: 0.1 BTC = {result.quantity:.2f} barrels of oil")
-        print(f"   Oil price: ${result.usd_item:.2f}")
-        print(f"   BTC price: ${result.btc_price:.2f}")
-        print(f"   Total value: ${result.usd_total:.2f}")
+        response = TestClient(app).get("/api/convert", params={
+            "btc_amount": 0.1, "item": "oil", "direction": "btc_to_item"
+        })
+        response.raise_for_status()
+        result = response.json()
+        print(f"💰 Conversion Test: 0.1 BTC = {result['quantity']:.2f} barrels of oil")
+        print(f"   Oil price: ${result['usd_item']:.2f}")
+        print(f"   BTC price: ${result['btc_price']:.2f}")
+        print(f"   Total value: ${result['usd_total']:.2f}")
         
         return True
         
@@ -0,0 +1,33 @@
+import json
+from typing import Any
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+def dumps(data: Any) -> bytes:
+    """Compact JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+def model_bytes(model: BaseModel) -> bytes:
+    """JSON for a flat model of numbers, strings and lists of them
+
+    Encodes the model's fields directly instead of going through
+    response-model validation and pydantic's serializer.
+    """
+    return dumps(model.__dict__)
+
+class FastJSONResponse(Response):
+    """JSON response whose content may already be encoded bytes"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
@@ -0,0 +1,106 @@
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+Observation = Tuple[str, str]  # (YYYY-MM-DD date, FRED value string)
+
+def _day_after(day: str) -> str:
+    return (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+
+def _day_before(day: str) -> str:
+    return (date.fromisoformat(day) - timedelta(days=1)).isoformat()
+
+class _SeriesEntry:
+    def __init__(self, created_at: float):
+        self.created_at = created_at
+        self.intervals: List[Tuple[str, str]] = []  # sorted, merged, inclusive
+        self.dates: List[str] = []
+        self.values: List[str] = []
+
+class SeriesRangeCache:
+    """FRED observations per series, with the date intervals already fetched
+
+    Lookups report which sub-ranges of a request are missing so only those
+    are fetched; overlapping requests are then answered by slicing the
+    sorted arrays. A series is dropped ttl seconds after it was first
+    cached so newly published observations are picked up.
+    """
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._series: Dict[str, _SeriesEntry] = {}
+
+    def _entry(self, series_id: str) -> _SeriesEntry:
+        entry = self._series.get(series_id)
+        now = self.clock()
+        if entry is None or now - entry.created_at >= self.ttl:
+            entry = self._series[series_id] = _SeriesEntry(now)
+        return entry
+
+    def expires_in(self, series_id: str) -> float:
+        """Seconds until the cached series is dropped (0 if it isn't cached)"""
+        entry = self._series.get(series_id)
+        if entry is None:
+            return 0.0
+        return max(0.0, self.ttl - (self.clock() - entry.created_at))
+
+    def version(self, series_id: str, start: str, end: str) -> Optional[float]:
+        """When the cached series was started, if it covers [start, end] (None otherwise)
+
+        The cached observations for a covered range don't change until the
+        series is dropped, so this identifies them.
+        """
+        entry = self._series.get(series_id)
+        if entry is None or self.clock() - entry.created_at >= self.ttl:
+            return None
+        if self.missing(series_id, start, end):
+            return None
+        return entry.created_at
+
+    def missing(self, series_id: str, start: str, end: str) -> List[Tuple[str, str]]:
+        """Sub-ranges of [start, end] not covered by earlier fetches"""
+        gaps = []
+        cursor = start
+        for covered_start, covered_end in self._entry(series_id).intervals:
+            if covered_end < cursor:
+                continue
+            if covered_start > end:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, _day_before(covered_start)))
+            cursor = _day_after(covered_end)
+            if cursor > end:
+                return gaps
+        gaps.append((cursor, end))
+        return gaps
+
+    def add(self, series_id: str, start: str, end: str, observations: List[Observation]) -> None:
+        """Record the observations fetched for [start, end]"""
+        entry = self._entry(series_id)
+
+        # Merge observations into the sorted arrays, replacing any already there
+        for obs_date, value in sorted(observations):
+            index = bisect_left(entry.dates, obs_date)
+            if index < len(entry.dates) and entry.dates[index] == obs_date:
+                entry.values[index] = value
+            else:
+                entry.dates.insert(index, obs_date)
+                entry.values.insert(index, value)
+
+        # Merge the interval with any it overlaps or touches
+        merged = []
+        for interval in sorted(entry.intervals + [(start, end)]):
+            if merged and interval[0] <= _day_after(merged[-1][1]):
+                merged[-1] = (merged[-1][0], max(merged[-1][1], interval[1]))
+            else:
+                merged.append(interval)
+        entry.intervals = merged
+
+    def slice(self, series_id: str, start: str, end: str) -> List[Observation]:
+        """Cached observations dated within [start, end]"""
+        entry = self._entry(series_id)
+        lo = bisect_left(entry.dates, start)
+        hi = bisect_right(entry.dates, end)
+        return list(zip(entry.dates[lo:hi], entry.values[lo:hi]))
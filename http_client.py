@@ -0,0 +1,81 @@
+from typing import Dict, Optional
+
+import httpx
+
+from circuit_breaker import CircuitBreakerTransport, get_circuit_breaker
+from settings import settings
+
+# Upstream hosts get their own connection pool so a slow provider can't
+# exhaust the connections another one needs
+UPSTREAM_HOSTS = [
+    "https://api.coingecko.com",
+    "https://api.coinbase.com",
+    "https://api.kraken.com",
+    "https://www.alphavantage.co",
+    "https://api.stlouisfed.org",
+    "https://api.bls.gov",
+]
+
+# Timeouts (seconds), overridable through the environment
+HTTP_TIMEOUT = settings.http_timeout
+HTTP_SLOW_TIMEOUT = settings.http_slow_timeout
+HTTP_CONNECT_TIMEOUT = settings.http_connect_timeout
+
+# Connection limits per upstream host
+HTTP_MAX_CONNECTIONS_PER_HOST = settings.http_max_connections_per_host
+HTTP_MAX_KEEPALIVE_PER_HOST = settings.http_max_keepalive_per_host
+HTTP_KEEPALIVE_EXPIRY = settings.http_keepalive_expiry
+
+# Default timeout for quick JSON lookups (CoinGecko, FRED, BLS)
+DEFAULT_TIMEOUT = httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+# Timeout for large responses (Alpha Vantage daily series, FRED ranges)
+SLOW_TIMEOUT = httpx.Timeout(HTTP_SLOW_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+
+_client: Optional[httpx.AsyncClient] = None
+
+def http2_available() -> bool:
+    """Check whether the optional h2 package needed for HTTP/2 is installed"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def _host_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS_PER_HOST,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_PER_HOST,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+    )
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build a keep-alive client with one connection pool per upstream host"""
+    http2 = http2_available()
+    # Each host's pool sits behind its circuit breaker
+    mounts: Dict[str, httpx.AsyncBaseTransport] = {
+        host: CircuitBreakerTransport(
+            httpx.AsyncHTTPTransport(http2=http2, limits=_host_limits()),
+            get_circuit_breaker(host)
+        )
+        for host in UPSTREAM_HOSTS
+    }
+    return httpx.AsyncClient(
+        timeout=DEFAULT_TIMEOUT,
+        limits=_host_limits(),
+        http2=http2,
+        mounts=mounts
+    )
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the process-wide client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+async def close_http_client() -> None:
+    """Close the process-wide client and its pooled connections"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,114 @@
+"""Import-time budget for the serverless entry point
+
+    python importtime_report.py           # measure and rewrite importtime_budget.txt
+    python importtime_report.py --check   # fail if imports got slower than the budget
+
+The report lists the import time (self time summed per top-level package,
+best of several `python -X importtime` runs) of everything `api.index`
+pulls in. --check fails when the total or a package exceeds its budget by
+more than BUDGET_TOLERANCE, or when a new package costing at least
+NEW_PACKAGE_MIN_US shows up, e.g. a module that should be imported lazily.
+Packages budgeted under REPORT_MIN_US are too small to time on their own
+and are checked together, as "other".
+"""
+import os
+import subprocess
+import sys
+from typing import Dict
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BUDGET_PATH = os.path.join(BASE_DIR, "importtime_budget.txt")
+ENTRY_MODULE = "api.index"
+RUNS = 5
+# Timings are noisy across machines; only flag clear regressions
+BUDGET_TOLERANCE = 1.5
+NEW_PACKAGE_MIN_US = 2000
+# Packages under this are checked together as "other"
+REPORT_MIN_US = 500
+TOTAL = "total"
+OTHER = "other"
+
+def parse_importtime(output: str) -> Dict[str, int]:
+    """Self time in microseconds per top-level package from -X importtime output"""
+    packages: Dict[str, int] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the column header
+        package = fields[2].strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(fields[0])
+    packages[TOTAL] = sum(packages.values())
+    return packages
+
+def measure(module: str = ENTRY_MODULE, runs: int = RUNS) -> Dict[str, int]:
+    """Best-of-runs import time per package for a fresh interpreter importing module"""
+    best: Dict[str, int] = {}
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=BASE_DIR, capture_output=True, text=True, check=True
+        )
+        for package, micros in parse_importtime(result.stderr).items():
+            best[package] = min(best.get(package, micros), micros)
+    return best
+
+def format_report(timings: Dict[str, int]) -> str:
+    lines = [
+        f"# Import time of `{ENTRY_MODULE}` per top-level package (self time, microseconds)",
+        f"# Python {sys.version.split()[0]}; regenerate with `python importtime_report.py`",
+    ]
+    small = False
+    for package, micros in sorted(timings.items(), key=lambda entry: -entry[1]):
+        if micros < REPORT_MIN_US and not small:
+            lines.append(f"# Under {REPORT_MIN_US}us: checked together as \"{OTHER}\"")
+            small = True
+        lines.append(f"{package} {micros}")
+    return "\n".join(lines) + "\n"
+
+def read_budget(path: str = BUDGET_PATH) -> Dict[str, int]:
+    budget = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                package, micros = line.split()
+                budget[package] = int(micros)
+    return budget
+
+def regressed(micros: int, allowed: int) -> bool:
+    return micros > allowed * BUDGET_TOLERANCE and micros - allowed >= NEW_PACKAGE_MIN_US
+
+def over_budget(timings: Dict[str, int], budget: Dict[str, int]) -> Dict[str, str]:
+    """Packages (and the total) that regressed, with a description of each
+
+    Small budgeted packages, and new ones that are still small, are summed
+    into "other" so timing noise in any one of them isn't a failure.
+    """
+    small = {package for package, allowed in budget.items() if allowed < REPORT_MIN_US and package != TOTAL}
+    other_allowed = sum(budget[package] for package in small)
+    other = 0
+    problems = {}
+    for package, micros in timings.items():
+        allowed = budget.get(package)
+        if package in small or (allowed is None and micros < NEW_PACKAGE_MIN_US):
+            other += micros
+        elif allowed is None:
+            problems[package] = f"new import taking {micros}us"
+        elif regressed(micros, allowed):
+            problems[package] = f"{micros}us, budget {allowed}us"
+    if regressed(other, other_allowed):
+        problems[OTHER] = f"{other}us, budget {other_allowed}us"
+    return problems
+
+if __name__ == "__main__":
+    timings = measure()
+    if "--check" in sys.argv:
+        problems = over_budget(timings, read_budget())
+        for package, problem in problems.items():
+            print(f"{package}: {problem}")
+        print(f"Total import time {timings[TOTAL]}us ({'over' if problems else 'within'} budget)")
+        sys.exit(1 if problems else 0)
+    with open(BUDGET_PATH, "w") as f:
+        f.write(format_report(timings))
+    print(f"Wrote {BUDGET_PATH}: total {timings[TOTAL]}us")
@@ -1,491 +1,531 @@
-import httpx
-import os
-from typing import Dict, Any, Callable
-from decimal import Decimal
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-async def fetch_oil_usd() -> float:
-    """Fetch oil price from Alpha Vantage API (WTI crude oil)"""
-    api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
-    if not api_key:
-        print("Warning: ALPHA_VANTAGE_API_KEY not found, using fallback price")
-        return 75.0
-    
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://www.alphavantage.co/query?function=WTI&interval=daily&apikey={api_key}",
-                timeout=15.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            # Check for API errors
-            if "Error Message" in data:
-                raise Exception(f"Alpha Vantage error: {data['Error Message']}")
-            if "Note" in data:
-                raise Exception(f"Alpha Vantage rate limit: {data['Note']}")
-            
-            # Get latest daily price
-            if "data" in data and len(data["data"]) > 0:
-                latest_price = float(data["data"][0]["value"])
-                return latest_price
-            else:
-                raise Exception("No price data returned")
-                
-    except Exception as e:
-        print(f"Error fetching oil price from Alpha Vantage: {e}")
-        # Fallback to approximate current oil price
-        return 75.0
+import asyncio
+import inspect
+import time
+from typing import Dict, Any, Awaitable, Callable, List, Mapping, Optional, Tuple
+from datetime import datetime
+from settings import settings
+from cache_backend import distributed_cache
+from circuit_breaker import upstream_available
+from daily_series import DailySeries, DailySeriesParser, daily_series
+from http_client import get_http_client, SLOW_TIMEOUT
+from price_cache import FallbackPrice, item_price_cache, remember_good_price, last_good_price
+from price_feed import price_feed
+from price_store import price_store
+from quota import ProviderQuota, quota_state_path
+from registry import ItemRegistry, ItemSpec
+from shared_prices import shared_price_table
+from singleflight import upstream_flight
 
-async def fetch_gold_usd() -> float:
-    """Fetch gold price from Alpha Vantage API (per ounce)"""
-    api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
-    if not api_key:
-        print("Warning: ALPHA_VANTAGE_API_KEY not found, using fallback price")
-        return 2000.0
-    
+# Cache lifetimes (seconds) for item prices
+COMMODITY_TTL = 15 * 60  # Alpha Vantage quotes, 5 calls/minute budget
+MONTHLY_SERIES_TTL = 24 * 60 * 60  # Monthly/quarterly FRED and BLS series
+STATIC_TTL = None  # Constant prices never expire
+# A fallback price is served this long before the upstream is tried again
+FALLBACK_RETRY_TTL = 60
+
+# Request budgets for each upstream provider (None = no published limit)
+PROVIDER_LIMITS: Dict[str, Dict[str, Any]] = {
+    "coingecko": {"per_minute": 30, "per_day": None},
+    "alpha_vantage": {"per_minute": 5, "per_day": 500},
+    "fred": {"per_minute": 120, "per_day": None},
+    "bls": {"per_minute": 60, "per_day": 500},
+    "static": {"per_minute": None, "per_day": None}
+}
+
+# BLS v2 accepts up to 50 series IDs per request
+BLS_MAX_SERIES_PER_REQUEST = 50
+
+ALPHA_VANTAGE_HOST = "https://www.alphavantage.co"
+
+# Every Alpha Vantage call must take a token from this budget first
+alpha_vantage_quota = ProviderQuota(
+    "alpha_vantage",
+    PROVIDER_LIMITS["alpha_vantage"]["per_minute"],
+    PROVIDER_LIMITS["alpha_vantage"]["per_day"],
+    state_path=quota_state_path("alpha_vantage")
+)
+
+def item_priority(item_name: str) -> str:
+    """Quota priority of an item ("high", "normal" or "low")"""
+    spec = ITEMS.get(item_name)
+    return "normal" if spec is None else spec.priority
+
+def invert(rate: float) -> float:
+    """USD per unit from an exchange rate quoted in units per USD (1 USD = 0.0005 XAU -> 2000)"""
+    return 1.0 / rate
+
+def index_to_usd(base_price: float) -> Callable[[float], float]:
+    """Approximate a price from an index where 100 is base_price"""
+    return lambda index_value: index_value / 100 * base_price
+
+# Alpha Vantage series that are commodity functions (full daily history in
+# one response); any other series is a currency code priced through
+# CURRENCY_EXCHANGE_RATE
+ALPHA_VANTAGE_COMMODITIES = {"WTI", "NATURAL_GAS"}
+
+def alpha_vantage_url(series: str, api_key: str) -> str:
+    if series in ALPHA_VANTAGE_COMMODITIES:
+        return f"{ALPHA_VANTAGE_HOST}/query?function={series}&interval=daily&apikey={api_key}"
+    return (f"{ALPHA_VANTAGE_HOST}/query?function=CURRENCY_EXCHANGE_RATE"
+            f"&from_currency=USD&to_currency={series}&apikey={api_key}")
+
+def alpha_vantage_value(data: Dict[str, Any]) -> float:
+    """Rate from an exchange rate response"""
+    # Check for API errors
+    if "Error Message" in data:
+        raise Exception(f"Alpha Vantage error: {data['Error Message']}")
+    if "Note" in data:
+        alpha_vantage_quota.report_rate_limited()
+        raise Exception(f"Alpha Vantage rate limit: {data['Note']}")
+    if "Realtime Currency Exchange Rate" in data:
+        return float(data["Realtime Currency Exchange Rate"]["5. Exchange Rate"])
+    raise Exception("No price data returned")
+
+async def fetch_alpha_vantage_series(spec: ItemSpec, api_key: str) -> DailySeries:
+    """Stream a commodity's daily history into daily_series; its newest point is the spot price"""
+    parser = DailySeriesParser()
+    client = get_http_client()
+    async with client.stream("GET", alpha_vantage_url(spec.series, api_key), timeout=SLOW_TIMEOUT) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_text():
+            parser.feed(chunk)
+    series = parser.close()
+    if series is None:
+        # Error and rate-limit responses have no data array
+        alpha_vantage_value(parser.document())
+        raise Exception("No price data returned")
+    if not series:
+        raise Exception("No price data returned")
+    daily_series.put(spec.series, series)
+    return series
+
+async def fetch_alpha_vantage_value(spec: ItemSpec, api_key: str) -> float:
+    if spec.series in ALPHA_VANTAGE_COMMODITIES:
+        series = await fetch_alpha_vantage_series(spec, api_key)
+        return series.latest()[1]
+    client = get_http_client()
+    response = await client.get(alpha_vantage_url(spec.series, api_key), timeout=SLOW_TIMEOUT)
+    response.raise_for_status()
+    return alpha_vantage_value(response.json())
+
+async def fetch_alpha_vantage_item(spec: ItemSpec, api_key: str) -> Optional[float]:
+    # Spend quota only if the budget allows and the breaker is closed
+    if not upstream_available(ALPHA_VANTAGE_HOST) or \
+            not alpha_vantage_quota.try_acquire(spec.priority):
+        return None
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://www.alphavantage.co/query?function=CURRENCY_EXCHANGE_RATE&from_currency=USD&to_currency=XAU&apikey={api_key}",
-                timeout=15.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            # Check for API errors
-            if "Error Message" in data:
-                raise Exception(f"Alpha Vantage error: {data['Error Message']}")
-            if "Note" in data:
-                raise Exception(f"Alpha Vantage rate limit: {data['Note']}")
-            
-            # Get exchange rate and invert to get USD per ounce of gold
-            if "Realtime Currency Exchange Rate" in data:
-                exchange_rate = float(data["Realtime Currency Exchange Rate"]["5. Exchange Rate"])
-                # Invert the rate: if 1 USD = 0.0005 XAU, then 1 XAU = 2000 USD
-                gold_price_usd = 1.0 / exchange_rate
-                return gold_price_usd
-            else:
-                raise Exception("No exchange rate data returned")
-                
+        return remember_good_price(spec.name, spec.to_usd(await fetch_alpha_vantage_value(spec, api_key)))
     except Exception as e:
-        print(f"Error fetching gold price from Alpha Vantage: {e}")
-        return 2000.0
+        print(f"Error fetching {spec.name} price from Alpha Vantage: {e}")
+        return None
 
-async def fetch_silver_usd() -> float:
-    """Fetch silver price from Alpha Vantage API (per ounce)"""
-    api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
+async def fetch_alpha_vantage(specs: List[ItemSpec]) -> Dict[str, float]:
+    """Alpha Vantage has no multi-symbol endpoint: one quota-checked request per item, concurrently"""
+    api_key = settings.alpha_vantage_api_key
     if not api_key:
         print("Warning: ALPHA_VANTAGE_API_KEY not found, using fallback price")
-        return 25.0
-    
+        return {}
+    prices = await asyncio.gather(*(fetch_alpha_vantage_item(spec, api_key) for spec in specs))
+    return {spec.name: price for spec, price in zip(specs, prices) if price is not None}
+
+async def fetch_fred_item(spec: ItemSpec, api_key: str) -> Optional[float]:
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://www.alphavantage.co/query?function=CURRENCY_EXCHANGE_RATE&from_currency=USD&to_currency=XAG&apikey={api_key}",
-                timeout=15.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            # Check for API errors
-            if "Error Message" in data:
-                raise Exception(f"Alpha Vantage error: {data['Error Message']}")
-            if "Note" in data:
-                raise Exception(f"Alpha Vantage rate limit: {data['Note']}")
-            
-            # Get exchange rate and invert to get USD per ounce of silver
-            if "Realtime Currency Exchange Rate" in data:
-                exchange_rate = float(data["Realtime Currency Exchange Rate"]["5. Exchange Rate"])
-                # Invert the rate: if 1 USD = 0.04 XAG, then 1 XAG = 25 USD
-                silver_price_usd = 1.0 / exchange_rate
-                return silver_price_usd
-            else:
-                raise Exception("No exchange rate data returned")
-                
+        client = get_http_client()
+        response = await client.get(
+            f"https://api.stlouisfed.org/fred/series/observations?series_id={spec.series}"
+            f"&api_key={api_key}&file_type=json&limit=1&sort_order=desc"
+        )
+        response.raise_for_status()
+        observations = response.json().get("observations", [])
+        if observations and observations[0]["value"] != ".":
+            return remember_good_price(spec.name, spec.to_usd(float(observations[0]["value"])))
     except Exception as e:
-        print(f"Error fetching silver price from Alpha Vantage: {e}")
-        return 25.0
+        print(f"Error fetching {spec.name} price from FRED: {e}")
+    return None
 
-async def fetch_natural_gas_usd() -> float:
-    """Fetch natural gas price from Alpha Vantage API"""
-    api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
+async def fetch_fred(specs: List[ItemSpec]) -> Dict[str, float]:
+    """FRED serves one series per request: pipeline them over the pooled connection"""
+    api_key = settings.fred_api_key
     if not api_key:
-        print("Warning: ALPHA_VANTAGE_API_KEY not found, using fallback price")
-        return 3.50
-    
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://www.alphavantage.co/query?function=NATURAL_GAS&interval=daily&apikey={api_key}",
-                timeout=15.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            # Check for API errors
-            if "Error Message" in data:
-                raise Exception(f"Alpha Vantage error: {data['Error Message']}")
-            if "Note" in data:
-                raise Exception(f"Alpha Vantage rate limit: {data['Note']}")
-            
-            # Get latest daily price
-            if "data" in data and len(data["data"]) > 0:
-                latest_price = float(data["data"][0]["value"])
-                return latest_price
-            else:
-                raise Exception("No price data returned")
-                
-    except Exception as e:
-        print(f"Error fetching natural gas price from Alpha Vantage: {e}")
-        return 3.50
-
-async def fetch_gasoline_usd() -> float:
-    """Fetch gasoline price (using BLS API for US average)"""
-    # BLS Series ID for gasoline prices
-    series_id = "APU000074714"  # Average Price: Gasoline, all types (per gallon/3.785 liters)
-    bls_api_key = os.getenv("BLS_API_KEY")
-    
-    try:
-        if bls_api_key:
-            async with httpx.AsyncClient() as client:
-                headers = {"Content-type": "application/json"}
-                data = {
-                    "seriesid": [series_id],
-                    "startyear": "2024",
-                    "endyear": "2024",
-                    "registrationkey": bls_api_key
-                }
-                response = await client.post(
-                    "https://api.bls.gov/publicAPI/v2/timeseries/data/",
-                    json=data,
-                    headers=headers,
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                result = response.json()
-                
-                if result["status"] == "REQUEST_SUCCEEDED" and result["Results"]:
-                    latest_data = result["Results"]["series"][0]["data"][0]
-                    return float(latest_data["value"])
-        
-        # Fallback: approximate current US gas price
-        return 3.50
-        
-    except Exception:
-        return 3.50
-
-async def fetch_bread_usd() -> float:
-    """Fetch bread price using FRED API"""
-    fred_api_key = os.getenv("FRED_API_KEY")
-    if not fred_api_key:
-        return 2.50
+        return {}
+    prices = await asyncio.gather(*(fetch_fred_item(spec, api_key) for spec in specs))
+    return {spec.name: price for spec, price in zip(specs, prices) if price is not None}
+
+async def fetch_bls_prices(series_ids: List[str]) -> Dict[str, float]:
+    """Fetch the latest value of several BLS series, up to 50 per v2 request"""
+    bls_api_key = settings.bls_api_key
+    if not bls_api_key:
+        raise Exception("BLS_API_KEY not configured")
     
-    try:
-        async with httpx.AsyncClient() as client:
-            # FRED series for average price of bread
-            response = await client.get(
-                f"https://api.stlouisfed.org/fred/series/observations?series_id=APU0000702111&api_key={fred_api_key}&file_type=json&limit=1&sort_order=desc",
-                timeout=10.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            observations = data.get("observations", [])
-            if observations and observations[0]["value"] != ".":
-                return float(observations[0]["value"])
+    # Ask for last year too so series with no release yet this year still have a latest value
+    this_year = datetime.now().year
+    client = get_http_client()
+    prices = {}
+    for i in range(0, len(series_ids), BLS_MAX_SERIES_PER_REQUEST):
+        response = await client.post(
+            "https://api.bls.gov/publicAPI/v2/timeseries/data/",
+            json={
+                "seriesid": series_ids[i:i + BLS_MAX_SERIES_PER_REQUEST],
+                "startyear": str(this_year - 1),
+                "endyear": str(this_year),
+                "registrationkey": bls_api_key
+            },
+            headers={"Content-type": "application/json"}
+        )
+        response.raise_for_status()
+        result = response.json()
         
-        return 2.50
+        if result["status"] != "REQUEST_SUCCEEDED":
+            raise Exception(f"BLS error: {result.get('message')}")
         
-    except Exception:
-        return 2.50
-
-async def fetch_milk_usd() -> float:
-    """Fetch milk price using FRED API"""
-    fred_api_key = os.getenv("FRED_API_KEY")
-    if not fred_api_key:
-        return 3.80
-    
+        for series in result["Results"]["series"]:
+            # Observations are newest first; skip unpublished values such as "-"
+            for observation in series["data"]:
+                try:
+                    prices[series["seriesID"]] = float(observation["value"])
+                    break
+                except ValueError:
+                    continue
+    return prices
+
+async def fetch_bls(specs: List[ItemSpec]) -> Dict[str, float]:
+    """Every item's series in one batched BLS request; raises if the request fails"""
+    if not settings.bls_api_key:
+        return {}
+    series_ids = sorted({spec.bls_series for spec in specs})
+    values = await fetch_bls_prices(series_ids)
+    return {
+        spec.name: remember_good_price(spec.name, spec.to_usd(values[spec.bls_series]))
+        for spec in specs if spec.bls_series in values
+    }
+
+async def fetch_static(specs: List[ItemSpec]) -> Dict[str, float]:
+    """Constant prices, no upstream call"""
+    return {spec.name: spec.fallback for spec in specs}
+
+# How each provider fetches a group of its items in one call; items it
+# couldn't price are left out of the result
+PROVIDER_FETCHERS: Dict[str, Callable[[List[ItemSpec]], Awaitable[Dict[str, float]]]] = {
+    "alpha_vantage": fetch_alpha_vantage,
+    "fred": fetch_fred,
+    "bls": fetch_bls,
+    "static": fetch_static
+}
+
+# Providers whose items the refresher refreshes together (one job, one call);
+# Alpha Vantage items keep one job each to stay within 5 calls per minute
+BATCHED_PROVIDERS = {"fred", "bls", "static"}
+
+# Item declarations: provider, series, transform, ttl and fallback price
+ITEMS = ItemRegistry([
+    ItemSpec("oil", "Energy", "barrel", "alpha_vantage", 75.0, ttl=COMMODITY_TTL, series="WTI",
+             priority="high", historical_support=True, fred_series="MCOILWTICO"),
+    ItemSpec("brent_oil", "Energy", "barrel", "static", 75.0, ttl=STATIC_TTL,
+             historical_support=True, fred_series="MCOILBRENTEU"),
+    ItemSpec("gasoline", "Energy", "gallon", "bls", 3.50, ttl=MONTHLY_SERIES_TTL, series="APU000074714",
+             bls_series="APU000074714", historical_support=True, fred_series="APU000074714"),
+    ItemSpec("natural_gas", "Energy", "MMBtu", "alpha_vantage", 3.50, ttl=COMMODITY_TTL, series="NATURAL_GAS",
+             priority="normal", historical_support=True, fred_series="MHHNGSP"),
+    ItemSpec("gold", "Commodities", "ounce", "alpha_vantage", 2000.0, ttl=COMMODITY_TTL, series="XAU",
+             transform=invert, priority="high"),
+    ItemSpec("silver", "Commodities", "ounce", "alpha_vantage", 25.0, ttl=COMMODITY_TTL, series="XAG",
+             transform=invert, priority="low"),
+    ItemSpec("bread", "Food", "loaf", "fred", 2.50, ttl=MONTHLY_SERIES_TTL, series="APU0000702111",
+             bls_series="APU0000702111", historical_support=True, fred_series="APU0000702111"),
+    ItemSpec("milk", "Food", "gallon", "fred", 3.80, ttl=MONTHLY_SERIES_TTL, series="APU0000709112",
+             bls_series="APU0000709112", historical_support=True, fred_series="APU0000709112"),
+    ItemSpec("coffee", "Food", "pound", "fred", 4.50, ttl=MONTHLY_SERIES_TTL, series="APU0000717311",
+             bls_series="APU0000717311", historical_support=True, fred_series="APU0000717311"),
+    ItemSpec("eggs", "Food", "dozen", "fred", 2.20, ttl=MONTHLY_SERIES_TTL, series="APU0000708111",
+             bls_series="APU0000708111", historical_support=True, fred_series="APU0000708111"),
+    # Big Mac price is relatively stable, using approximate current price
+    ItemSpec("big_mac", "Food", "burger", "static", 5.50, ttl=STATIC_TTL),
+    ItemSpec("median_home", "Housing", "house", "fred", 420000.0, ttl=MONTHLY_SERIES_TTL, series="MSPUS",
+             historical_support=True, fred_series="MSPUS"),
+    # CPI for new vehicles, scaled to an approximate dollar amount
+    ItemSpec("new_car", "Transportation", "car", "fred", 48000.0, ttl=MONTHLY_SERIES_TTL,
+             series="CUSR0000SETA01", transform=index_to_usd(48000.0), historical_support=True,
+             fred_series="CUSR0000SETA01"),
+    ItemSpec("uber_ride", "Transportation", "ride", "static", 15.00, ttl=STATIC_TTL),  # 5 mile trip
+    ItemSpec("netflix", "Entertainment", "month", "static", 15.49, ttl=STATIC_TTL),  # standard plan
+    ItemSpec("spotify", "Entertainment", "month", "static", 10.99, ttl=STATIC_TTL),  # premium
+    ItemSpec("movie_ticket", "Entertainment", "ticket", "static", 12.00, ttl=STATIC_TTL)
+])
+
+def bls_batch_enabled() -> bool:
+    return settings.bls_api_key is not None
+
+def item_provider(spec: ItemSpec) -> str:
+    """Provider that fetches an item: BLS for every series it publishes when a key is set"""
+    if spec.bls_series and bls_batch_enabled():
+        return "bls"
+    return spec.provider
+
+async def fetch_item_price(item_name: str) -> float:
+    """Fetch one item from its own provider
+
+    Raises FallbackPrice, carrying the last good or fallback price, if the
+    provider couldn't price it.
+    """
+    spec = ITEMS[item_name]
     try:
-        async with httpx.AsyncClient() as client:
-            # FRED series for average price of milk
-            response = await client.get(
-                f"https://api.stlouisfed.org/fred/series/observations?series_id=APU0000709112&api_key={fred_api_key}&file_type=json&limit=1&sort_order=desc",
-                timeout=10.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            observations = data.get("observations", [])
-            if observations and observations[0]["value"] != ".":
-                return float(observations[0]["value"])
-        
-        return 3.80
-        
-    except Exception:
-        return 3.80
-
-async def fetch_coffee_usd() -> float:
-    """Fetch coffee price using FRED API"""
-    fred_api_key = os.getenv("FRED_API_KEY")
-    if not fred_api_key:
-        return 4.50
-    
+        prices = await PROVIDER_FETCHERS[spec.provider]([spec])
+    except Exception as e:
+        print(f"Error fetching {item_name} price from {spec.provider}: {e}")
+        prices = {}
+    if item_name not in prices:
+        fallback = last_good_price(item_name, spec.fallback)
+        raise FallbackPrice(item_name, fallback, f"no price from {spec.provider}")
+    return prices[item_name]
+
+async def load_item_price(item_name: str, fetcher: Callable, ttl: Any) -> float:
+    """Call an item's fetcher and store the price in item_price_cache
+
+    With a shared cache backend, a price another node fetched recently is
+    used instead of calling the fetcher. A FallbackPrice from the fetcher is
+    served for FALLBACK_RETRY_TTL seconds, then the fetch is retried; it is
+    never persisted, shared or published.
+    """
+    async def fetch() -> float:
+        price = fetcher()
+        # Plain (non-async) fetchers are supported too
+        if inspect.isawaitable(price):
+            price = await price
+        return float(price)
+
     try:
-        async with httpx.AsyncClient() as client:
-            # FRED series for average price of coffee
-            response = await client.get(
-                f"https://api.stlouisfed.org/fred/series/observations?series_id=APU0000717311&api_key={fred_api_key}&file_type=json&limit=1&sort_order=desc",
-                timeout=10.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            observations = data.get("observations", [])
-            if observations and observations[0]["value"] != ".":
-                return float(observations[0]["value"])
-        
-        return 4.50
-        
-    except Exception:
-        return 4.50
-
-async def fetch_eggs_usd() -> float:
-    """Fetch eggs price using FRED API"""
-    fred_api_key = os.getenv("FRED_API_KEY")
-    if not fred_api_key:
-        return 2.20
-    
+        price, fetched_at = await distributed_cache.load(f"item:{item_name}", ttl, fetch)
+    except FallbackPrice as e:
+        retry_in = FALLBACK_RETRY_TTL if ttl is None else min(ttl, FALLBACK_RETRY_TTL)
+        item_price_cache.set(item_name, e.price, retry_in)
+        return e.price
+    remaining = None if ttl is None else ttl - (time.time() - fetched_at)
+    item_price_cache.set(item_name, price, remaining)
+    save_item_price(item_name, price, fetched_at)
+    return price
+
+def save_item_price(item_name: str, price: float, fetched_at: Optional[float] = None) -> None:
+    """Persist a freshly fetched price and share it with the other workers"""
+    if fetched_at is None:
+        fetched_at = time.time()
+    price_store.save(f"item:{item_name}", price, fetched_at)
+    shared_price_table.publish(f"item:{item_name}", price, fetched_at)
+    price_feed.update(item_name, price, fetched_at)
+
+def follower_item_price(item_name: str) -> float:
+    """Price on a follower worker, read from the leader's shared table; never fetched here
+
+    An expired price is served until the leader refreshes it. An item the
+    leader hasn't published yet gets its last good or fallback price.
+    """
+    spec = ITEMS[item_name]
+    entry = shared_price_table.read(f"item:{item_name}")
+    if entry is None:
+        return last_good_price(item_name, spec.fallback)
+    price, fetched_at = entry
+    remaining = None if spec.ttl is None else spec.ttl - (time.time() - fetched_at)
+    if remaining is None or remaining > 0:
+        item_price_cache.set(item_name, price, remaining)
+    return price
+
+def bls_backed_items() -> Mapping[str, str]:
+    """Item name -> BLS series ID for every item BLS publishes"""
+    return ITEMS.bls_series()
+
+def group_ttl(specs: List[ItemSpec]) -> Optional[float]:
+    """Shortest TTL in a group (None if none of its prices expire)"""
+    ttls = [spec.ttl for spec in specs if spec.ttl is not None]
+    return min(ttls) if ttls else None
+
+async def refresh_provider_items(provider: str, item_names: List[str]) -> Dict[str, float]:
+    """Refresh several items with one batched or pipelined call to their provider
+
+    The group's prices are cached and shared under one key, the way a
+    single item is. Fills item_price_cache for each item priced and returns
+    their prices; items missing from the result are left to their own fetcher.
+    """
+    if provider == "bls" and bls_batch_enabled():
+        # One BLS request covers every BLS-backed item, so always ask for all of them
+        item_names = list(bls_backed_items())
+    specs = [ITEMS[item_name] for item_name in item_names]
+    key = f"{provider}:{','.join(spec.name for spec in specs)}"
+    ttl = group_ttl(specs)
     try:
-        async with httpx.AsyncClient() as client:
-            # FRED series for average price of eggs
-            response = await client.get(
-                f"https://api.stlouisfed.org/fred/series/observations?series_id=APU0000708111&api_key={fred_api_key}&file_type=json&limit=1&sort_order=desc",
-                timeout=10.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            observations = data.get("observations", [])
-            if observations and observations[0]["value"] != ".":
-                return float(observations[0]["value"])
-        
-        return 2.20
-        
-    except Exception:
-        return 2.20
-
-async def fetch_median_home_usd() -> float:
-    """Fetch median home price using FRED API"""
-    fred_api_key = os.getenv("FRED_API_KEY")
-    if not fred_api_key:
-        return 420000.0
+        prices, fetched_at = await upstream_flight.do(
+            key, lambda: distributed_cache.load(key, ttl, lambda: PROVIDER_FETCHERS[provider](specs))
+        )
+    except Exception as e:
+        print(f"Error fetching {provider} batch: {e}")
+        return {}
     
-    try:
-        async with httpx.AsyncClient() as client:
-            # FRED series for median home price
-            response = await client.get(
-                f"https://api.stlouisfed.org/fred/series/observations?series_id=MSPUS&api_key={fred_api_key}&file_type=json&limit=1&sort_order=desc",
-                timeout=10.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            observations = data.get("observations", [])
-            if observations and observations[0]["value"] != ".":
-                return float(observations[0]["value"])
-        
-        return 420000.0
-        
-    except Exception:
-        return 420000.0
+    age = time.time() - fetched_at
+    refreshed = {}
+    for spec in specs:
+        if spec.name in prices:
+            price = prices[spec.name]
+            item_price_cache.set(spec.name, price, None if spec.ttl is None else spec.ttl - age)
+            save_item_price(spec.name, price, fetched_at)
+            refreshed[spec.name] = price
+    return refreshed
 
-async def fetch_big_mac_usd() -> float:
-    """Fetch Big Mac price (approximate)"""
-    # Big Mac price is relatively stable, using approximate current price
-    return 5.50
+async def refresh_bls_items() -> Dict[str, float]:
+    """Refresh every BLS-backed item with one batched BLS request"""
+    return await refresh_provider_items("bls", list(bls_backed_items()))
 
-async def fetch_netflix_usd() -> float:
-    """Netflix subscription price (standard plan)"""
-    return 15.49
+def cached_fetcher(item_name: str, fetcher: Callable, ttl: Any) -> Callable:
+    """Wrap a fetcher so its price is served from item_price_cache until the TTL expires"""
+    async def fetch() -> float:
+        price = item_price_cache.get(item_name)
+        if price is not None:
+            return price
+        if shared_price_table.is_follower:
+            return follower_item_price(item_name)
+        # One BLS request fills the cache for every BLS-backed item
+        if item_name in bls_backed_items() and bls_batch_enabled():
+            refreshed = await refresh_bls_items()
+            if item_name in refreshed:
+                return refreshed[item_name]
+        # Concurrent misses for the same item share one upstream call
+        return await upstream_flight.do(
+            ("item", item_name), lambda: load_item_price(item_name, fetcher, ttl)
+        )
+    return fetch
 
-async def fetch_spotify_usd() -> float:
-    """Spotify premium subscription price"""
-    return 10.99
+async def refresh_item_price(item_name: str) -> float:
+    """Fetch an item's price from upstream even if it is cached (followers read the leader's)"""
+    if shared_price_table.is_follower:
+        return follower_item_price(item_name)
+    if item_name in bls_backed_items() and bls_batch_enabled():
+        refreshed = await refresh_bls_items()
+        if item_name in refreshed:
+            return refreshed[item_name]
+    return await upstream_flight.do(
+        ("item", item_name),
+        lambda: load_item_price(item_name, lambda: fetch_item_price(item_name), ITEMS[item_name].ttl)
+    )
 
-async def fetch_uber_ride_usd() -> float:
-    """Average Uber ride price (5 mile trip)"""
-    return 15.00
+async def get_item_prices(item_names: List[str]) -> Dict[str, float]:
+    """Prices of several items: cached ones directly, the rest with one call per provider"""
+    prices = {}
+    missing = []
+    for item_name in item_names:
+        price = item_price_cache.get(item_name)
+        if price is None:
+            missing.append(item_name)
+        else:
+            prices[item_name] = price
+    if missing and shared_price_table.is_follower:
+        prices.update((item_name, follower_item_price(item_name)) for item_name in missing)
+    elif missing:
+        plan = ITEMS.plan(missing, item_provider)
+        for refreshed in await asyncio.gather(*(
+            refresh_provider_items(provider, [spec.name for spec in specs])
+            for provider, specs in plan.items()
+        )):
+            prices.update(refreshed)
+        # Whatever a batch couldn't price (e.g. BLS down) goes to the item's own provider
+        leftovers = [item_name for item_name in missing if item_name not in prices]
+        for item_name, price in zip(leftovers, await asyncio.gather(*(
+            refresh_item_price(item_name) for item_name in leftovers
+        ))):
+            prices[item_name] = price
+    return {item_name: prices[item_name] for item_name in item_names}
 
-async def fetch_movie_ticket_usd() -> float:
-    """Average movie ticket price"""
-    return 12.00
+def stored_daily_series(item_name: str) -> Optional[DailySeries]:
+    """The item's daily series as last fetched, without fetching it"""
+    spec = ITEMS[item_name]
+    if spec.provider != "alpha_vantage" or spec.series not in ALPHA_VANTAGE_COMMODITIES:
+        return None
+    return daily_series.get(spec.series)
 
-async def fetch_new_car_usd() -> float:
-    """Average new car price using FRED API"""
-    fred_api_key = os.getenv("FRED_API_KEY")
-    if not fred_api_key:
-        return 48000.0
-    
-    try:
-        async with httpx.AsyncClient() as client:
-            # FRED series for average price of new vehicles
-            response = await client.get(
-                f"https://api.stlouisfed.org/fred/series/observations?series_id=CUSR0000SETA01&api_key={fred_api_key}&file_type=json&limit=1&sort_order=desc",
-                timeout=10.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            observations = data.get("observations", [])
-            if observations and observations[0]["value"] != ".":
-                # This is a CPI index, convert to approximate dollar amount
-                index_value = float(observations[0]["value"])
-                # Using base year calculation to approximate current price
-                return (index_value / 100) * 48000.0
-        
-        return 48000.0
-        
-    except Exception:
-        return 48000.0
-
-# Items configuration with categories, units, and fetcher functions
-ITEMS: Dict[str, Dict[str, Any]] = {
-    "oil": {
-        "category": "Energy",
-        "unit": "barrel", 
-        "fetcher": fetch_oil_usd,
-        "historical_support": True,
-        "fred_series": "MCOILWTICO"
-    },
-    "brent_oil": {
-        "category": "Energy",
-        "unit": "barrel",
-        "fetcher": lambda: 75.0,  # Fallback price for Brent oil
-        "historical_support": True,
-        "fred_series": "MCOILBRENTEU"
-    },
-    "gasoline": {
-        "category": "Energy",
-        "unit": "gallon",
-        "fetcher": fetch_gasoline_usd,
-        "historical_support": True,
-        "fred_series": "APU000074714"
-    },
-    "natural_gas": {
-        "category": "Energy",
-        "unit": "MMBtu",
-        "fetcher": fetch_natural_gas_usd,
-        "historical_support": True,
-        "fred_series": "MHHNGSP"
-    },
-    "gold": {
-        "category": "Commodities",
-        "unit": "ounce",
-        "fetcher": fetch_gold_usd,
-        "historical_support": False
-    },
-    "silver": {
-        "category": "Commodities",
-        "unit": "ounce",
-        "fetcher": fetch_silver_usd,
-        "historical_support": False
-    },
-    "bread": {
-        "category": "Food",
-        "unit": "loaf",
-        "fetcher": fetch_bread_usd,
-        "historical_support": True,
-        "fred_series": "APU0000702111"
-    },
-    "milk": {
-        "category": "Food",
-        "unit": "gallon",
-        "fetcher": fetch_milk_usd,
-        "historical_support": True,
-        "fred_series": "APU0000709112"
-    },
-    "coffee": {
-        "category": "Food",
-        "unit": "pound",
-        "fetcher": fetch_coffee_usd,
-        "historical_support": True,
-        "fred_series": "APU0000717311"
-    },
-    "eggs": {
-        "category": "Food",
-        "unit": "dozen",
-        "fetcher": fetch_eggs_usd,
-        "historical_support": True,
-        "fred_series": "APU0000708111"
-    },
-    "big_mac": {
-        "category": "Food",
-        "unit": "burger",
-        "fetcher": fetch_big_mac_usd,
-        "historical_support": False
-    },
-    "median_home": {
-        "category": "Housing",
-        "unit": "house",
-        "fetcher": fetch_median_home_usd,
-        "historical_support": True,
-        "fred_series": "MSPUS"
-    },
-    "new_car": {
-        "category": "Transportation",
-        "unit": "car",
-        "fetcher": fetch_new_car_usd,
-        "historical_support": True,
-        "fred_series": "CUSR0000SETA01"
-    },
-    "uber_ride": {
-        "category": "Transportation",
-        "unit": "ride",
-        "fetcher": fetch_uber_ride_usd,
-        "historical_support": False
-    },
-    "netflix": {
-        "category": "Entertainment",
-        "unit": "month",
-        "fetcher": fetch_netflix_usd,
-        "historical_support": False
-    },
-    "spotify": {
-        "category": "Entertainment",
-        "unit": "month",
-        "fetcher": fetch_spotify_usd,
-        "historical_support": False
-    },
-    "movie_ticket": {
-        "category": "Entertainment",
-        "unit": "ticket",
-        "fetcher": fetch_movie_ticket_usd,
-        "historical_support": False
-    }
-}
+async def get_daily_series(item_name: str) -> Optional[DailySeries]:
+    """Daily history of an Alpha Vantage commodity, from the fetch that prices it
+
+    A missing or expired series is refreshed together with the spot price
+    (one quota-consuming call for both), unless item_price_cache still holds
+    the price. None if the item has no daily series or it couldn't be fetched.
+    """
+    spec = ITEMS[item_name]
+    if spec.provider != "alpha_vantage" or spec.series not in ALPHA_VANTAGE_COMMODITIES:
+        return None
+    series = stored_daily_series(item_name)
+    if series is not None and series.expires_in(spec.ttl) > 0:
+        return series
+    # Followers and nodes behind a shared cache backend only get the scalar
+    # price from a refresh, never the series: chart from FRED instead of
+    # spending a quota call or a backend round trip on every request
+    if shared_price_table.is_follower or distributed_cache.backend is not None:
+        return None
+    # A cached price (a fallback included, until its FALLBACK_RETRY_TTL runs
+    # out) means the last fetch is recent: charts don't get to retry it sooner
+    if item_price_cache.get(item_name) is not None:
+        return None
+    if settings.alpha_vantage_api_key:
+        await refresh_item_price(item_name)
+        series = daily_series.get(spec.series)
+    return series
+
+def restore_item_prices(stored: Dict[str, Tuple[float, float]], expired_ttl: Optional[float] = None) -> int:
+    """Seed the item caches from persisted (price, fetched_at) entries
+
+    Prices still within their TTL go back into item_price_cache for the
+    rest of it; older ones are only kept as the last good price, or cached
+    for expired_ttl seconds if it is given.
+    """
+    now = time.time()
+    restored = 0
+    for item_name, spec in ITEMS.items():
+        entry = stored.get(f"item:{item_name}")
+        if entry is None:
+            continue
+        price, fetched_at = entry
+        remember_good_price(item_name, price)
+        price_feed.update(item_name, price, fetched_at)
+        remaining = None if spec.ttl is None else spec.ttl - (now - fetched_at)
+        if remaining is not None and remaining <= 0 and expired_ttl:
+            remaining = expired_ttl
+        if remaining is None or remaining > 0:
+            item_price_cache.set(item_name, price, remaining)
+        restored += 1
+    return restored
+
+_cached_fetchers: Dict[str, Callable] = {}
 
 def get_item_fetcher(item_name: str) -> Callable:
-    """Get the fetcher function for a specific item"""
+    """Get the cached fetcher function for a specific item"""
     if item_name not in ITEMS:
         raise ValueError(f"Item '{item_name}' not found")
-    return ITEMS[item_name]["fetcher"]
+    if item_name not in _cached_fetchers:
+        _cached_fetchers[item_name] = cached_fetcher(
+            item_name, lambda: fetch_item_price(item_name), ITEMS[item_name].ttl
+        )
+    return _cached_fetchers[item_name]
 
-def get_items_by_category() -> Dict[str, list]:
+# Display names and the dropdown catalog are built once: ITEMS is fixed at runtime
+ITEM_DISPLAY_NAMES: Dict[str, str] = {
+    # Human-readable item name with its unit, e.g. Big Mac (burger)
+    item_key: f"{item_key.replace('_', ' ').title()} ({spec.unit})"
+    for item_key, spec in ITEMS.items()
+}
+
+def item_display_name(item_key: str) -> str:
+    return ITEM_DISPLAY_NAMES[item_key]
+
+def build_items_by_category() -> Dict[str, list]:
     """Group items by category for frontend dropdown"""
     categories = {}
-    for item_key, item_info in ITEMS.items():
-        category = item_info["category"]
-        if category not in categories:
-            categories[category] = []
-        categories[category].append({
+    for item_key, spec in ITEMS.items():
+        if spec.category not in categories:
+            categories[spec.category] = []
+        categories[spec.category].append({
             "key": item_key,
-            "name": f"{item_key.replace('_', ' ').title()} ({item_info['unit']})",
-            "unit": item_info["unit"],
-            "historical_support": item_info.get("historical_support", False)
+            "name": item_display_name(item_key),
+            "unit": spec.unit,
+            "historical_support": spec.historical_support
         })
-    return categories 
\ No newline at end of file
+    return categories
+
+ITEMS_BY_CATEGORY = build_items_by_category()
+
+def get_items_by_category() -> Dict[str, list]:
+    return ITEMS_BY_CATEGORY
@@ -0,0 +1,88 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from settings import settings
+
+class TTLCache:
+    """Bounded in-memory cache with a per-entry time-to-live
+
+    Entries stored with ttl=None never expire. When the cache is full the
+    least recently used entry is evicted.
+    """
+
+    def __init__(self, maxsize: int = 256, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or self.clock() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        """Store a value for ttl seconds (forever if ttl is None)"""
+        expires_at = None if ttl is None else self.clock() + ttl
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+# Shared cache for item prices, keyed by item name
+item_price_cache = TTLCache(maxsize=settings.item_cache_size)
+
+# Last successfully fetched price per item, served when an upstream can't be called
+last_good_prices: Dict[str, float] = {}
+
+def remember_good_price(item_name: str, price: float) -> float:
+    last_good_prices[item_name] = price
+    return price
+
+def last_good_price(item_name: str, fallback: float) -> float:
+    """Last successfully fetched price, or the fallback if there is none"""
+    return last_good_prices.get(item_name, fallback)
+
+class FallbackPrice(Exception):
+    """Raised by a fetcher that couldn't get a real price
+
+    price is the last good price or the item's fallback constant. It may be
+    served, but must not be cached, persisted or published as fresh.
+    """
+
+    def __init__(self, item_name: str, price: float, reason: str):
+        super().__init__(f"{item_name}: {reason}")
+        self.item_name = item_name
+        self.price = price
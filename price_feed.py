@@ -0,0 +1,55 @@
+import asyncio
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+class PriceFeed:
+    """Latest BTC and item prices with a version number bumped on every change
+
+    Each entry remembers the version it last changed at, so clients that
+    have seen version N can be sent only the entries changed since.
+    Versions only count up within one process: epoch tells processes (and
+    restarts) apart, and a version from another epoch means nothing here.
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:16]
+        self.version = 0
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._changed: Optional[asyncio.Event] = None
+
+    def update(self, key: str, price: float, fetched_at: Optional[float] = None) -> bool:
+        """Record a price for "btc" or an item name; returns False if nothing changed"""
+        if fetched_at is None:
+            fetched_at = time.time()
+        entry = self.entries.get(key)
+        if entry is not None and entry["price"] == price and entry["fetched_at"] >= fetched_at:
+            return False
+        self.version += 1
+        self.entries[key] = {"price": price, "fetched_at": fetched_at, "version": self.version}
+        changed, self._changed = self._changed, None
+        if changed is not None:
+            changed.set()
+        return True
+
+    def changes_since(self, version: int = 0) -> Dict[str, Any]:
+        """Entries changed after the given version (all of them for 0)"""
+        return {
+            "version": self.version,
+            "prices": {key: entry for key, entry in self.entries.items() if entry["version"] > version}
+        }
+
+    async def wait_for_change(self, version: int, timeout: float) -> bool:
+        """Wait until the feed is past the given version; False on timeout"""
+        if self.version > version:
+            return True
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+# Fed by every BTC and item price fetch, restore and shared-table sync
+price_feed = PriceFeed()
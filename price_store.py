@@ -0,0 +1,83 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from settings import settings
+
+PRICE_STORE_PATH = settings.price_store_path
+
+class PersistentPriceStore:
+    """Latest BTC and item prices in SQLite (WAL mode) so caches survive restarts
+
+    Writes are queued and flushed on a worker thread, so saving a price
+    never blocks the event loop.
+    """
+
+    def __init__(self, path: str = PRICE_STORE_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[float, float]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS prices "
+                "(key TEXT PRIMARY KEY, price REAL NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def load_all(self) -> Dict[str, Tuple[float, float]]:
+        """Every stored price as key -> (price, fetched_at unix time)"""
+        try:
+            with self._lock:
+                rows = self._connect().execute("SELECT key, price, fetched_at FROM prices").fetchall()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: price store unavailable at {self.path}: {e}")
+            return {}
+        return {key: (price, fetched_at) for key, price, fetched_at in rows}
+
+    def save(self, key: str, price: float, fetched_at: Optional[float] = None) -> None:
+        """Queue a price to be written; flushed in the background when a loop is running"""
+        self._pending[key] = (price, time.time() if fetched_at is None else fetched_at)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_soon())
+
+    async def _flush_soon(self) -> None:
+        # Let prices saved in the same loop iteration join this write
+        await asyncio.sleep(0)
+        batch, self._pending = self._pending, {}
+        await asyncio.to_thread(self._write, batch)
+
+    def flush(self) -> None:
+        batch, self._pending = self._pending, {}
+        self._write(batch)
+
+    def _write(self, batch: Dict[str, Tuple[float, float]]) -> None:
+        if not batch:
+            return
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO prices (key, price, fetched_at) VALUES (?, ?, ?)",
+                        [(key, price, fetched_at) for key, (price, fetched_at) in batch.items()]
+                    )
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: could not save prices to {self.path}: {e}")
+
+# Shared store for the BTC price ("btc") and item prices ("item:<name>")
+price_store = PersistentPriceStore()
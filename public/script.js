@@ -4,6 +4,7 @@ let currentUnit = 'btc'; // 'btc' or 'sats'
 let debounceTimer = null;
 let currentItem = '';
 let itemsData = {};
+let livePrices = {}; // "btc" and item keys -> {price, fetched_at, version, ttl} from the price stream
 
 // DOM elements
 let btcInput = document.getElementById('btc-input');
@@ -28,6 +29,18 @@ document.addEventListener('DOMContentLoaded', function() {
     console.log('DOM loaded, initializing app...');
     setDefaultDates();
     updateUIForDirection();
+    connectPriceStream();
+    
+    // Test if CanvasJS is loaded
+    setTimeout(() => {
+        if (typeof CanvasJS === 'undefined') {
+            console.error('CanvasJS failed to load from CDN');
+            showToast('Chart library failed to load. Charts will not be available.', 'error');
+        } else {
+            console.log('CanvasJS loaded successfully');
+        }
+    }, 1000);
+    
     // Ensure items are loaded after a brief delay to let the DOM settle
     setTimeout(() => {
         console.log('Loading items after DOM setup...');
@@ -72,10 +85,118 @@ function setupEventListeners() {
     if (loadHistoricalBtn) {
         loadHistoricalBtn.addEventListener('click', loadHistoricalData);
     }
+    
+    // Auto-reload chart when date inputs change
+    if (fromDate) {
+        fromDate.addEventListener('change', debounceHistoricalLoad);
+    }
+    if (toDate) {
+        toDate.addEventListener('change', debounceHistoricalLoad);
+    }
+}
+
+function connectPriceStream() {
+    if (typeof EventSource === 'undefined') {
+        return; // Conversions keep going through /api/convert
+    }
+    // The server sends every price on connect (and on each reconnect), then only changes
+    const stream = new EventSource('/api/prices/stream');
+    stream.addEventListener('snapshot', event => applyPrices(JSON.parse(event.data)));
+    stream.addEventListener('delta', event => applyPrices(JSON.parse(event.data)));
+}
+
+function applyPrices(update) {
+    Object.assign(livePrices, update.prices);
+    // Keep the displayed conversion in step with the new prices
+    if (currentItem && (update.prices.btc || update.prices[currentItem])) {
+        convertLocally();
+    }
+}
+
+// A streamed price past its TTL goes through /api/convert instead, which
+// refetches it (the stream then delivers the new price)
+function isFresh(entry) {
+    return entry.ttl == null || Date.now() / 1000 - entry.fetched_at < entry.ttl;
+}
+
+// Same fixed-point arithmetic as conversion.py (behind compute_conversion in
+// server.py): sats, micro-USD prices and millionths of an item, each result
+// rounded half-to-even once, so it matches /api/convert to the last digit
+const SATS_PER_BTC = 100000000n;
+const MICROS = 1000000n;
+const MICROS_PER_CENT = 10000n;
+
+// Math.round rounds halves up; Python's round() goes to the even neighbour
+function roundHalfEven(value) {
+    const rounded = Math.round(value);
+    return rounded - value === 0.5 && rounded % 2 !== 0 ? rounded - 1 : rounded;
+}
+
+function toMicros(value) {
+    return BigInt(roundHalfEven(value * 1000000));
+}
+
+function divRound(numerator, denominator) {
+    const quotient = numerator / denominator;
+    const remainder = numerator % denominator;
+    if (2n * remainder > denominator || (2n * remainder === denominator && quotient % 2n === 1n)) {
+        return quotient + 1n;
+    }
+    return quotient;
+}
+
+function toCents(microUsd) {
+    return Number(divRound(microUsd, MICROS_PER_CENT)) / 100;
+}
+
+// Convert with streamed prices, like /api/convert would.
+// Returns false when the prices (or a valid input) aren't there yet.
+function convertLocally() {
+    const btc = livePrices.btc;
+    const item = livePrices[currentItem];
+    const inputElement = currentDirection === 'btc_to_item'
+        ? document.getElementById('btc-input')
+        : document.getElementById('quantity-input');
+    if (!btc || !item || !isFresh(btc) || !isFresh(item) || !inputElement || !inputElement.value) {
+        return false;
+    }
+    
+    const inputValue = parseFloat(inputElement.value);
+    const btcMicro = toMicros(btc.price);
+    const itemMicro = toMicros(item.price);
+    if (!(inputValue > 0) || btcMicro === 0n || itemMicro === 0n) {
+        return false;
+    }
+    
+    const sats = currentUnit === 'sats';
+    let quantity, usdTotal;
+    if (currentDirection === 'btc_to_item') {
+        const amountSats = BigInt(roundHalfEven(sats ? inputValue : inputValue * 100000000));
+        const usdNumerator = amountSats * btcMicro;
+        quantity = Number(divRound(usdNumerator * MICROS, SATS_PER_BTC * itemMicro)) / 1000000;
+        usdTotal = Number(divRound(usdNumerator, SATS_PER_BTC * MICROS_PER_CENT)) / 100;
+    } else {
+        const usdNumerator = toMicros(inputValue) * itemMicro;
+        const btcNeededSats = divRound(usdNumerator * SATS_PER_BTC, MICROS * btcMicro);
+        quantity = sats ? Number(btcNeededSats) : Number(btcNeededSats) / 100000000;
+        usdTotal = Number(divRound(usdNumerator, MICROS * MICROS_PER_CENT)) / 100;
+    }
+    
+    updateResults({
+        quantity: quantity,
+        usd_item: toCents(itemMicro),
+        usd_total: usdTotal,
+        btc_price: toCents(btcMicro)
+    });
+    return true;
 }
 
 function debounceConvert() {
     clearTimeout(debounceTimer);
+    // No round trip needed once the price stream has delivered both prices
+    if (currentItem && convertLocally()) {
+        return;
+    }
     debounceTimer = setTimeout(() => {
         if (currentItem && btcInput.value) {
             performConversion();
@@ -83,6 +204,23 @@ function debounceConvert() {
     }, 300);
 }
 
+function debounceHistoricalLoad() {
+    clearTimeout(debounceTimer);
+    
+    // Show visual feedback that chart will update
+    const chartContainer = document.getElementById('chartContainer');
+    if (chartContainer) {
+        chartContainer.style.opacity = '0.6';
+    }
+    
+    debounceTimer = setTimeout(() => {
+        if (currentItem && historicalSection.style.display !== 'none') {
+            console.log('Auto-updating chart with new date range...');
+            loadHistoricalData();
+        }
+    }, 800); // Longer delay for API calls
+}
+
 function setUnit(unit) {
     currentUnit = unit;
     btcToggle.classList.toggle('active', unit === 'btc');
@@ -299,6 +437,10 @@ function handleItemChange() {
         // Show/hide historical section
         if (hasHistoricalSupport) {
             historicalSection.style.display = 'block';
+            // Automatically load historical chart
+            setTimeout(() => {
+                loadHistoricalData();
+            }, 500); // Small delay to let the UI update
         } else {
             historicalSection.style.display = 'none';
         }
@@ -382,6 +524,8 @@ function clearResults() {
 }
 
 async function loadHistoricalData() {
+    console.log('loadHistoricalData called for item:', currentItem);
+    
     if (!currentItem) {
         showToast('Please select an item first', 'error');
         return;
@@ -390,9 +534,12 @@ async function loadHistoricalData() {
     const fromDateValue = fromDate.value;
     const toDateValue = toDate.value;
     
+    console.log('Date values:', fromDateValue, toDateValue);
+    
     if (!fromDateValue || !toDateValue) {
-        showToast('Please select both from and to dates', 'error');
-        return;
+        console.log('Missing dates, using defaults');
+        // Use default dates if not set
+        setDefaultDates();
     }
     
     showLoading(true);
@@ -400,11 +547,20 @@ async function loadHistoricalData() {
     try {
         const params = new URLSearchParams({
             item: currentItem,
-            from_date: fromDateValue,
-            to_date: toDateValue
+            from_date: fromDate.value,
+            to_date: toDate.value
         });
         
-        const response = await fetch(`/api/historical?${params}`);
+        console.log('Fetching historical data with params:', params.toString());
+        
+        const controller = new AbortController();
+        const timeoutId = setTimeout(() => controller.abort(), 15000);
+        
+        const response = await fetch(`/api/historical?${params}`, {
+            signal: controller.signal
+        });
+        
+        clearTimeout(timeoutId);
         
         if (!response.ok) {
             const errorData = await response.json();
@@ -412,54 +568,127 @@ async function loadHistoricalData() {
         }
         
         const data = await response.json();
+        console.log('Historical data received:', data);
         renderChart(data);
         
     } catch (error) {
-        showToast(error.message, 'error');
+        console.error('Error loading historical data:', error);
+        
+        let errorMessage = error.message;
+        if (error.name === 'AbortError') {
+            errorMessage = 'Request timed out. Please try again.';
+        } else if (error.message.includes('Failed to fetch')) {
+            errorMessage = 'Network error. Please check your connection.';
+        }
+        
+        showToast(errorMessage, 'error');
     } finally {
         showLoading(false);
     }
 }
 
-function renderChart(data) {
+function renderChart(data, retryCount = 0) {
+    console.log(`Attempting to render chart (attempt ${retryCount + 1})`);
+    
+    // Check if CanvasJS is loaded, with retry logic
+    if (typeof CanvasJS === 'undefined') {
+        if (retryCount < 3) {
+            console.log('CanvasJS not ready, retrying in 1 second...');
+            setTimeout(() => renderChart(data, retryCount + 1), 1000);
+            return;
+        } else {
+            showToast('Chart library failed to load after multiple attempts. Please refresh the page.', 'error');
+            return;
+        }
+    }
+    
+    // Check if chart container exists
+    const container = document.getElementById('chartContainer');
+    if (!container) {
+        if (retryCount < 2) {
+            console.log('Chart container not ready, retrying...');
+            setTimeout(() => renderChart(data, retryCount + 1), 500);
+            return;
+        } else {
+            showToast('Chart container not found', 'error');
+            return;
+        }
+    }
+    
+    console.log('Rendering chart with data:', data);
+    
+    // Validate data
+    if (!data || !data.dates || !data.btc_prices || data.dates.length === 0) {
+        showToast('No chart data available', 'error');
+        return;
+    }
+    
     const dataPoints = data.dates.map((date, index) => ({
         x: new Date(date),
         y: data.btc_prices[index]
     }));
     
-    const chart = new CanvasJS.Chart("chartContainer", {
-        animationEnabled: true,
-        theme: "light2",
-        title: {
-            text: `${currentItem.replace('_', ' ').toUpperCase()} Price in BTC`
-        },
-        axisX: {
-            valueFormatString: "MMM YYYY",
-            crosshair: {
-                enabled: true,
-                snapToDataPoint: true
-            }
-        },
-        axisY: {
-            title: "BTC",
-            includeZero: false,
-            prefix: "₿",
-            crosshair: {
-                enabled: true
-            }
-        },
-        toolTip: {
-            shared: true
-        },
-        data: [{
-            type: "spline",
-            name: "Price in BTC",
-            showInLegend: true,
-            dataPoints: dataPoints
-        }]
-    });
+    console.log('Chart data points:', dataPoints.slice(0, 3)); // Log first 3 points
     
-    chart.render();
+    try {
+        // Clear any existing chart
+        container.innerHTML = '';
+        
+        const chart = new CanvasJS.Chart("chartContainer", {
+            animationEnabled: true,
+            theme: "light2",
+            title: {
+                text: `${currentItem.replace('_', ' ').toUpperCase()} Price in BTC`
+            },
+            axisX: {
+                valueFormatString: "MMM YYYY",
+                crosshair: {
+                    enabled: true,
+                    snapToDataPoint: true
+                }
+            },
+            axisY: {
+                title: "BTC",
+                includeZero: false,
+                prefix: "₿",
+                crosshair: {
+                    enabled: true
+                }
+            },
+            toolTip: {
+                shared: true
+            },
+            data: [{
+                type: "spline",
+                name: "Price in BTC",
+                showInLegend: true,
+                dataPoints: dataPoints
+            }]
+        });
+        
+        chart.render();
+        console.log('✅ Chart rendered successfully');
+        
+        // Restore chart opacity
+        const chartContainer = document.getElementById('chartContainer');
+        if (chartContainer) {
+            chartContainer.style.opacity = '1';
+        }
+        
+        // Only show success toast on first attempt
+        if (retryCount === 0) {
+            showToast('Chart loaded successfully!', 'success');
+        }
+        
+    } catch (error) {
+        console.error('❌ Error rendering chart:', error);
+        if (retryCount < 2) {
+            console.log('Retrying chart render...');
+            setTimeout(() => renderChart(data, retryCount + 1), 1000);
+        } else {
+            showToast('Error rendering chart after multiple attempts: ' + error.message, 'error');
+        }
+    }
 }
 
 function setDefaultDates() {
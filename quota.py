@@ -0,0 +1,168 @@
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+from settings import settings
+
+# Share of the daily budget each priority must leave for higher priorities
+PRIORITY_RESERVE = {
+    "high": 0.0,
+    "normal": 0.1,
+    "low": 0.3
+}
+
+QUOTA_STATE_DIR = settings.quota_state_dir
+
+class TokenBucket:
+    """Token bucket holding up to `capacity` calls, refilled evenly over `period` seconds"""
+
+    def __init__(self, capacity: float, period: float, clock: Callable[[], float] = time.time):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        # Wall clock is used so the state can be persisted; ignore backward jumps
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+    def take(self) -> None:
+        self._refill()
+        self.tokens -= 1
+
+    def drain(self) -> None:
+        self._refill()
+        self.tokens = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {"tokens": self.tokens, "updated": self.updated}
+
+    def load(self, state: Dict[str, float]) -> None:
+        self.tokens = min(self.capacity, float(state["tokens"]))
+        self.updated = float(state["updated"])
+
+class DailyWindow:
+    """At most `capacity` calls per UTC calendar day
+
+    Unlike a token bucket, unspent calls don't carry over and nothing
+    refills during the day, so the provider's daily limit always holds.
+    """
+
+    def __init__(self, capacity: int, clock: Callable[[], float] = time.time):
+        self.capacity = capacity
+        self.clock = clock
+        self.day = self._today()
+        self.used = 0
+
+    def _today(self) -> str:
+        return time.strftime("%Y-%m-%d", time.gmtime(self.clock()))
+
+    def _roll_over(self) -> None:
+        today = self._today()
+        if today != self.day:
+            self.day = today
+            self.used = 0
+
+    def available(self) -> float:
+        self._roll_over()
+        return float(self.capacity - self.used)
+
+    def take(self) -> None:
+        self._roll_over()
+        self.used += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"day": self.day, "used": self.used}
+
+    def load(self, state: Dict[str, Any]) -> None:
+        self.day = str(state["day"])
+        self.used = int(state["used"])
+
+class ProviderQuota:
+    """Per-minute and per-day call budget for one upstream provider
+
+    Every call to the provider must acquire a token first. The minute
+    budget is a token bucket; the day budget is a fixed UTC-day window. Lower-priority
+    callers can't spend the share of the daily budget reserved for higher
+    priorities. The budget state is saved to disk after every call so a
+    restart doesn't reset the daily budget.
+    """
+
+    def __init__(self, name: str, per_minute: Optional[int], per_day: Optional[int],
+                 state_path: Optional[str] = None, clock: Callable[[], float] = time.time):
+        self.name = name
+        self.state_path = state_path
+        self.minute = TokenBucket(per_minute, 60.0, clock) if per_minute else None
+        self.day = DailyWindow(per_day, clock) if per_day else None
+        self.denied = 0
+        self._load()
+
+    def try_acquire(self, priority: str = "normal") -> bool:
+        """Take a token if the budget allows a call at this priority"""
+        if self.minute is not None and self.minute.available() < 1:
+            self.denied += 1
+            return False
+        if self.day is not None:
+            reserve = PRIORITY_RESERVE.get(priority, PRIORITY_RESERVE["normal"]) * self.day.capacity
+            if self.day.available() < 1 + reserve:
+                self.denied += 1
+                return False
+        for bucket in (self.minute, self.day):
+            if bucket is not None:
+                bucket.take()
+        self._save()
+        return True
+
+    def report_rate_limited(self) -> None:
+        """Provider said we're over its limit: stop calling until the minute refills"""
+        if self.minute is not None:
+            self.minute.drain()
+            self._save()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "minute_tokens": None if self.minute is None else round(self.minute.available(), 2),
+            "day_tokens": None if self.day is None else round(self.day.available(), 2),
+            "denied": self.denied
+        }
+
+    def _load(self) -> None:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+            if self.minute is not None and "minute" in state:
+                self.minute.load(state["minute"])
+            if self.day is not None and "day" in state:
+                self.day.load(state["day"])
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: ignoring unreadable quota state {self.state_path}: {e}")
+
+    def _save(self) -> None:
+        if not self.state_path:
+            return
+        state = {}
+        if self.minute is not None:
+            state["minute"] = self.minute.to_dict()
+        if self.day is not None:
+            state["day"] = self.day.to_dict()
+        try:
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"Warning: could not save quota state {self.state_path}: {e}")
+
+def quota_state_path(provider: str) -> str:
+    return os.path.join(QUOTA_STATE_DIR, f"pricing-bitcoin-quota-{provider}.json")
@@ -0,0 +1,151 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from quota import PRIORITY_RESERVE
+
+# Refresh entries once this fraction of their TTL has elapsed
+REFRESH_AHEAD = 0.8
+
+class RefreshJob:
+    """One price kept warm by the refresher"""
+
+    def __init__(self, name: str, provider: str, ttl: Optional[float],
+                 refresh: Callable[[], Awaitable[Any]], priority: Optional[str] = None,
+                 items: Optional[List[str]] = None):
+        self.name = name
+        self.provider = provider
+        self.ttl = ttl
+        self.refresh = refresh
+        self.priority = priority  # quota priority its calls are made at (None: no reserve applies)
+        self.items = items or []  # items a batch job refreshes, each listed in the schedule
+        self.interval: Optional[float] = None  # None = refresh once
+        self.next_due: Optional[float] = None
+        self.last_refreshed: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+class PriceRefresher:
+    """Background scheduler that refreshes prices before their TTL runs out
+
+    Calls to one provider are spaced at least 60 / per_minute seconds apart,
+    and each job's interval is stretched when needed so the provider's jobs
+    together stay within its daily budget. That is the part of the budget
+    the lowest-priority job may spend: its calls are spread over the whole
+    day, so the day's calls must fit before its reserve is reached.
+    """
+
+    def __init__(self, jobs: List[RefreshJob], provider_limits: Dict[str, Dict[str, Any]],
+                 clock: Callable[[], float] = time.monotonic):
+        self.jobs = jobs
+        self.provider_limits = provider_limits
+        self.clock = clock
+        self._provider_gap: Dict[str, float] = {}
+        self._provider_next_slot: Dict[str, float] = {}
+        self._runner: Optional[asyncio.Task] = None
+        self._in_progress: Set[asyncio.Task] = set()
+        self.plan()
+
+    def plan(self) -> None:
+        """Work out each job's refresh interval and stagger the first runs"""
+        now = self.clock()
+        by_provider: Dict[str, List[RefreshJob]] = {}
+        for job in self.jobs:
+            by_provider.setdefault(job.provider, []).append(job)
+
+        for provider, jobs in by_provider.items():
+            limits = self.provider_limits.get(provider, {})
+            per_minute = limits.get("per_minute")
+            per_day = limits.get("per_day")
+            gap = 60.0 / per_minute if per_minute else 0.0
+            self._provider_gap[provider] = gap
+            self._provider_next_slot[provider] = now
+
+            # Shortest interval at which all of the provider's jobs fit the daily
+            # budget left above the largest reserve among their priorities
+            budget_interval = 0.0
+            if per_day:
+                reserve = max(
+                    0.0 if job.priority is None else PRIORITY_RESERVE.get(job.priority, PRIORITY_RESERVE["normal"])
+                    for job in jobs
+                )
+                # Less a call per job for the part-interval a UTC day can end on
+                usable = per_day * (1 - reserve) - len(jobs)
+                budget_interval = len(jobs) * 86400.0 / usable
+            for index, job in enumerate(jobs):
+                if job.ttl is None:
+                    job.interval = None
+                else:
+                    job.interval = max(job.ttl * REFRESH_AHEAD, budget_interval)
+                    if job.interval >= job.ttl:
+                        print(f"Warning: {provider} budget only allows refreshing "
+                              f"{job.name} every {job.interval:.0f}s (ttl {job.ttl:.0f}s)")
+                job.next_due = now + index * gap
+
+    def _next_job(self) -> Optional[RefreshJob]:
+        pending = [job for job in self.jobs if job.next_due is not None]
+        if not pending:
+            return None
+        return min(pending, key=lambda job: max(job.next_due, self._provider_next_slot[job.provider]))
+
+    async def _run_job(self, job: RefreshJob) -> None:
+        try:
+            await job.refresh()
+            job.last_error = None
+        except Exception as e:
+            job.last_error = str(e)
+            print(f"Error refreshing {job.name}: {e}")
+        job.last_refreshed = self.clock()
+
+    async def run(self) -> None:
+        """Refresh jobs forever, one provider slot at a time"""
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            start_at = max(job.next_due, self._provider_next_slot[job.provider])
+            delay = start_at - self.clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            now = self.clock()
+            self._provider_next_slot[job.provider] = now + self._provider_gap[job.provider]
+            job.next_due = None if job.interval is None else now + job.interval
+
+            # Run the refresh concurrently so a slow provider doesn't hold up the others
+            task = asyncio.ensure_future(self._run_job(job))
+            self._in_progress.add(task)
+            task.add_done_callback(self._in_progress.discard)
+
+    def start(self) -> None:
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.ensure_future(self.run())
+
+    async def stop(self) -> None:
+        tasks = list(self._in_progress)
+        if self._runner is not None:
+            tasks.append(self._runner)
+            self._runner = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def schedule(self) -> Dict[str, Dict[str, Any]]:
+        """When each job, and each item a batch job covers, last ran and is due next"""
+        now = self.clock()
+        wall_now = time.time()
+        result = {}
+        for job in self.jobs:
+            next_in = None if job.next_due is None else max(0.0, job.next_due - now)
+            result[job.name] = {
+                "provider": job.provider,
+                "interval": job.interval,
+                "next_refresh_in": None if next_in is None else round(next_in, 1),
+                "next_refresh_at": None if next_in is None else time.strftime(
+                    "%Y-%m-%dT%H:%M:%SZ", time.gmtime(wall_now + next_in)),
+                "last_refreshed_ago": None if job.last_refreshed is None else round(now - job.last_refreshed, 1),
+                "last_error": job.last_error
+            }
+        for job in self.jobs:
+            for item_name in job.items:
+                result.setdefault(item_name, dict(result[job.name], job=job.name))
+        return result
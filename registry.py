@@ -0,0 +1,95 @@
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+class ItemSpec:
+    """Declaration of one item: where its price comes from and how it is shown
+
+    `series` is the provider's identifier for the price (a FRED or BLS series
+    ID, an Alpha Vantage function or currency code), `transform` turns the
+    provider's value into USD per unit, and `fallback` is served when there
+    is no key and no last good price.
+    """
+    __slots__ = (
+        "name", "category", "unit", "provider", "series", "transform", "ttl", "fallback",
+        "priority", "historical_support", "fred_series", "bls_series"
+    )
+
+    def __init__(self, name: str, category: str, unit: str, provider: str, fallback: float,
+                 ttl: Optional[float] = None, series: Optional[str] = None,
+                 transform: Optional[Callable[[float], float]] = None, priority: str = "normal",
+                 historical_support: bool = False, fred_series: Optional[str] = None,
+                 bls_series: Optional[str] = None):
+        self.name = name
+        self.category = category
+        self.unit = unit
+        self.provider = provider
+        self.series = series
+        self.transform = transform
+        self.ttl = ttl
+        self.fallback = fallback
+        self.priority = priority
+        self.historical_support = historical_support
+        self.fred_series = fred_series  # monthly history for /api/historical
+        self.bls_series = bls_series  # also published by BLS (batched when BLS_API_KEY is set)
+
+    def to_usd(self, value: float) -> float:
+        return value if self.transform is None else self.transform(value)
+
+    def __repr__(self) -> str:
+        return f"ItemSpec({self.name!r}, provider={self.provider!r}, series={self.series!r})"
+
+class ItemRegistry:
+    """Items by name, with the BLS series index built once
+
+    Lookups are a single dict access however many items are registered.
+    Iterating yields item names in declaration order.
+    """
+    __slots__ = ("_by_name", "_bls_series")
+
+    def __init__(self, specs: Iterable[ItemSpec]):
+        self._by_name: Dict[str, ItemSpec] = {}
+        for spec in specs:
+            if spec.name in self._by_name:
+                raise ValueError(f"Item '{spec.name}' is registered twice")
+            self._by_name[spec.name] = spec
+        self._bls_series: Mapping[str, str] = MappingProxyType({
+            spec.name: spec.bls_series for spec in self._by_name.values() if spec.bls_series
+        })
+
+    def __getitem__(self, item_name: str) -> ItemSpec:
+        return self._by_name[item_name]
+
+    def __contains__(self, item_name: object) -> bool:
+        return item_name in self._by_name
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._by_name)
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def get(self, item_name: str) -> Optional[ItemSpec]:
+        return self._by_name.get(item_name)
+
+    def items(self) -> Iterable[Tuple[str, ItemSpec]]:
+        return self._by_name.items()
+
+    def values(self) -> Iterable[ItemSpec]:
+        return self._by_name.values()
+
+    def bls_series(self) -> Mapping[str, str]:
+        """Item name -> BLS series ID for every item BLS publishes"""
+        return self._bls_series
+
+    def plan(self, item_names: Iterable[str],
+             provider_of: Callable[[ItemSpec], str] = lambda spec: spec.provider) -> Dict[str, List[ItemSpec]]:
+        """Group items by the provider that will fetch them, each item once, in order"""
+        groups: Dict[str, List[ItemSpec]] = {}
+        seen = set()
+        for item_name in item_names:
+            if item_name in seen:
+                continue
+            seen.add(item_name)
+            spec = self._by_name[item_name]
+            groups.setdefault(provider_of(spec), []).append(spec)
+        return groups
@@ -4,6 +4,7 @@ let currentUnit = 'btc'; // 'btc' or 'sats'
 let debounceTimer = null;
 let currentItem = '';
 let itemsData = {};
+let livePrices = {}; // "btc" and item keys -> {price, fetched_at, version, ttl} from the price stream
 
 // DOM elements
 let btcInput = document.getElementById('btc-input');
@@ -28,6 +29,7 @@ document.addEventListener('DOMContentLoaded', function() {
     console.log('DOM loaded, initializing app...');
     setDefaultDates();
     updateUIForDirection();
+    connectPriceStream();
     
     // Test if CanvasJS is loaded
     setTimeout(() => {
@@ -93,8 +95,108 @@ function setupEventListeners() {
     }
 }
 
+function connectPriceStream() {
+    if (typeof EventSource === 'undefined') {
+        return; // Conversions keep going through /api/convert
+    }
+    // The server sends every price on connect (and on each reconnect), then only changes
+    const stream = new EventSource('/api/prices/stream');
+    stream.addEventListener('snapshot', event => applyPrices(JSON.parse(event.data)));
+    stream.addEventListener('delta', event => applyPrices(JSON.parse(event.data)));
+}
+
+function applyPrices(update) {
+    Object.assign(livePrices, update.prices);
+    // Keep the displayed conversion in step with the new prices
+    if (currentItem && (update.prices.btc || update.prices[currentItem])) {
+        convertLocally();
+    }
+}
+
+// A streamed price past its TTL goes through /api/convert instead, which
+// refetches it (the stream then delivers the new price)
+function isFresh(entry) {
+    return entry.ttl == null || Date.now() / 1000 - entry.fetched_at < entry.ttl;
+}
+
+// Same fixed-point arithmetic as conversion.py (behind compute_conversion in
+// server.py): sats, micro-USD prices and millionths of an item, each result
+// rounded half-to-even once, so it matches /api/convert to the last digit
+const SATS_PER_BTC = 100000000n;
+const MICROS = 1000000n;
+const MICROS_PER_CENT = 10000n;
+
+// Math.round rounds halves up; Python's round() goes to the even neighbour
+function roundHalfEven(value) {
+    const rounded = Math.round(value);
+    return rounded - value === 0.5 && rounded % 2 !== 0 ? rounded - 1 : rounded;
+}
+
+function toMicros(value) {
+    return BigInt(roundHalfEven(value * 1000000));
+}
+
+function divRound(numerator, denominator) {
+    const quotient = numerator / denominator;
+    const remainder = numerator % denominator;
+    if (2n * remainder > denominator || (2n * remainder === denominator && quotient % 2n === 1n)) {
+        return quotient + 1n;
+    }
+    return quotient;
+}
+
+function toCents(microUsd) {
+    return Number(divRound(microUsd, MICROS_PER_CENT)) / 100;
+}
+
+// Convert with streamed prices, like /api/convert would.
+// Returns false when the prices (or a valid input) aren't there yet.
+function convertLocally() {
+    const btc = livePrices.btc;
+    const item = livePrices[currentItem];
+    const inputElement = currentDirection === 'btc_to_item'
+        ? document.getElementById('btc-input')
+        : document.getElementById('quantity-input');
+    if (!btc || !item || !isFresh(btc) || !isFresh(item) || !inputElement || !inputElement.value) {
+        return false;
+    }
+    
+    const inputValue = parseFloat(inputElement.value);
+    const btcMicro = toMicros(btc.price);
+    const itemMicro = toMicros(item.price);
+    if (!(inputValue > 0) || btcMicro === 0n || itemMicro === 0n) {
+        return false;
+    }
+    
+    const sats = currentUnit === 'sats';
+    let quantity, usdTotal;
+    if (currentDirection === 'btc_to_item') {
+        const amountSats = BigInt(roundHalfEven(sats ? inputValue : inputValue * 100000000));
+        const usdNumerator = amountSats * btcMicro;
+        quantity = Number(divRound(usdNumerator * MICROS, SATS_PER_BTC * itemMicro)) / 1000000;
+        usdTotal = Number(divRound(usdNumerator, SATS_PER_BTC * MICROS_PER_CENT)) / 100;
+    } else {
+        const usdNumerator = toMicros(inputValue) * itemMicro;
+        const btcNeededSats = divRound(usdNumerator * SATS_PER_BTC, MICROS * btcMicro);
+        quantity = sats ? Number(btcNeededSats) : Number(btcNeededSats) / 100000000;
+        usdTotal = Number(divRound(usdNumerator, MICROS * MICROS_PER_CENT)) / 100;
+    }
+    
+    updateResults({
+        quantity: quantity,
+        usd_item: toCents(itemMicro),
+        usd_total: usdTotal,
+        btc_price: toCents(btcMicro)
+    });
+    return true;
+}
+
 function debounceConvert() {
     clearTimeout(debounceTimer);
+    // No round trip needed once the price stream has delivered both prices
+    if (currentItem && convertLocally()) {
+        return;
+    }
     debounceTimer = setTimeout(() => {
         if (currentItem && btcInput.value) {
             performConversion();
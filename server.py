@@ -0,0 +1,888 @@
+from fastapi import APIRouter, FastAPI, HTTPException, Query, Body, Request, Response
+from fastapi.staticfiles import StaticFiles
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel
+import hashlib
+import httpx
+import os
+from typing import Any, AsyncIterator, Dict, Optional, List, Set, Tuple
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate, parsedate_to_datetime
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager
+from settings import settings
+from items import (
+    BATCHED_PROVIDERS, ITEMS, MONTHLY_SERIES_TTL, PROVIDER_LIMITS, alpha_vantage_quota, get_daily_series,
+    get_item_fetcher, get_item_prices, get_items_by_category, group_ttl, item_display_name, item_provider,
+    refresh_item_price, refresh_provider_items, restore_item_prices, stored_daily_series
+)
+from http_client import get_http_client, close_http_client, SLOW_TIMEOUT
+from circuit_breaker import circuit_breakers
+from price_cache import item_price_cache
+from singleflight import upstream_flight
+from refresher import PriceRefresher, RefreshJob
+from btc_history import btc_history
+from fred_cache import SeriesRangeCache
+from registry import ItemSpec
+from price_store import price_store
+from price_feed import price_feed
+from fast_json import FastJSONResponse, dumps, model_bytes
+from conversion import convert_amount
+from shared_prices import shared_price_table
+from cache_backend import distributed_cache
+from btc_sources import btc_price_aggregator
+from snapshot import load_snapshot
+
+# Keep BTC and item prices warm in the background (disable with PRICE_REFRESHER=false)
+PRICE_REFRESHER_ENABLED = settings.price_refresher
+price_refresher: Optional[PriceRefresher] = None
+
+# With several workers (uvicorn --workers / gunicorn), share prices through a
+# memory-mapped table: one elected worker refreshes, the others read its prices
+SHARED_PRICES_ENABLED = settings.shared_prices
+# How often followers copy the shared table and retry the leader election
+SHARED_PRICES_SYNC_INTERVAL = settings.shared_prices_sync_interval
+
+def build_price_refresher() -> PriceRefresher:
+    """Schedule the BTC price and every ITEMS entry for background refresh"""
+    jobs = [RefreshJob("btc", "coingecko", BTC_PRICE_TTL, refresh_btc_price)]
+    for provider, specs in ITEMS.plan(ITEMS, item_provider).items():
+        if provider in BATCHED_PROVIDERS:
+            # One batched or pipelined call refreshes all of the provider's items
+            item_names = [spec.name for spec in specs]
+            jobs.append(RefreshJob(
+                f"{provider}_batch",
+                provider,
+                group_ttl(specs),
+                lambda provider=provider, item_names=item_names: refresh_provider_items(provider, item_names),
+                items=item_names
+            ))
+            continue
+        for spec in specs:
+            jobs.append(RefreshJob(
+                spec.name,
+                provider,
+                spec.ttl,
+                lambda item_name=spec.name: refresh_item_price(item_name),
+                priority=spec.priority
+            ))
+    return PriceRefresher(jobs, PROVIDER_LIMITS)
+
+def start_price_refresher() -> None:
+    global price_refresher
+    if PRICE_REFRESHER_ENABLED and price_refresher is None:
+        price_refresher = build_price_refresher()
+        price_refresher.start()
+
+def shared_price_keys() -> List[str]:
+    return ["btc"] + [f"item:{item_name}" for item_name in ITEMS]
+
+def sync_shared_prices() -> bool:
+    """Become the refreshing worker if the leader is gone, otherwise copy its prices
+
+    Returns True if this worker is the leader.
+    """
+    if shared_price_table.try_become_leader():
+        # Publish what this worker already has so followers aren't left empty
+        for key, (price, fetched_at) in price_store.load_all().items():
+            shared_price_table.publish(key, price, fetched_at)
+        return True
+    apply_stored_prices(shared_price_table.read_all())
+    return False
+
+async def follow_shared_prices() -> None:
+    while True:
+        try:
+            if sync_shared_prices():
+                start_price_refresher()
+                return
+        except Exception as e:
+            print(f"Error syncing shared prices: {e}")
+        await asyncio.sleep(SHARED_PRICES_SYNC_INTERVAL)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared upstream client and start the price refresher"""
+    global price_refresher
+    get_http_client()
+    follower = None
+    if SHARED_PRICES_ENABLED:
+        shared_price_table.open(shared_price_keys())
+        # Settle leadership before serving, so a follower never fetches upstream
+        if sync_shared_prices():
+            start_price_refresher()
+        else:
+            follower = asyncio.create_task(follow_shared_prices())
+    else:
+        start_price_refresher()
+    yield
+    if follower is not None:
+        follower.cancel()
+        await asyncio.gather(follower, return_exceptions=True)
+    if price_refresher is not None:
+        await price_refresher.stop()
+        price_refresher = None
+    shared_price_table.close()
+    await distributed_cache.close()
+    await close_http_client()
+
+# Routes shared by every deployment; create_app() mounts them
+router = APIRouter()
+
+# Static assets are resolved from the project root, not the working directory
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def asset_path(*parts: str) -> str:
+    return os.path.join(BASE_DIR, *parts)
+
+class ConvertResponse(BaseModel):
+    quantity: float
+    usd_item: float
+    usd_total: float
+    btc_price: float
+    btc_price_status: str = "fresh"
+
+class ConvertRequest(BaseModel):
+    item: str
+    direction: str = "btc_to_item"
+    btc_amount: Optional[float] = None
+    quantity: Optional[float] = None
+    sats: bool = False
+
+class BatchConvertResult(BaseModel):
+    result: Optional[ConvertResponse] = None
+    error: Optional[str] = None
+
+class BatchConvertResponse(BaseModel):
+    results: List[BatchConvertResult]
+
+# Largest number of conversions accepted by /api/convert/batch
+MAX_BATCH_CONVERSIONS = 100
+
+class PurchasingPowerItem(BaseModel):
+    item: str
+    name: str
+    category: str
+    unit: str
+    quantity: float
+    usd_item: float
+
+class PurchasingPowerResponse(BaseModel):
+    usd_total: float
+    btc_price: float
+    btc_price_status: str
+    items: List[PurchasingPowerItem]
+
+class HistoricalResponse(BaseModel):
+    dates: List[str]
+    btc_prices: List[float]
+
+# FRED observation ranges already fetched per series (monthly data, refetched daily)
+fred_range_cache = SeriesRangeCache(ttl=MONTHLY_SERIES_TTL)
+
+# Cache for BTC price (5 min cache), timestamped with time.monotonic()
+btc_price_cache = {"price": None, "timestamp": None}
+BTC_PRICE_TTL = 300
+# Seconds past the TTL during which the cached price is served while it
+# refreshes in the background (0 disables stale-while-revalidate)
+BTC_PRICE_STALE_GRACE = settings.btc_price_stale_grace
+
+# Identifies this process in validators built from per-process counters
+BOOT_ID = uuid.uuid4().hex
+
+# Strong references to background refreshes so they aren't garbage collected
+_background_tasks: Set[asyncio.Task] = set()
+
+def apply_stored_prices(stored: Dict[str, Tuple[float, float]]) -> None:
+    """Seed the BTC and item caches from (price, fetched_at) entries"""
+    restore_item_prices(stored)
+    if "btc" in stored:
+        restore_btc_price(*stored["btc"])
+
+def restore_btc_price(price: float, fetched_at: float) -> float:
+    """Cache a BTC price fetched at fetched_at (unix time); returns its age"""
+    # Carry the price's age over to the monotonic clock
+    age = max(0.0, time.time() - fetched_at)
+    btc_price_cache["price"] = price
+    btc_price_cache["timestamp"] = time.monotonic() - age
+    price_feed.update("btc", price, fetched_at)
+    return age
+
+def apply_snapshot_prices(snapshot: Dict[str, Tuple[float, float]]) -> None:
+    """Seed the caches from the build-time snapshot so a cold start needs no upstream call
+
+    Entries older than settings.snapshot_max_age are skipped. An expired
+    BTC price is served as stale (refreshing in the background) and expired
+    item prices are served for settings.snapshot_grace seconds.
+    """
+    now = time.time()
+    usable = {
+        key: (price, fetched_at) for key, (price, fetched_at) in snapshot.items()
+        if now - fetched_at < settings.snapshot_max_age
+    }
+    restore_item_prices(usable, expired_ttl=settings.snapshot_grace)
+    if "btc" in usable:
+        price, fetched_at = usable["btc"]
+        # At most just expired, so it lands in the stale-while-revalidate window
+        age = min(max(0.0, now - fetched_at), BTC_PRICE_TTL)
+        btc_price_cache["price"] = price
+        btc_price_cache["timestamp"] = time.monotonic() - age
+        price_feed.update("btc", price, fetched_at)
+
+def restore_cached_prices() -> None:
+    """Warm the BTC and item caches from the build snapshot and the persistent price store"""
+    stored = price_store.load_all()
+    now = time.time()
+    # Per key the newest price wins, and each key is applied once from its source
+    from_snapshot = {
+        key: entry for key, entry in load_snapshot(settings.price_snapshot_path).items()
+        if now - entry[1] < settings.snapshot_max_age and (key not in stored or stored[key][1] < entry[1])
+    }
+    apply_snapshot_prices(from_snapshot)
+    apply_stored_prices({key: entry for key, entry in stored.items() if key not in from_snapshot})
+
+async def fetch_btc_price_usd() -> float:
+    """Fetch current BTC price from the configured sources (CoinGecko first)"""
+    return await btc_price_aggregator.fetch()
+
+async def refresh_btc_price() -> float:
+    """Fetch the BTC price and update the cache"""
+    async def load() -> float:
+        # With a shared cache backend, reuse a price another node fetched recently
+        price, fetched_at = await distributed_cache.load("btc", BTC_PRICE_TTL, fetch_btc_price_usd)
+        btc_price_cache["price"] = price
+        btc_price_cache["timestamp"] = time.monotonic() - max(0.0, time.time() - fetched_at)
+        price_store.save("btc", price, fetched_at)
+        shared_price_table.publish("btc", price, fetched_at)
+        price_feed.update("btc", price, fetched_at)
+        # Extend the daily history; the last price of the day becomes its close
+        try:
+            btc_history.record_price(price)
+        except Exception as e:
+            print(f"Error recording BTC price history: {e}")
+        return price
+    # Concurrent cache misses share one upstream request
+    return await upstream_flight.do("coingecko:bitcoin", load)
+
+def _refresh_btc_price_in_background() -> None:
+    async def refresh():
+        try:
+            await refresh_btc_price()
+        except Exception as e:
+            print(f"Background BTC price refresh failed: {e}")
+    task = asyncio.get_running_loop().create_task(refresh())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+def follower_btc_quote() -> Tuple[float, str]:
+    """BTC price on a follower worker, read from the leader's shared table; never fetched here"""
+    entry = shared_price_table.read("btc")
+    if entry is not None:
+        age = restore_btc_price(*entry)
+        return entry[0], "fresh" if age < BTC_PRICE_TTL else "stale"
+    if btc_price_cache["price"] is not None:
+        return btc_price_cache["price"], "stale"
+    raise HTTPException(status_code=503, detail="Waiting for the refreshing worker's first BTC price")
+
+async def get_btc_quote() -> Tuple[float, str]:
+    """Get the BTC price and whether it is "fresh" or "stale"
+
+    Within BTC_PRICE_STALE_GRACE seconds after expiry the cached price is
+    returned immediately and refreshed in the background. Follower workers
+    only ever read the leader's price.
+    """
+    cached_price = btc_price_cache["price"]
+    if cached_price is not None:
+        age = time.monotonic() - btc_price_cache["timestamp"]
+        if age < BTC_PRICE_TTL:
+            return cached_price, "fresh"
+    if shared_price_table.is_follower:
+        return follower_btc_quote()
+    if cached_price is not None and age < BTC_PRICE_TTL + BTC_PRICE_STALE_GRACE:
+        _refresh_btc_price_in_background()
+        return cached_price, "stale"
+    
+    try:
+        return await refresh_btc_price(), "fresh"
+    except Exception as e:
+        # Fallback to cached value if available
+        if cached_price is not None:
+            return cached_price, "stale"
+        raise HTTPException(status_code=503, detail=f"Unable to fetch BTC price: {str(e)}")
+
+async def get_btc_price() -> float:
+    """Fetch current BTC price with caching"""
+    price, _ = await get_btc_quote()
+    return price
+
+@router.get("/")
+async def serve_index():
+    """Serve the main HTML page"""
+    try:
+        return FileResponse(asset_path("index.html"), media_type="text/html")
+    except Exception:
+        return FileResponse(asset_path("static", "index.html"), media_type="text/html")
+
+@router.get("/style.css")
+async def serve_css():
+    """Serve CSS file"""
+    try:
+        return FileResponse(asset_path("style.css"), media_type="text/css")
+    except Exception:
+        return FileResponse(asset_path("static", "style.css"), media_type="text/css")
+
+@router.get("/script.js")
+async def serve_js():
+    """Serve JavaScript file"""
+    try:
+        return FileResponse(asset_path("script.js"), media_type="application/javascript")
+    except Exception:
+        return FileResponse(asset_path("static", "script.js"), media_type="application/javascript")
+
+@router.get("/debug")
+async def serve_debug():
+    """Serve the debug HTML page"""
+    return FileResponse(asset_path("debug.html"))
+
+# max-age for /api/items; the catalog only changes with a deploy
+CATALOG_MAX_AGE = 3600
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header matches etag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip().removeprefix("W/") for candidate in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+def not_modified(request: Request, etag: str, last_modified: Optional[float] = None) -> bool:
+    """Whether a conditional GET can be answered with 304
+
+    If-Modified-Since is only consulted when there is no If-None-Match.
+    """
+    if "if-none-match" in request.headers:
+        return if_none_match(request, etag)
+    since = request.headers.get("if-modified-since")
+    if since is None or last_modified is None:
+        return False
+    try:
+        return int(last_modified) <= parsedate_to_datetime(since).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+def caching_headers(etag: str, max_age: float, last_modified: Optional[float] = None) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max(0, int(max_age))}"}
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    return headers
+
+def body_etag(body: bytes) -> str:
+    return f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+def btc_price_expires_in() -> float:
+    """Seconds until the cached BTC price stops being fresh"""
+    if btc_price_cache["timestamp"] is None:
+        return 0.0
+    return max(0.0, BTC_PRICE_TTL - (time.monotonic() - btc_price_cache["timestamp"]))
+
+def item_price_expires_in(item_name: str) -> float:
+    """Seconds until the item's latest price expires (a day for prices that never do)"""
+    ttl = ITEMS[item_name].ttl
+    entry = price_feed.entries.get(item_name)
+    if ttl is None:
+        return MONTHLY_SERIES_TTL
+    if entry is None:
+        return 0.0
+    return max(0.0, ttl - (time.time() - entry["fetched_at"]))
+
+# The catalog is encoded once at import and served as-is
+ITEMS_CATALOG_JSON = dumps(get_items_by_category())
+ITEMS_CATALOG_ETAG = body_etag(ITEMS_CATALOG_JSON)
+
+@router.get("/api/items")
+async def get_items(request: Request):
+    """Get available items grouped by category"""
+    headers = caching_headers(ITEMS_CATALOG_ETAG, CATALOG_MAX_AGE)
+    if not_modified(request, ITEMS_CATALOG_ETAG):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(ITEMS_CATALOG_JSON, headers=headers)
+
+@router.get("/api/cache")
+async def get_cache_stats():
+    """Get item price cache size and hit/miss counters"""
+    return item_price_cache.stats()
+
+@router.get("/api/quota")
+async def get_quota():
+    """Get remaining upstream call budgets"""
+    return {"alpha_vantage": alpha_vantage_quota.status()}
+
+@router.get("/api/circuit-breakers")
+async def get_circuit_breakers():
+    """Get the circuit breaker state of each upstream host"""
+    return {host: breaker.status() for host, breaker in circuit_breakers.items()}
+
+@router.get("/api/refresh/schedule")
+async def get_refresh_schedule():
+    """Get when each price was last refreshed and when it is due next"""
+    if price_refresher is None:
+        return {}
+    return price_refresher.schedule()
+
+def validate_conversion(
+    item: str,
+    direction: str,
+    btc_amount: Optional[float],
+    quantity: Optional[float]
+) -> None:
+    """Check conversion parameters, raising HTTPException(400) if invalid"""
+    
+    # Validate direction
+    if direction not in ["btc_to_item", "item_to_btc"]:
+        raise HTTPException(status_code=400, detail="Direction must be 'btc_to_item' or 'item_to_btc'")
+    
+    # Validate item exists
+    if item not in ITEMS:
+        raise HTTPException(status_code=400, detail=f"Item '{item}' not found")
+    
+    if direction == "btc_to_item":
+        # Validate BTC amount
+        if btc_amount is None:
+            raise HTTPException(status_code=400, detail="btc_amount is required for btc_to_item conversion")
+        
+        if btc_amount <= 0:
+            raise HTTPException(status_code=400, detail="BTC amount must be positive")
+    
+    else:  # item_to_btc
+        # Validate quantity
+        if quantity is None:
+            raise HTTPException(status_code=400, detail="quantity is required for item_to_btc conversion")
+        
+        if quantity <= 0:
+            raise HTTPException(status_code=400, detail="Quantity must be positive")
+
+def compute_conversion(
+    direction: str,
+    btc_amount: Optional[float],
+    quantity: Optional[float],
+    sats: bool,
+    btc_price: float,
+    btc_price_status: str,
+    item_price: float
+) -> ConvertResponse:
+    """Convert validated parameters using the given BTC and item prices
+
+    The response is built without validation: every field is already a
+    float or str of the right shape.
+    """
+    amount = btc_amount if direction == "btc_to_item" else quantity
+    result = convert_amount(direction, amount, sats, btc_price, item_price)
+    return ConvertResponse.model_construct(**result._asdict(), btc_price_status=btc_price_status)
+
+@router.get("/api/convert", response_model=ConvertResponse)
+async def convert(
+    request: Request,
+    btc_amount: Optional[float] = Query(None),
+    sats: bool = Query(False),
+    item: str = Query(...),
+    direction: str = Query("btc_to_item"),
+    quantity: Optional[float] = Query(None)
+):
+    """Convert between BTC and item quantities"""
+    validate_conversion(item, direction, btc_amount, quantity)
+    
+    try:
+        # Get BTC price and item price concurrently
+        btc_quote_task = get_btc_quote()
+        item_fetcher = get_item_fetcher(item)
+        item_price_task = item_fetcher()
+        
+        (btc_price, btc_price_status), item_price = await asyncio.gather(btc_quote_task, item_price_task)
+        
+        # The result only changes when one of the two prices does
+        headers = {}
+        btc_entry = price_feed.entries.get("btc")
+        item_entry = price_feed.entries.get(item)
+        if btc_entry is not None and item_entry is not None:
+            # From the prices themselves, so other workers and restarts agree on it
+            etag = body_etag(repr((
+                btc_price, btc_entry["fetched_at"], item_price, item_entry["fetched_at"], btc_price_status
+            )).encode())
+            last_modified = max(btc_entry["fetched_at"], item_entry["fetched_at"])
+            max_age = 0 if btc_price_status != "fresh" else min(
+                btc_price_expires_in(), item_price_expires_in(item)
+            )
+            headers = caching_headers(etag, max_age, last_modified)
+            if not_modified(request, etag, last_modified):
+                return Response(status_code=304, headers=headers)
+        
+        result = compute_conversion(
+            direction, btc_amount, quantity, sats, btc_price, btc_price_status, item_price
+        )
+        return FastJSONResponse(model_bytes(result), headers=headers)
+            
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Conversion error: {str(e)}")
+
+@router.post("/api/convert/batch", response_model=BatchConvertResponse)
+async def convert_batch(conversions: List[ConvertRequest] = Body(...)):
+    """Run many conversions against one BTC price and one price per distinct item"""
+    
+    if len(conversions) > MAX_BATCH_CONVERSIONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_CONVERSIONS} conversions per batch")
+    
+    # Validate every entry up front; invalid entries get an error, not a price lookup
+    errors: List[Optional[str]] = []
+    for entry in conversions:
+        try:
+            validate_conversion(entry.item, entry.direction, entry.btc_amount, entry.quantity)
+            errors.append(None)
+        except HTTPException as e:
+            errors.append(e.detail)
+    
+    try:
+        # Resolve the BTC price and each distinct item price once, concurrently
+        item_names = sorted({entry.item for entry, error in zip(conversions, errors) if error is None})
+        (btc_price, btc_price_status), prices = await asyncio.gather(
+            get_btc_quote(), get_item_prices(item_names)
+        )
+        
+        results = []
+        for entry, error in zip(conversions, errors):
+            if error is not None:
+                results.append(BatchConvertResult(error=error))
+                continue
+            results.append(BatchConvertResult(result=compute_conversion(
+                entry.direction, entry.btc_amount, entry.quantity, entry.sats,
+                btc_price, btc_price_status, prices[entry.item]
+            )))
+        return BatchConvertResponse(results=results)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Conversion error: {str(e)}")
+
+@router.get("/api/purchasing-power", response_model=PurchasingPowerResponse)
+async def purchasing_power(
+    btc_amount: float = Query(...),
+    sats: bool = Query(False),
+    category: Optional[str] = Query(None),
+    affordable_only: bool = Query(False),
+    sort: str = Query("none"),
+    descending: bool = Query(False)
+):
+    """Convert one BTC/sats amount into a quantity of every item"""
+    
+    if btc_amount <= 0:
+        raise HTTPException(status_code=400, detail="BTC amount must be positive")
+    
+    if sort not in ["none", "name", "quantity", "price"]:
+        raise HTTPException(status_code=400, detail="Sort must be 'none', 'name', 'quantity' or 'price'")
+    
+    item_names = [
+        item_name for item_name, spec in ITEMS.items()
+        if category is None or spec.category == category
+    ]
+    if not item_names:
+        raise HTTPException(status_code=400, detail=f"Category '{category}' not found")
+    
+    try:
+        # One snapshot: a single BTC quote and every item price, all from cache when warm
+        (btc_price, btc_price_status), item_prices = await asyncio.gather(
+            get_btc_quote(), get_item_prices(item_names)
+        )
+        
+        items = []
+        usd_total = None
+        for item_name, item_price in item_prices.items():
+            converted = compute_conversion(
+                "btc_to_item", btc_amount, None, sats, btc_price, btc_price_status, item_price
+            )
+            usd_total = converted.usd_total
+            if affordable_only and converted.quantity < 1:
+                continue
+            items.append(PurchasingPowerItem(
+                item=item_name,
+                name=item_display_name(item_name),
+                category=ITEMS[item_name].category,
+                unit=ITEMS[item_name].unit,
+                quantity=converted.quantity,
+                usd_item=converted.usd_item
+            ))
+        
+        if sort != "none":
+            sort_keys = {
+                "name": lambda entry: entry.name,
+                "quantity": lambda entry: entry.quantity,
+                "price": lambda entry: entry.usd_item
+            }
+            items.sort(key=sort_keys[sort], reverse=descending)
+        
+        return PurchasingPowerResponse(
+            usd_total=usd_total,
+            btc_price=round(btc_price, 2),
+            btc_price_status=btc_price_status,
+            items=items
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Conversion error: {str(e)}")
+
+# Seconds between SSE keep-alive comments on an idle price stream
+PRICE_STREAM_KEEPALIVE = 15.0
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+
+def price_ttl(key: str) -> Optional[float]:
+    """Seconds a feed price stays fresh (None for prices that never expire)"""
+    return BTC_PRICE_TTL if key == "btc" else ITEMS[key].ttl
+
+def with_ttls(changes: Dict[str, Any]) -> Dict[str, Any]:
+    """Feed changes with each price's TTL, so clients can tell when it is stale"""
+    return dict(changes, prices={
+        key: dict(entry, ttl=price_ttl(key)) for key, entry in changes["prices"].items()
+    })
+
+async def warm_price_feed() -> None:
+    """Bring every price in the feed up to date
+
+    Goes through the cached lookups, so prices within their TTL cost
+    nothing; expired ones are refetched (the BTC price in the background
+    while stale) even when no refresher is running.
+    """
+    await asyncio.gather(get_btc_quote(), get_item_prices(list(ITEMS)), return_exceptions=True)
+
+async def price_events(keepalive: float = PRICE_STREAM_KEEPALIVE) -> AsyncIterator[str]:
+    """A snapshot of every price, then a delta each time prices change"""
+    snapshot = price_feed.changes_since(0)
+    version = snapshot["version"]
+    yield format_sse("snapshot", with_ttls(snapshot))
+    while True:
+        if not await price_feed.wait_for_change(version, keepalive):
+            yield ": keep-alive\n\n"
+            continue
+        delta = price_feed.changes_since(version)
+        version = delta["version"]
+        yield format_sse("delta", with_ttls(delta))
+
+
+@router.get("/api/prices")
+async def get_prices(request: Request, since: int = Query(0, ge=0), epoch: Optional[str] = Query(None)):
+    """Snapshot of the BTC price and every item price, or only those changed since a version"""
+    await warm_price_feed()
+    # A version seen on another worker or before a restart gets a full snapshot
+    if epoch != price_feed.epoch:
+        since = 0
+    version = price_feed.version
+    etag = f'"{price_feed.epoch}-{version}"' if since == 0 else f'"{price_feed.epoch}-{version}-{since}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    changes = price_feed.changes_since(since)
+    prices = {
+        key: {
+            "price": entry["price"],
+            "fetched_at": entry["fetched_at"],
+            "ttl": price_ttl(key),
+            "unit": "BTC" if key == "btc" else ITEMS[key].unit
+        }
+        for key, entry in changes["prices"].items()
+    }
+    return FastJSONResponse(
+        {"epoch": price_feed.epoch, "version": changes["version"], "prices": prices}, headers=headers
+    )
+
+@router.get("/api/prices/stream")
+async def price_stream():
+    """Server-Sent Events stream of BTC and item prices"""
+    await warm_price_feed()
+    return StreamingResponse(
+        price_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def fred_observations(item: str, fred_series: Optional[str], range_start: str,
+                            range_end: str) -> List[Tuple[str, float]]:
+    """Monthly (date, value) observations of an item's FRED series within the range"""
+    if not fred_series:
+        raise HTTPException(status_code=400, detail=f"No FRED series configured for '{item}'")
+    
+    # Fetch historical data from FRED API
+    fred_api_key = settings.fred_api_key
+    if not fred_api_key:
+        raise HTTPException(status_code=503, detail="FRED API key not configured")
+    
+    # Only the parts of the range not fetched before go to FRED
+    missing_ranges = fred_range_cache.missing(fred_series, range_start, range_end)
+    
+    async def fetch_observations(start: str, end: str) -> None:
+        fred_params = {
+            "series_id": fred_series,
+            "api_key": fred_api_key,
+            "file_type": "json",
+            "observation_start": start,
+            "observation_end": end,
+            "frequency": "m"  # Monthly data
+        }
+        client = get_http_client()
+        fred_response = await client.get(
+            "https://api.stlouisfed.org/fred/series/observations",
+            params=fred_params,
+            timeout=SLOW_TIMEOUT
+        )
+        fred_response.raise_for_status()
+        observations = [
+            (obs["date"], obs["value"]) for obs in fred_response.json().get("observations", [])
+        ]
+        fred_range_cache.add(fred_series, start, end, observations)
+    
+    # Identical concurrent chart requests share one FRED call per missing range
+    await asyncio.gather(*(
+        upstream_flight.do(
+            ("fred", fred_series, start, end),
+            lambda start=start, end=end: fetch_observations(start, end)
+        )
+        for start, end in missing_ranges
+    ))
+    
+    return [
+        (obs_date, float(value))
+        for obs_date, value in fred_range_cache.slice(fred_series, range_start, range_end)
+        if value != "."  # FRED uses "." for missing data
+    ]
+
+def historical_validator(spec: ItemSpec, range_start: str, range_end: str) -> Optional[Tuple[str, float]]:
+    """ETag and max-age of a chart, from the cached data it is built from
+
+    None if some of that data isn't cached and has to be fetched first.
+    Lets a conditional request be answered before fetching or serializing.
+    """
+    series = stored_daily_series(spec.name)
+    if series is not None and series.expires_in(spec.ttl) > 0:
+        version = series.fetched_at
+        max_age = series.expires_in(spec.ttl)
+    else:
+        version = fred_range_cache.version(spec.fred_series, range_start, range_end)
+        if version is None:
+            return None
+        max_age = fred_range_cache.expires_in(spec.fred_series)
+    # The range cache and history versions are only meaningful within this process
+    parts = [BOOT_ID, spec.name, range_start, range_end, repr(version), str(btc_history.version)]
+    
+    # Today's close and dates before the stored history follow the spot price
+    today = datetime.now(timezone.utc).date().isoformat()
+    if range_end >= today or not btc_history.starts_on_or_before(range_start):
+        btc_entry = price_feed.entries.get("btc")
+        if btc_entry is None:
+            return None
+        parts.append(repr((btc_entry["price"], btc_entry["fetched_at"])))
+        max_age = min(max_age, btc_price_expires_in())
+    return body_etag("|".join(parts).encode()), max_age
+
+@router.get("/api/historical", response_model=HistoricalResponse)
+async def historical(
+    request: Request,
+    item: str = Query(...),
+    from_date: str = Query(...),
+    to_date: str = Query(...)
+):
+    """Get historical price data for CPI items"""
+    
+    # Validate item exists and has historical support
+    if item not in ITEMS:
+        raise HTTPException(status_code=400, detail=f"Item '{item}' not found")
+    
+    spec = ITEMS[item]
+    if not spec.historical_support:
+        raise HTTPException(status_code=400, detail=f"Historical data not available for '{item}'")
+    
+    try:
+        # Validate date format
+        from_dt = datetime.strptime(from_date, "%Y-%m-%d")
+        to_dt = datetime.strptime(to_date, "%Y-%m-%d")
+        
+        if from_dt >= to_dt:
+            raise HTTPException(status_code=400, detail="from_date must be before to_date")
+        
+        # Limit to reasonable date range (max 2 years)
+        if (to_dt - from_dt).days > 730:
+            raise HTTPException(status_code=400, detail="Date range cannot exceed 2 years")
+        
+        range_start = from_dt.date().isoformat()
+        range_end = to_dt.date().isoformat()
+        
+        validator = historical_validator(spec, range_start, range_end)
+        if validator is not None and not_modified(request, validator[0]):
+            return Response(status_code=304, headers=caching_headers(*validator))
+        
+        # Oil and natural gas: daily points from the same Alpha Vantage fetch as their spot price
+        series = await get_daily_series(item)
+        if series is not None:
+            observations = [(day, spec.to_usd(value)) for day, value in series.slice(range_start, range_end)]
+            max_age = series.expires_in(spec.ttl)
+        else:
+            observations = await fred_observations(item, spec.fred_series, range_start, range_end)
+            max_age = fred_range_cache.expires_in(spec.fred_series)
+        
+        # Join each observation date to the BTC close on (or just before) that day
+        dates = [obs_date for obs_date, _ in observations]
+        btc_closes = btc_history.closes_on_or_before(dates)
+        
+        # Dates before the stored history fall back to the current price
+        spot_price = await get_btc_price() if None in btc_closes else None
+        
+        btc_prices = []
+        for (_, item_price_usd), btc_close in zip(observations, btc_closes):
+            # Calculate BTC price needed to buy this item at this time
+            btc_equivalent = item_price_usd / (btc_close if btc_close is not None else spot_price)
+            btc_prices.append(round(btc_equivalent, 8))
+        
+        body = model_bytes(HistoricalResponse.model_construct(dates=dates, btc_prices=btc_prices))
+        
+        # Cacheable until the series is refetched (or the spot price expires, if used)
+        validator = historical_validator(spec, range_start, range_end)
+        if validator is not None:
+            etag, max_age = validator
+        else:
+            etag = body_etag(body)
+            if spot_price is not None:
+                max_age = min(max_age, btc_price_expires_in())
+        headers = caching_headers(etag, max_age)
+        if not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+        return FastJSONResponse(body, headers=headers)
+            
+    except HTTPException:
+        raise
+    except ValueError as e:
+        if "time data" in str(e):
+            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+        raise HTTPException(status_code=400, detail=str(e))
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=504, detail="Timeout fetching historical data")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Historical data error: {str(e)}")
+
+def create_app(background_refresh: bool = True) -> FastAPI:
+    """Build the app around the shared caches, upstream client and conversion engine
+
+    Long-running servers refresh prices in the background; serverless
+    deployments pass background_refresh=False and fetch on demand. Either
+    way the caches start from the stored prices and the build snapshot.
+    """
+    restore_cached_prices()
+    app = FastAPI(lifespan=lifespan if background_refresh else None)
+    app.mount("/static", StaticFiles(directory=asset_path("static"), check_dir=False), name="static")
+    app.include_router(router)
+    return app
+ 
\ No newline at end of file
@@ -0,0 +1,118 @@
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Written at build time by `python snapshot.py`
+DEFAULT_SNAPSHOT_PATH = os.path.join(BASE_DIR, "price_snapshot.json")
+
+@dataclass(frozen=True)
+class Settings:
+    """Configuration read from the environment once at startup"""
+    alpha_vantage_api_key: Optional[str] = None
+    fred_api_key: Optional[str] = None
+    bls_api_key: Optional[str] = None
+    price_snapshot_path: str = DEFAULT_SNAPSHOT_PATH
+    # Snapshot prices older than this are ignored at startup
+    snapshot_max_age: float = 24 * 60 * 60
+    # Seconds an expired snapshot item price is still served after a cold start
+    snapshot_grace: float = 60.0
+    # Local state that outlives a restart
+    price_store_path: str = os.path.join(tempfile.gettempdir(), "pricing-bitcoin-prices.sqlite3")
+    quota_state_dir: str = tempfile.gettempdir()
+    btc_history_db: str = os.path.join(BASE_DIR, "data", "btc_history.sqlite3")
+    # Keep BTC and item prices warm in the background
+    price_refresher: bool = True
+    # Share prices between workers through a memory-mapped table
+    shared_prices: bool = False
+    shared_prices_path: str = os.path.join(tempfile.gettempdir(), "pricing-bitcoin-shared.bin")
+    shared_prices_sync_interval: float = 1.0
+    # Cross-node price cache, e.g. redis://cache:6379/0
+    cache_backend_url: Optional[str] = None
+    cache_lock_ttl: float = 30.0
+    cache_lock_wait: float = 15.0
+    item_cache_size: int = 256
+    # BTC price sources and how they are combined
+    btc_price_sources: str = "coingecko,coinbase,kraken"
+    btc_price_mode: str = "hedged"
+    btc_hedge_delay: float = 0.5
+    btc_outlier_tolerance: float = 0.02
+    btc_price_stale_grace: float = 600.0
+    # Upstream HTTP timeouts (seconds) and per-host connection limits
+    http_timeout: float = 10.0
+    http_slow_timeout: float = 15.0
+    http_connect_timeout: float = 5.0
+    http_max_connections_per_host: int = 10
+    http_max_keepalive_per_host: int = 5
+    http_keepalive_expiry: float = 60.0
+    # Circuit breakers
+    breaker_window: int = 20
+    breaker_min_calls: int = 5
+    breaker_failure_rate: float = 0.5
+    breaker_slow_call_seconds: float = 5.0
+    breaker_open_seconds: float = 30.0
+
+def load_dotenv_file(path: str) -> bool:
+    """Load a local .env file into os.environ if there is one
+
+    python-dotenv is only imported when the file exists; deployments set
+    real environment variables and skip it.
+    """
+    if not os.path.isfile(path):
+        return False
+    from dotenv import load_dotenv
+    return load_dotenv(path)
+
+def load_settings(environ: Mapping[str, str] = os.environ) -> Settings:
+    defaults = Settings()
+
+    def flag(name: str, default: bool) -> bool:
+        value = environ.get(name, "").lower()
+        if default:
+            return value not in ("0", "false", "no")
+        return value in ("1", "true", "yes")
+
+    return Settings(
+        alpha_vantage_api_key=environ.get("ALPHA_VANTAGE_API_KEY") or None,
+        fred_api_key=environ.get("FRED_API_KEY") or None,
+        bls_api_key=environ.get("BLS_API_KEY") or None,
+        price_snapshot_path=environ.get("PRICE_SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH),
+        snapshot_max_age=float(environ.get("SNAPSHOT_MAX_AGE", "86400")),
+        snapshot_grace=float(environ.get("SNAPSHOT_GRACE", "60")),
+        price_store_path=environ.get("PRICE_STORE_PATH", defaults.price_store_path),
+        quota_state_dir=environ.get("QUOTA_STATE_DIR", defaults.quota_state_dir),
+        btc_history_db=environ.get("BTC_HISTORY_DB", defaults.btc_history_db),
+        price_refresher=flag("PRICE_REFRESHER", True),
+        shared_prices=flag("SHARED_PRICES", False),
+        shared_prices_path=environ.get("SHARED_PRICES_PATH", defaults.shared_prices_path),
+        shared_prices_sync_interval=float(environ.get("SHARED_PRICES_SYNC_INTERVAL", "1")),
+        cache_backend_url=environ.get("CACHE_BACKEND_URL") or None,
+        cache_lock_ttl=float(environ.get("CACHE_LOCK_TTL", "30")),
+        cache_lock_wait=float(environ.get("CACHE_LOCK_WAIT", "15")),
+        item_cache_size=int(environ.get("ITEM_CACHE_SIZE", "256")),
+        btc_price_sources=environ.get("BTC_PRICE_SOURCES", defaults.btc_price_sources),
+        btc_price_mode=environ.get("BTC_PRICE_MODE", "hedged"),
+        btc_hedge_delay=float(environ.get("BTC_HEDGE_DELAY", "0.5")),
+        btc_outlier_tolerance=float(environ.get("BTC_OUTLIER_TOLERANCE", "0.02")),
+        btc_price_stale_grace=float(environ.get("BTC_PRICE_STALE_GRACE", "600")),
+        http_timeout=float(environ.get("HTTP_TIMEOUT", "10.0")),
+        http_slow_timeout=float(environ.get("HTTP_SLOW_TIMEOUT", "15.0")),
+        http_connect_timeout=float(environ.get("HTTP_CONNECT_TIMEOUT", "5.0")),
+        http_max_connections_per_host=int(environ.get("HTTP_MAX_CONNECTIONS_PER_HOST", "10")),
+        http_max_keepalive_per_host=int(environ.get("HTTP_MAX_KEEPALIVE_PER_HOST", "5")),
+        http_keepalive_expiry=float(environ.get("HTTP_KEEPALIVE_EXPIRY", "60.0")),
+        breaker_window=int(environ.get("BREAKER_WINDOW", "20")),
+        breaker_min_calls=int(environ.get("BREAKER_MIN_CALLS", "5")),
+        breaker_failure_rate=float(environ.get("BREAKER_FAILURE_RATE", "0.5")),
+        breaker_slow_call_seconds=float(environ.get("BREAKER_SLOW_CALL_SECONDS", "5.0")),
+        breaker_open_seconds=float(environ.get("BREAKER_OPEN_SECONDS", "30.0"))
+    )
+
+# Loaded before the settings are read so .env values are picked up too
+for env_dir in (BASE_DIR, os.getcwd()):
+    if load_dotenv_file(os.path.join(env_dir, ".env")):
+        break
+
+settings = load_settings()
@@ -0,0 +1,135 @@
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from settings import settings
+
+SHARED_PRICES_PATH = settings.shared_prices_path
+
+_MAGIC = b"BTCP"
+_VERSION = 1
+_HEADER = struct.Struct("<4sII")  # magic, version, slot count
+# Each slot: sequence number, price, fetched_at (unix time), key
+_SLOT = struct.Struct("<Qdd32s")
+_SEQ = struct.Struct("<Q")
+_VALUE = struct.Struct("<dd")
+_MAX_READ_ATTEMPTS = 100
+
+class SharedPriceTable:
+    """Fixed-layout price table in a memory-mapped file shared by all workers
+
+    One worker wins a file lock and becomes the only writer; the rest only
+    read. Each slot is guarded by a sequence number that is odd while a
+    write is in progress (a seqlock), so readers never take a lock and
+    retry if they catch a torn write.
+    """
+
+    def __init__(self, path: str = SHARED_PRICES_PATH):
+        self.path = path
+        self.keys: List[str] = []
+        self.is_leader = False
+        self._slots: Dict[str, int] = {}
+        self._size = 0
+        self._fd: Optional[int] = None
+        self._lock_fd: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._mm is not None
+
+    @property
+    def is_follower(self) -> bool:
+        """Open but not the writer: this worker must take prices from the leader only"""
+        return self._mm is not None and not self.is_leader
+
+    def open(self, keys: List[str]) -> None:
+        """Map the table with one slot per key (every worker must pass the same keys)"""
+        self.keys = list(keys)
+        self._slots = {key: index for index, key in enumerate(self.keys)}
+        self._size = _HEADER.size + _SLOT.size * len(self.keys)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size < self._size:
+            os.ftruncate(self._fd, self._size)
+        self._mm = mmap.mmap(self._fd, self._size)
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        for fd in (self._fd, self._lock_fd):
+            if fd is not None:
+                os.close(fd)
+        self._fd = self._lock_fd = None
+        self.is_leader = False
+
+    def try_become_leader(self) -> bool:
+        """Take the writer lock if no other worker holds it"""
+        if self.is_leader:
+            return True
+        try:
+            import fcntl
+        except ImportError:
+            # No flock (Windows): assume a single worker
+            self.is_leader = True
+        else:
+            if self._lock_fd is None:
+                self._lock_fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return False
+            self.is_leader = True
+        self._initialize_layout()
+        return True
+
+    def _initialize_layout(self) -> None:
+        # Rewrite slots whose key doesn't match (e.g. ITEMS changed since the file was made)
+        _HEADER.pack_into(self._mm, 0, _MAGIC, _VERSION, len(self.keys))
+        for key, index in self._slots.items():
+            offset = _HEADER.size + index * _SLOT.size
+            seq, _, _, stored_key = _SLOT.unpack_from(self._mm, offset)
+            if stored_key.rstrip(b"\0").decode(errors="replace") != key or seq & 1:
+                _SLOT.pack_into(self._mm, offset, 0, 0.0, 0.0, key.encode()[:32])
+
+    def _layout_matches(self) -> bool:
+        magic, version, count = _HEADER.unpack_from(self._mm, 0)
+        return magic == _MAGIC and version == _VERSION and count == len(self.keys)
+
+    def publish(self, key: str, price: float, fetched_at: float) -> None:
+        """Write a price (leader only; a no-op for readers)"""
+        if not self.is_leader or self._mm is None or key not in self._slots:
+            return
+        offset = _HEADER.size + self._slots[key] * _SLOT.size
+        seq = _SEQ.unpack_from(self._mm, offset)[0]
+        _SEQ.pack_into(self._mm, offset, seq + 1)  # odd: write in progress
+        _VALUE.pack_into(self._mm, offset + _SEQ.size, price, fetched_at)
+        _SEQ.pack_into(self._mm, offset, seq + 2)
+
+    def read(self, key: str) -> Optional[Tuple[float, float]]:
+        """(price, fetched_at) for a key, or None if it was never written"""
+        if self._mm is None or key not in self._slots or not self._layout_matches():
+            return None
+        offset = _HEADER.size + self._slots[key] * _SLOT.size
+        for _ in range(_MAX_READ_ATTEMPTS):
+            seq_before, price, fetched_at, stored_key = _SLOT.unpack_from(self._mm, offset)
+            if seq_before & 1:
+                continue
+            if _SEQ.unpack_from(self._mm, offset)[0] != seq_before:
+                continue
+            if seq_before == 0 or stored_key.rstrip(b"\0").decode(errors="replace") != key:
+                return None
+            return price, fetched_at
+        return None
+
+    def read_all(self) -> Dict[str, Tuple[float, float]]:
+        entries = {}
+        for key in self.keys:
+            entry = self.read(key)
+            if entry is not None:
+                entries[key] = entry
+        return entries
+
+# Opened by the server lifespan when SHARED_PRICES is enabled; publishing is a no-op until then
+shared_price_table = SharedPriceTable()
@@ -0,0 +1,88 @@
+"""Build-time price snapshot so a cold start can answer without upstream calls
+
+Run `python snapshot.py` during the build (vercel.json's buildCommand) to
+write price_snapshot.json; create_app() seeds the caches from it.
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Tuple
+
+from settings import settings
+
+def write_snapshot(path: str, prices: Dict[str, Tuple[float, float]]) -> None:
+    """Write key -> (price, fetched_at) entries, replacing the file atomically"""
+    data = {
+        "created_at": time.time(),
+        "prices": {key: [price, fetched_at] for key, (price, fetched_at) in prices.items()}
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp_path, path)
+
+def load_snapshot(path: str) -> Dict[str, Tuple[float, float]]:
+    """Entries of the snapshot at path, or none if it is missing or unreadable"""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        return {key: (float(price), float(fetched_at)) for key, (price, fetched_at) in data["prices"].items()}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, TypeError, KeyError) as e:
+        print(f"Warning: ignoring price snapshot {path}: {e}")
+        return {}
+
+async def collect_prices() -> Dict[str, Tuple[float, float]]:
+    """Fetch the BTC price and every item price straight from their sources
+
+    Each entry is stamped with when its own fetch finished. Items a source
+    couldn't price are left out rather than written with a fallback, and
+    nothing goes into the app's caches or stores: only the snapshot file
+    is written.
+    """
+    from btc_sources import btc_price_aggregator
+    from http_client import close_http_client
+    from items import ITEMS, PROVIDER_FETCHERS, item_provider
+
+    prices = {}
+
+    async def fetch_btc() -> None:
+        price = await btc_price_aggregator.fetch()
+        prices["btc"] = (float(price), time.time())
+
+    async def fetch_group(provider, specs) -> None:
+        fetched = await PROVIDER_FETCHERS[provider](specs)
+        fetched_at = time.time()
+        for item_name, price in fetched.items():
+            prices[f"item:{item_name}"] = (float(price), fetched_at)
+
+    async def fetch_plan(plan) -> None:
+        for provider, error in zip(plan, await asyncio.gather(*(
+            fetch_group(provider, specs) for provider, specs in plan.items()
+        ), return_exceptions=True)):
+            if error is not None:
+                print(f"Snapshot: skipping {provider} items: {error}")
+
+    try:
+        btc_error, _ = await asyncio.gather(
+            fetch_btc(), fetch_plan(ITEMS.plan(ITEMS, item_provider)), return_exceptions=True
+        )
+        if btc_error is not None:
+            print(f"Snapshot: skipping btc: {btc_error}")
+        # Whatever a batch couldn't price (e.g. BLS down) goes to the item's own provider
+        leftovers = [
+            spec.name for spec in ITEMS.values()
+            if f"item:{spec.name}" not in prices and item_provider(spec) != spec.provider
+        ]
+        if leftovers:
+            await fetch_plan(ITEMS.plan(leftovers))
+    finally:
+        await close_http_client()
+    return prices
+
+if __name__ == "__main__":
+    prices = asyncio.run(collect_prices())
+    write_snapshot(settings.price_snapshot_path, prices)
+    print(f"Wrote {len(prices)} prices to {settings.price_snapshot_path}")
@@ -1,8 +1,36 @@
 import pytest
 import asyncio
-from unittest.mock import patch, AsyncMock
+import httpx
+from unittest.mock import patch, AsyncMock, MagicMock
+from price_cache import FallbackPrice
+from settings import Settings
 from decimal import Decimal
 
+@pytest.fixture(autouse=True)
+def fresh_alpha_vantage_quota():
+    """Give each test an unpersisted quota and no remembered prices"""
+    import items
+    from quota import ProviderQuota
+    from price_cache import last_good_prices
+    from daily_series import daily_series
+    last_good_prices.clear()
+    daily_series.clear()
+    with patch.object(items, 'alpha_vantage_quota', ProviderQuota("alpha_vantage", 5, 500)):
+        yield
+    last_good_prices.clear()
+    daily_series.clear()
+
+def mock_alpha_vantage(body):
+    """Client streaming body (JSON) back for every request, and the URLs requested"""
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(200, json=body)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return patch('items.get_http_client', return_value=client), requested
+
 # Test the Alpha Vantage integration
 class TestAlphaVantageIntegration:
     
@@ -35,75 +63,88 @@ class TestAlphaVantageIntegration:
     @pytest.mark.asyncio
     async def test_fetch_oil_usd_success(self, mock_alpha_vantage_response):
         """Test successful oil price fetch from Alpha Vantage"""
-        with patch('api.items.httpx.AsyncClient') as mock_client:
-            mock_response = AsyncMock()
-            mock_response.raise_for_status.return_value = None
-            mock_response.json.return_value = mock_alpha_vantage_response
-            mock_client.return_value.__aenter__.return_value.get.return_value = mock_response
-            
-            with patch('api.items.os.getenv', return_value='test_api_key'):
-                from api.items import fetch_oil_usd
-                price = await fetch_oil_usd()
+        mock_client, _ = mock_alpha_vantage(mock_alpha_vantage_response)
+        with mock_client:
+            with patch('items.settings', Settings(alpha_vantage_api_key='test_api_key')):
+                from items import fetch_item_price
+                price = await fetch_item_price("oil")
                 assert price == 75.50
 
     @pytest.mark.asyncio
     async def test_fetch_gold_usd_success(self, mock_alpha_vantage_currency_response):
         """Test successful gold price fetch from Alpha Vantage"""
-        with patch('api.items.httpx.AsyncClient') as mock_client:
-            mock_response = AsyncMock()
+        with patch('items.get_http_client') as mock_client:
+            mock_response = MagicMock()
             mock_response.raise_for_status.return_value = None
             mock_response.json.return_value = mock_alpha_vantage_currency_response
-            mock_client.return_value.__aenter__.return_value.get.return_value = mock_response
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
             
-            with patch('api.items.os.getenv', return_value='test_api_key'):
-                from api.items import fetch_gold_usd
-                price = await fetch_gold_usd()
+            with patch('items.settings', Settings(alpha_vantage_api_key='test_api_key')):
+                from items import fetch_item_price
+                price = await fetch_item_price("gold")
                 # 1 / 0.0005 = 2000
                 assert price == 2000.0
 
     @pytest.mark.asyncio
     async def test_fetch_oil_usd_no_api_key(self):
         """Test oil price fetch fallback when no API key"""
-        with patch('api.items.os.getenv', return_value=None):
-            from api.items import fetch_oil_usd
-            price = await fetch_oil_usd()
-            assert price == 75.0  # Fallback price
+        with patch('items.settings', Settings()):
+            from items import fetch_item_price
+            with pytest.raises(FallbackPrice) as fallback:
+                await fetch_item_price("oil")
+            assert fallback.value.price == 75.0
 
     @pytest.mark.asyncio
     async def test_fetch_oil_usd_api_error(self):
         """Test oil price fetch fallback on API error"""
         error_response = {"Error Message": "Invalid API call"}
         
-        with patch('api.items.httpx.AsyncClient') as mock_client:
-            mock_response = AsyncMock()
-            mock_response.raise_for_status.return_value = None
-            mock_response.json.return_value = error_response
-            mock_client.return_value.__aenter__.return_value.get.return_value = mock_response
-            
-            with patch('api.items.os.getenv', return_value='test_api_key'):
-                from api.items import fetch_oil_usd
-                price = await fetch_oil_usd()
-                assert price == 75.0  # Fallback price
+        mock_client, _ = mock_alpha_vantage(error_response)
+        with mock_client:
+            with patch('items.settings', Settings(alpha_vantage_api_key='test_api_key')):
+                from items import fetch_item_price
+                with pytest.raises(FallbackPrice) as fallback:
+                    await fetch_item_price("oil")
+                assert fallback.value.price == 75.0
 
     @pytest.mark.asyncio
     async def test_fetch_gold_usd_rate_limit(self):
         """Test gold price fetch fallback on rate limit"""
         rate_limit_response = {"Note": "Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute"}
         
-        with patch('api.items.httpx.AsyncClient') as mock_client:
-            mock_response = AsyncMock()
+        with patch('items.get_http_client') as mock_client:
+            mock_response = MagicMock()
             mock_response.raise_for_status.return_value = None
             mock_response.json.return_value = rate_limit_response
-            mock_client.return_value.__aenter__.return_value.get.return_value = mock_response
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
+            
+            with patch('items.settings', Settings(alpha_vantage_api_key='test_api_key')):
+                from items import fetch_item_price
+                with pytest.raises(FallbackPrice) as fallback:
+                    await fetch_item_price("gold")
+                assert fallback.value.price == 2000.0
+
+    @pytest.mark.asyncio
+    async def test_fetch_oil_usd_quota_exhausted(self, mock_alpha_vantage_response):
+        """Test that an exhausted quota serves the last good price without a request"""
+        import items
+        from quota import ProviderQuota
+        
+        mock_client, requested = mock_alpha_vantage(mock_alpha_vantage_response)
+        with mock_client:
+            with patch('items.settings', Settings(alpha_vantage_api_key='test_api_key')):
+                with patch.object(items, 'alpha_vantage_quota', ProviderQuota("alpha_vantage", 1, 500)):
+                    assert await items.fetch_item_price("oil") == 75.50
+                    # Quota spent: the last good price, flagged as a fallback
+                    with pytest.raises(FallbackPrice) as fallback:
+                        await items.fetch_item_price("oil")
+                    assert fallback.value.price == 75.50
             
-            with patch('api.items.os.getenv', return_value='test_api_key'):
-                from api.items import fetch_gold_usd
-                price = await fetch_gold_usd()
-                assert price == 2000.0  # Fallback price
+            assert len(requested) == 1
 
     def test_decimal_precision_conversion(self):
         """Test that conversion calculations use proper decimal precision"""
-        from api.index import ConvertResponse
+        from server import ConvertResponse
         from decimal import Decimal
         
         # Simulate conversion calculation
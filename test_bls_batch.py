@@ -0,0 +1,69 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from price_cache import TTLCache
+from settings import Settings
+
+def bls_response(values):
+    return {
+        "status": "REQUEST_SUCCEEDED",
+        "Results": {
+            "series": [
+                {"seriesID": series_id, "data": [{"year": "2024", "period": "M06", "value": value}]}
+                for series_id, value in values.items()
+            ]
+        }
+    }
+
+@pytest.fixture
+def mock_bls():
+    response = MagicMock()
+    response.raise_for_status.return_value = None
+    response.json.return_value = bls_response({
+        "APU000074714": "3.45",
+        "APU0000702111": "1.99",
+        "APU0000709112": "4.05",
+        "APU0000717311": "6.80",
+        "APU0000708111": "2.70"
+    })
+    with patch('items.get_http_client') as mock_client:
+        mock_client.return_value.post = AsyncMock(return_value=response)
+        with patch('items.settings', Settings(bls_api_key="test_key")):
+            with patch('items.item_price_cache', TTLCache()) as cache:
+                yield mock_client.return_value.post, cache
+
+class TestBlsBatch:
+
+    @pytest.mark.asyncio
+    async def test_one_request_fills_every_bls_item(self, mock_bls):
+        """Test that all BLS-backed items are fetched with a single POST"""
+        from items import get_item_fetcher
+        post, cache = mock_bls
+
+        assert await get_item_fetcher("bread")() == 1.99
+        assert await get_item_fetcher("gasoline")() == 3.45
+        assert await get_item_fetcher("eggs")() == 2.70
+
+        post.assert_awaited_once()
+        payload = post.await_args.kwargs["json"]
+        assert sorted(payload["seriesid"]) == sorted([
+            "APU000074714", "APU0000702111", "APU0000709112", "APU0000717311", "APU0000708111"
+        ])
+        assert cache.get("milk") == 4.05
+
+    @pytest.mark.asyncio
+    async def test_unpublished_values_are_skipped(self):
+        """Test that "-" placeholders fall through to the previous period"""
+        from items import fetch_bls_prices
+        response = MagicMock()
+        response.json.return_value = {
+            "status": "REQUEST_SUCCEEDED",
+            "Results": {"series": [{"seriesID": "APU0000708111", "data": [
+                {"period": "M07", "value": "-"},
+                {"period": "M06", "value": "2.70"}
+            ]}]}
+        }
+        with patch('items.get_http_client') as mock_client:
+            mock_client.return_value.post = AsyncMock(return_value=response)
+            with patch('items.settings', Settings(bls_api_key="test_key")):
+                assert await fetch_bls_prices(["APU0000708111"]) == {"APU0000708111": 2.70}
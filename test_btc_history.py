@@ -0,0 +1,80 @@
+import json
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.testclient import TestClient
+
+from btc_history import BtcHistoryStore
+from fred_cache import SeriesRangeCache
+from settings import Settings
+
+@pytest.fixture
+def store(tmp_path):
+    return BtcHistoryStore(str(tmp_path / "btc.sqlite3"))
+
+class TestBtcHistoryStore:
+
+    def test_lookup_on_or_before(self, store):
+        """Test that each date maps to its own close or the latest earlier one"""
+        store.upsert([("2024-01-01", 42000.0), ("2024-01-03", 43000.0), ("2024-02-01", 45000.0)])
+
+        assert store.closes_on_or_before(["2023-12-31", "2024-01-01", "2024-01-02", "2024-03-01"]) == [
+            None, 42000.0, 42000.0, 45000.0
+        ]
+
+    def test_record_price_extends_history(self, store):
+        """Test that spot prices become the close of their UTC day"""
+        store.upsert([("2024-01-01", 42000.0)])
+        store.close_on_or_before("2024-01-01")
+
+        store.record_price(43000.0, datetime(2024, 1, 2, 9, tzinfo=timezone.utc))
+        store.record_price(43500.0, datetime(2024, 1, 2, 23, tzinfo=timezone.utc))
+
+        assert store.close_on_or_before("2024-01-05") == 43500.0
+        assert len(store) == 2
+        # Persisted, not just in memory
+        assert BtcHistoryStore(store.path).close_on_or_before("2024-01-02") == 43500.0
+
+    def test_backfill_from_csv(self, store, tmp_path):
+        path = tmp_path / "btc.csv"
+        path.write_text("date,close\n2024-01-01,42000.5\n2024-01-02,42100\n")
+
+        assert store.backfill_from_file(str(path)) == 2
+        assert store.close_on_or_before("2024-01-02") == 42100.0
+
+    def test_backfill_from_coingecko_market_chart(self, store, tmp_path):
+        """Test that intraday points collapse to the last price of each day"""
+        path = tmp_path / "btc.json"
+        day = 1704067200000  # 2024-01-01T00:00:00Z
+        path.write_text(json.dumps({"prices": [[day, 42000], [day + 3600000, 42500], [day + 86400000, 43000]]}))
+
+        assert store.backfill_from_file(str(path)) == 2
+        assert store.closes_on_or_before(["2024-01-01", "2024-01-02"]) == [42500.0, 43000.0]
+
+class TestHistoricalEndpoint:
+
+    def test_observations_use_matching_btc_close(self, store):
+        """Test that /api/historical divides by the BTC close of each observation date"""
+        import server
+        import main
+        store.upsert([("2024-01-01", 40000.0), ("2024-02-01", 50000.0)])
+        fred_response = MagicMock()
+        fred_response.raise_for_status.return_value = None
+        fred_response.json.return_value = {"observations": [
+            {"date": "2024-01-01", "value": "2.00"},
+            {"date": "2024-02-01", "value": "2.50"},
+            {"date": "2024-03-01", "value": "."}
+        ]}
+
+        with patch('server.btc_history', store), \
+             patch('server.fred_range_cache', SeriesRangeCache(ttl=3600)), \
+             patch('server.get_http_client') as mock_client, \
+             patch('server.get_btc_price', new=AsyncMock(return_value=1.0)) as spot, \
+             patch('server.settings', Settings(fred_api_key="test_key")):
+            mock_client.return_value.get = AsyncMock(return_value=fred_response)
+            data = TestClient(main.app).get("/api/historical", params={
+                "item": "bread", "from_date": "2024-01-01", "to_date": "2024-03-01"
+            }).json()
+
+        assert data == {"dates": ["2024-01-01", "2024-02-01"], "btc_prices": [0.00005, 0.00005]}
+        spot.assert_not_awaited()
@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+import server
+from btc_history import BtcHistoryStore
+
+@pytest.fixture(autouse=True)
+def empty_btc_cache(tmp_path):
+    server.btc_price_cache.update({"price": None, "timestamp": None})
+    with patch('server.btc_history', BtcHistoryStore(str(tmp_path / "btc.sqlite3"))):
+        yield
+    server.btc_price_cache.update({"price": None, "timestamp": None})
+
+class TestBtcPriceStaleWhileRevalidate:
+
+    @pytest.mark.asyncio
+    async def test_fresh_price_served_from_cache(self):
+        """Test that a price younger than the TTL is returned without fetching"""
+        server.btc_price_cache.update({"price": 42000.0, "timestamp": server.time.monotonic()})
+
+        with patch('server.fetch_btc_price_usd', new=AsyncMock(return_value=1.0)) as fetch:
+            assert await server.get_btc_quote() == (42000.0, "fresh")
+        fetch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_stale_price_returned_and_refreshed_in_background(self):
+        """Test that an expired price within the grace window is served immediately"""
+        expired = server.time.monotonic() - server.BTC_PRICE_TTL - 1
+        server.btc_price_cache.update({"price": 42000.0, "timestamp": expired})
+
+        with patch('server.fetch_btc_price_usd', new=AsyncMock(return_value=43000.0)) as fetch:
+            assert await server.get_btc_quote() == (42000.0, "stale")
+            await asyncio.gather(*server._background_tasks)
+
+        fetch.assert_awaited_once()
+        assert server.btc_price_cache["price"] == 43000.0
+
+    @pytest.mark.asyncio
+    async def test_price_past_grace_window_blocks_on_refresh(self):
+        """Test that a price older than TTL plus grace is refetched inline"""
+        expired = server.time.monotonic() - server.BTC_PRICE_TTL - server.BTC_PRICE_STALE_GRACE - 1
+        server.btc_price_cache.update({"price": 42000.0, "timestamp": expired})
+
+        with patch('server.fetch_btc_price_usd', new=AsyncMock(return_value=43000.0)):
+            assert await server.get_btc_quote() == (43000.0, "fresh")
+
+    @pytest.mark.asyncio
+    async def test_upstream_error_falls_back_to_stale_price(self):
+        """Test that a failed refresh still returns the last known price"""
+        expired = server.time.monotonic() - server.BTC_PRICE_TTL - server.BTC_PRICE_STALE_GRACE - 1
+        server.btc_price_cache.update({"price": 42000.0, "timestamp": expired})
+
+        with patch('server.fetch_btc_price_usd', new=AsyncMock(side_effect=RuntimeError("down"))):
+            assert await server.get_btc_quote() == (42000.0, "stale")
@@ -0,0 +1,91 @@
+import asyncio
+import httpx
+import pytest
+from unittest.mock import patch
+
+from btc_sources import BtcPriceAggregator, PriceSource, load_price_sources, weighted_median
+
+def source(name, timeout=1.0, weight=1.0):
+    return PriceSource(name, f"https://{name}.test/price", ["usd"], timeout=timeout, weight=weight)
+
+def mock_upstreams(quotes):
+    """Client answering https://<name>.test/price with {"usd": price} after a delay"""
+    calls = []
+
+    async def handler(request):
+        name = request.url.host.split(".")[0]
+        calls.append(name)
+        delay, price = quotes[name]
+        await asyncio.sleep(delay)
+        if price is None:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"usd": price})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return patch('btc_sources.get_http_client', return_value=client), calls
+
+class TestHedgedMode:
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_answers_alone(self):
+        mock, calls = mock_upstreams({"a": (0, 42000.0), "b": (0, 43000.0)})
+        with mock:
+            price = await BtcPriceAggregator([source("a"), source("b")], hedge_delay=0.2).fetch()
+
+        assert price == 42000.0
+        assert calls == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged(self):
+        """Test that a second source is asked after the hedge delay and the first answer wins"""
+        mock, calls = mock_upstreams({"a": (0.5, 42000.0), "b": (0, 43000.0)})
+        with mock:
+            price = await BtcPriceAggregator([source("a"), source("b")], hedge_delay=0.05).fetch()
+
+        assert price == 43000.0
+        assert calls == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_failed_source_moves_on_immediately(self):
+        mock, calls = mock_upstreams({"a": (0, None), "b": (0, 43000.0)})
+        with mock:
+            price = await BtcPriceAggregator([source("a"), source("b")], hedge_delay=10).fetch()
+
+        assert price == 43000.0
+
+    @pytest.mark.asyncio
+    async def test_source_timeout(self):
+        mock, _ = mock_upstreams({"a": (1.0, 42000.0)})
+        with mock, pytest.raises(RuntimeError, match="All BTC price sources failed"):
+            await BtcPriceAggregator([source("a", timeout=0.05)], hedge_delay=0.01).fetch()
+
+class TestMedianMode:
+
+    @pytest.mark.asyncio
+    async def test_outlier_dropped(self):
+        mock, calls = mock_upstreams({
+            "a": (0, 42000.0), "b": (0, 42100.0), "c": (0, 42050.0), "d": (0, 1.0), "e": (0, None)
+        })
+        sources = [source(name) for name in "abcde"]
+        with mock:
+            price = await BtcPriceAggregator(sources, mode="median", outlier_tolerance=0.02).fetch()
+
+        assert price == 42050.0
+        assert sorted(calls) == list("abcde")
+
+    def test_weighted_median(self):
+        assert weighted_median([(1.0, 1.0), (2.0, 1.0), (3.0, 1.0)]) == 2.0
+        assert weighted_median([(1.0, 1.0), (2.0, 1.0), (3.0, 5.0)]) == 3.0
+
+class TestLoadPriceSources:
+
+    def test_names_and_json(self):
+        assert [s.name for s in load_price_sources("coingecko, kraken")] == ["coingecko", "kraken"]
+
+        sources = load_price_sources(
+            '[{"name": "coinbase", "weight": 2}, {"name": "local", "url": "http://localhost/p", "path": ["p"], "timeout": 1}]'
+        )
+        assert [(s.name, s.weight, s.timeout) for s in sources] == [("coinbase", 2.0, 10.0), ("local", 1.0, 1.0)]
+
+    def test_unknown_name_skipped(self):
+        assert load_price_sources("nope") == []
@@ -0,0 +1,153 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from cache_backend import (
+    CacheBackend, DistributedPriceCache, MemoryCacheBackend, RedisCacheBackend, create_cache_backend
+)
+from price_cache import TTLCache
+
+class TestDistributedPriceCache:
+
+    @pytest.mark.asyncio
+    async def test_nodes_share_one_upstream_fetch(self):
+        """Test that concurrent loads on several nodes call the upstream once"""
+        backend = MemoryCacheBackend()
+        nodes = [DistributedPriceCache(backend, lock_wait=5) for _ in range(8)]
+        release = asyncio.Event()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return 42000.0
+
+        loads = [asyncio.create_task(node.load("btc", 300, fetch)) for node in nodes]
+        await asyncio.sleep(0.01)
+        release.set()
+        results = await asyncio.gather(*loads)
+
+        assert calls == 1
+        assert {price for price, _ in results} == {42000.0}
+
+    @pytest.mark.asyncio
+    async def test_recent_value_reused_and_old_value_refreshed(self):
+        backend = MemoryCacheBackend()
+        node = DistributedPriceCache(backend)
+        fetch = AsyncMock(return_value=43000.0)
+
+        await backend.set("btc", 42000.0, time.time() - 10)
+        assert (await node.load("btc", 300, fetch))[0] == 42000.0
+        fetch.assert_not_awaited()
+
+        # Past the refresh-ahead point of the TTL a new value is fetched
+        await backend.set("btc", 42000.0, time.time() - 250)
+        assert (await node.load("btc", 300, fetch))[0] == 43000.0
+        assert (await backend.get("btc"))[0] == 43000.0
+
+    @pytest.mark.asyncio
+    async def test_previous_value_served_while_another_node_refreshes(self):
+        backend = MemoryCacheBackend()
+        fetched_at = time.time() - 1000
+        await backend.set("btc", 42000.0, fetched_at)
+        await backend.acquire_lock("btc", 30)
+        fetch = AsyncMock(return_value=43000.0)
+
+        assert await DistributedPriceCache(backend).load("btc", 300, fetch) == (42000.0, fetched_at)
+        fetch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_backend_fetches_directly(self):
+        backend = MemoryCacheBackend()
+        backend.get = AsyncMock(side_effect=ConnectionError("refused"))
+
+        price, _ = await DistributedPriceCache(backend).load("btc", 300, AsyncMock(return_value=42000.0))
+
+        assert price == 42000.0
+
+    @pytest.mark.asyncio
+    async def test_fetch_errors_release_the_lock(self):
+        backend = MemoryCacheBackend()
+        node = DistributedPriceCache(backend)
+
+        with pytest.raises(RuntimeError):
+            await node.load("btc", 300, AsyncMock(side_effect=RuntimeError("down")))
+
+        assert await backend.acquire_lock("btc", 30) is not None
+
+    def test_no_backend_without_url(self):
+        assert create_cache_backend(None) is None
+        assert isinstance(create_cache_backend("memory://"), MemoryCacheBackend)
+
+class TestItemsThroughBackend:
+
+    @pytest.mark.asyncio
+    async def test_item_price_from_other_node_keeps_its_age(self):
+        """Test that a price fetched elsewhere only stays cached for the rest of its TTL"""
+        import items
+        backend = MemoryCacheBackend()
+        await backend.set("item:gold", 2000.0, time.time() - 100)
+        cache = TTLCache(clock=lambda: 0.0)
+        fetcher = AsyncMock(return_value=2100.0)
+
+        with patch('items.distributed_cache', DistributedPriceCache(backend)), \
+             patch('items.item_price_cache', cache):
+            assert await items.load_item_price("gold", fetcher, 900) == 2000.0
+
+        fetcher.assert_not_awaited()
+        assert cache._entries["gold"][1] == pytest.approx(800, abs=1)
+
+class TestRedisCacheBackend:
+
+    @pytest.mark.asyncio
+    async def test_against_fakeredis(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        backend = RedisCacheBackend(fakeredis.FakeAsyncRedis())
+
+        await backend.set("btc", 42000.0, 1700000000.0)
+        assert await backend.get("btc") == (42000.0, 1700000000.0)
+
+        token = await backend.acquire_lock("btc", 30)
+        assert token is not None
+        assert await backend.acquire_lock("btc", 30) is None
+        # The release script only deletes the lock for the token that holds it
+        await backend.release_lock("btc", "someone-else")
+        assert await backend.acquire_lock("btc", 30) is None
+        await backend.release_lock("btc", token)
+        assert await backend.acquire_lock("btc", 30) is not None
+
+        # PX expiry frees a lock whose holder never released it
+        assert await backend.acquire_lock("gold", 0.05) is not None
+        await asyncio.sleep(0.1)
+        assert await backend.acquire_lock("gold", 30) is not None
+
+    @pytest.mark.asyncio
+    async def test_lock_commands(self):
+        """Test the SET NX PX lock and compare-and-delete release sent to the client"""
+        client = AsyncMock()
+        client.set.side_effect = [True, None]
+        backend = RedisCacheBackend(client, prefix="p:")
+
+        token = await backend.acquire_lock("btc", 1.5)
+        assert await backend.acquire_lock("btc", 1.5) is None
+        await backend.release_lock("btc", token)
+
+        client.set.assert_any_await("p:lock:btc", token, nx=True, px=1500)
+        script, numkeys, key, released_token = client.eval.await_args.args
+        assert "redis.call(\"del\", KEYS[1])" in script
+        assert (numkeys, key, released_token) == (1, "p:lock:btc", token)
+
+class TestCacheBackendInterface:
+
+    def test_incomplete_backend_rejected_at_construction(self):
+        class NoLocks(CacheBackend):
+            async def get(self, key):
+                return None
+
+            async def set(self, key, value, fetched_at):
+                pass
+
+        with pytest.raises(TypeError):
+            NoLocks()
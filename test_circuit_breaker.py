@@ -0,0 +1,112 @@
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakerTransport, CircuitOpenError
+)
+from price_cache import FallbackPrice
+from settings import Settings
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("https://api.example.com", window=10, min_calls=4, failure_rate=0.5,
+                          slow_call_seconds=2.0, open_seconds=30.0, clock=clock)
+
+class TestCircuitBreaker:
+
+    def test_opens_at_failure_rate(self, breaker):
+        for failed in (False, True, False):
+            breaker.record(failed, 0.1)
+        assert breaker.state == CLOSED  # fewer than min_calls
+
+        breaker.record(True, 0.1)
+
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+        assert breaker.status()["rejected"] == 1
+
+    def test_slow_calls_count_as_failures(self, breaker):
+        for _ in range(4):
+            breaker.record(False, 2.5)
+
+        assert breaker.is_open()
+
+    def test_half_open_probe_closes_or_reopens(self, breaker, clock):
+        for _ in range(4):
+            breaker.record(True, 0.1)
+        clock.now = 30.0
+        assert breaker.status()["state"] == HALF_OPEN
+
+        assert breaker.allow()
+        assert not breaker.allow()  # one probe at a time
+        breaker.record(True, 0.1)
+        assert breaker.state == OPEN
+
+        clock.now = 60.0
+        assert breaker.allow()
+        breaker.record(False, 0.1)
+        assert breaker.state == CLOSED
+        assert breaker.allow()
+
+class TestCircuitBreakerTransport:
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_without_calling_upstream(self, breaker):
+        calls = 0
+
+        def handler(request):
+            nonlocal calls
+            calls += 1
+            return httpx.Response(503)
+
+        transport = CircuitBreakerTransport(httpx.MockTransport(handler), breaker)
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(4):
+                assert (await client.get("https://api.example.com/")).status_code == 503
+            with pytest.raises(CircuitOpenError):
+                await client.get("https://api.example.com/")
+
+        assert calls == 4
+
+class TestFetcherFallback:
+
+    @pytest.mark.asyncio
+    async def test_alpha_vantage_skipped_while_open(self):
+        """Test that an open breaker serves the fallback without spending quota"""
+        import items
+
+        with patch('items.upstream_available', return_value=False), \
+             patch('items.alpha_vantage_quota') as quota, \
+             patch('items.get_http_client') as mock_client, \
+             patch('items.settings', Settings(alpha_vantage_api_key="test_key")):
+            mock_client.return_value.get = AsyncMock()
+            with pytest.raises(FallbackPrice) as fallback:
+                await items.fetch_item_price("gold")
+            assert fallback.value.price == items.last_good_price("gold", 2000.0)
+
+        quota.try_acquire.assert_not_called()
+        mock_client.return_value.get.assert_not_awaited()
+
+class TestCircuitBreakerEndpoint:
+
+    def test_lists_breakers_per_host(self, breaker):
+        import server
+        import main
+        from fastapi.testclient import TestClient
+
+        with patch.dict('server.circuit_breakers', {breaker.name: breaker}, clear=True):
+            data = TestClient(main.app).get("/api/circuit-breakers").json()
+
+        assert data[breaker.name]["state"] == CLOSED
@@ -0,0 +1,214 @@
+import dataclasses
+import os
+import subprocess
+import sys
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from importtime_report import over_budget, parse_importtime
+from price_cache import TTLCache
+from price_feed import PriceFeed
+from settings import BASE_DIR, Settings, load_settings
+from snapshot import load_snapshot, write_snapshot
+
+class TestSettings:
+
+    def test_loaded_once_from_environment(self):
+        settings = load_settings({"FRED_API_KEY": "fred", "BLS_API_KEY": "", "SNAPSHOT_GRACE": "5"})
+        assert settings.fred_api_key == "fred"
+        assert settings.bls_api_key is None
+        assert settings.alpha_vantage_api_key is None
+        assert settings.snapshot_grace == 5.0
+
+    def test_operational_settings(self):
+        settings = load_settings({
+            "SHARED_PRICES": "yes", "PRICE_REFRESHER": "0", "BREAKER_WINDOW": "50",
+            "BTC_PRICE_STALE_GRACE": "0", "CACHE_BACKEND_URL": ""
+        })
+        assert settings.shared_prices and not settings.price_refresher
+        assert settings.breaker_window == 50
+        assert settings.btc_price_stale_grace == 0.0
+        assert settings.cache_backend_url is None
+        assert load_settings({}) == Settings()
+
+    def test_immutable(self):
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            Settings().fred_api_key = "changed"
+
+    @pytest.mark.skipif(os.path.exists(os.path.join(BASE_DIR, ".env")), reason="a local .env is loaded")
+    def test_entry_point_skips_dotenv(self, tmp_path):
+        """Test that importing the Vercel handler doesn't import python-dotenv without a .env"""
+        code = "import sys, api.index; print('dotenv' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", f"import sys; sys.path.insert(0, {BASE_DIR!r}); {code}"],
+            cwd=tmp_path, capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False"
+
+class TestSnapshotFile:
+
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "snapshot.json")
+        write_snapshot(path, {"btc": (42000.0, 1700000000.0), "item:gold": (2000.0, 1700000000.0)})
+        assert load_snapshot(path) == {"btc": (42000.0, 1700000000.0), "item:gold": (2000.0, 1700000000.0)}
+
+    def test_missing_or_corrupt_snapshot_is_empty(self, tmp_path):
+        path = tmp_path / "snapshot.json"
+        assert load_snapshot(str(path)) == {}
+        path.write_text("{not json")
+        assert load_snapshot(str(path)) == {}
+
+class TestSnapshotBuild:
+
+    @pytest.mark.asyncio
+    async def test_prices_stamped_per_fetch_without_fallbacks(self):
+        """Test that the build writes only real prices, with their own fetch times, and nothing else"""
+        import items
+        clock = iter([1000.0, 2000.0, 3000.0, 4000.0, 5000.0])
+        fetchers = {
+            "alpha_vantage": AsyncMock(return_value={"gold": 2300.0}),
+            "fred": AsyncMock(return_value={"bread": 2.0}),
+            "bls": AsyncMock(return_value={}),
+            "static": AsyncMock(side_effect=lambda specs: {spec.name: spec.fallback for spec in specs})
+        }
+        aggregator = MagicMock()
+        aggregator.fetch = AsyncMock(return_value=60000.0)
+
+        with patch.dict('items.PROVIDER_FETCHERS', fetchers), \
+             patch('btc_sources.btc_price_aggregator', aggregator), \
+             patch('items.price_store') as store, \
+             patch('snapshot.time.time', side_effect=lambda: next(clock)):
+            from snapshot import collect_prices
+            prices = await collect_prices()
+
+        assert prices["btc"][0] == 60000.0
+        assert prices["item:gold"][0] == 2300.0 and prices["item:bread"][0] == 2.0
+        assert prices["item:netflix"] == (15.49, prices["item:netflix"][1])
+        assert len({fetched_at for _, fetched_at in prices.values()}) == 4
+        # Silver and oil got no price: left out, not written as their fallback
+        assert "item:silver" not in prices and "item:oil" not in prices
+        store.save.assert_not_called()
+
+class TestSnapshotSeeding:
+
+    @pytest.fixture
+    def caches(self):
+        with patch('server.btc_price_cache', {"price": None, "timestamp": None}) as btc_cache, \
+             patch('server.price_feed', PriceFeed()), \
+             patch('items.price_feed', PriceFeed()), \
+             patch('items.item_price_cache', TTLCache()) as item_cache, \
+             patch.dict('price_cache.last_good_prices', {}, clear=True):
+            yield btc_cache, item_cache
+
+    @pytest.mark.asyncio
+    async def test_first_request_served_from_snapshot(self, caches):
+        """Test that hours-old snapshot prices are served without waiting on an upstream call"""
+        import server
+        btc_cache, item_cache = caches
+        built_at = time.time() - 3 * 60 * 60
+
+        with patch('server.settings', Settings(snapshot_grace=60)):
+            server.apply_snapshot_prices({"btc": (42000.0, built_at), "item:gold": (2000.0, built_at)})
+
+        with patch('server.refresh_btc_price', new=AsyncMock()) as refresh, \
+             patch('server._refresh_btc_price_in_background') as background:
+            assert await server.get_btc_quote() == (42000.0, "stale")
+        refresh.assert_not_awaited()
+        background.assert_called_once()
+        assert item_cache.get("gold") == 2000.0
+        # Last-Modified and the SSE feed still see when the price was really fetched
+        assert server.price_feed.entries["btc"]["fetched_at"] == built_at
+
+    def test_old_snapshot_ignored(self, caches):
+        import server
+        btc_cache, item_cache = caches
+        built_at = time.time() - 2 * 24 * 60 * 60
+
+        with patch('server.settings', Settings(snapshot_max_age=24 * 60 * 60)):
+            server.apply_snapshot_prices({"btc": (42000.0, built_at), "item:gold": (2000.0, built_at)})
+
+        assert btc_cache["price"] is None
+        assert item_cache.get("gold") is None
+
+    def test_restored_by_create_app_not_import(self, tmp_path):
+        """Test that importing server touches neither the price store nor the snapshot"""
+        code = "import server; print(server.price_store._conn is None, server.btc_price_cache['price'])"
+        write_snapshot(str(tmp_path / "snapshot.json"), {"btc": (42000.0, time.time())})
+        result = subprocess.run(
+            [sys.executable, "-c", f"import sys; sys.path.insert(0, {BASE_DIR!r}); {code}"],
+            cwd=tmp_path, capture_output=True, text=True, check=True,
+            env=dict(os.environ, PRICE_SNAPSHOT_PATH=str(tmp_path / "snapshot.json"))
+        )
+        assert result.stdout.strip() == "True None"
+
+        import server
+        with patch('server.restore_cached_prices') as restore:
+            server.create_app(background_refresh=False)
+        restore.assert_called_once()
+
+    def test_newer_stored_price_wins(self, caches, tmp_path):
+        import server
+        btc_cache, _ = caches
+        path = str(tmp_path / "snapshot.json")
+        now = time.time()
+        write_snapshot(path, {"btc": (40000.0, now - 600)})
+        store = MagicMock()
+        store.load_all.return_value = {"btc": (42000.0, now - 60)}
+
+        with patch('server.settings', Settings(price_snapshot_path=path)), \
+             patch('server.price_store', store):
+            server.restore_cached_prices()
+
+        assert btc_cache["price"] == 42000.0
+
+    def test_newer_snapshot_price_wins(self, caches, tmp_path):
+        """Test that an older stored price doesn't overwrite a newer snapshot price"""
+        import server
+        from price_cache import last_good_price
+        btc_cache, item_cache = caches
+        path = str(tmp_path / "snapshot.json")
+        now = time.time()
+        write_snapshot(path, {"btc": (65000.0, now - 600), "item:gold": (2000.0, now - 600)})
+        store = MagicMock()
+        store.load_all.return_value = {"btc": (40000.0, now - 7200), "item:gold": (1800.0, now - 7200)}
+
+        with patch('server.settings', Settings(price_snapshot_path=path)), \
+             patch('server.price_store', store):
+            server.restore_cached_prices()
+
+        assert btc_cache["price"] == 65000.0
+        # Within the stale-while-revalidate window, not blocking on a fetch
+        assert time.monotonic() - btc_cache["timestamp"] < server.BTC_PRICE_TTL + 1
+        assert server.price_feed.entries["btc"]["price"] == 65000.0
+        assert item_cache.get("gold") == 2000.0
+        assert last_good_price("gold", 0.0) == 2000.0
+
+class TestImportBudget:
+
+    OUTPUT = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       300 |        300 |     fastapi.params",
+        "import time:       200 |        500 |   fastapi",
+        "import time:      4000 |       4000 |   dotenv",
+        "import time:       100 |       4600 | server",
+    ])
+
+    def test_self_time_summed_per_package(self):
+        assert parse_importtime(self.OUTPUT) == {"fastapi": 500, "dotenv": 4000, "server": 100, "total": 4600}
+
+    def test_new_and_regressed_imports_flagged(self):
+        budget = {"fastapi": 500, "server": 100, "total": 600}
+        problems = over_budget(parse_importtime(self.OUTPUT), budget)
+        assert set(problems) == {"dotenv", "total"}
+
+    def test_small_packages_checked_together(self):
+        """Test that noise in a package too small to time alone isn't flagged as a new import"""
+        small = {f"module{i}": 400 for i in range(40)}
+        budget = {"fastapi": 50000, **small, "total": 66000}
+
+        noisy = dict(small, module0=2500, tempfile=300)
+        assert over_budget({"fastapi": 50000, **noisy, "total": 68400}, budget) == {}
+
+        slower = {package: 1000 for package in small}
+        assert set(over_budget({"fastapi": 50000, **slower, "total": 90000}, budget)) == {"other"}
@@ -15,23 +15,23 @@ async def test_alpha_vantage_integration():
     
     try:
         # Test oil price fetcher
-        from items import fetch_oil_usd
-        oil_price = await fetch_oil_usd()
+        from items import get_item_fetcher
+        oil_price = await get_item_fetcher("oil")()
         print(f"📊 Oil Price: ${oil_price:.2f} per barrel")
         
         # Test gold price fetcher
-        from items import fetch_gold_usd
-        gold_price = await fetch_gold_usd()
+        from items import get_item_fetcher
+        gold_price = await get_item_fetcher("gold")()
         print(f"🏆 Gold Price: ${gold_price:.2f} per ounce")
         
         # Test silver price fetcher
-        from items import fetch_silver_usd
-        silver_price = await fetch_silver_usd()
+        from items import get_item_fetcher
+        silver_price = await get_item_fetcher("silver")()
         print(f"🥈 Silver Price: ${silver_price:.2f} per ounce")
         
         # Test natural gas price fetcher
-        from items import fetch_natural_gas_usd
-        gas_price = await fetch_natural_gas_usd()
+        from items import get_item_fetcher
+        gas_price = await get_item_fetcher("natural_gas")()
         print(f"⛽ Natural Gas Price: ${gas_price:.2f} per MMBtu")
         
         print("\n✅ All commodity price fetches completed (using fallback prices if no API key)")
@@ -47,26 +47,33 @@ async def test_conversion_api():
     print("\n🧪 Testing Conversion API\n")
     
     try:
-        from index import convert
+        from fastapi.testclient import TestClient
+        from main import app
+        client = TestClient(app)
+        
+        def convert(**params):
+            response = client.get("/api/convert", params=params)
+            response.raise_for_status()
+            return response.json()
         
         # Test BTC to oil conversion
-        result = await convert(btc_amount=0.1, item='oil', direction='btc_to_item')
-        print(f"💰 0.1 BTC = {result.quantity:.6f} barrels of oil")
-        print(f"📊 Oil price: ${result.usd_item:.2f}")
-        print(f"💵 Total value: ${result.usd_total:.2f}")
-        print(f"₿ BTC price: ${result.btc_price:.2f}")
+        result = convert(btc_amount=0.1, item='oil', direction='btc_to_item')
+        print(f"💰 0.1 BTC = {result['quantity']:.6f} barrels of oil")
+        print(f"📊 Oil price: ${result['usd_item']:.2f}")
+        print(f"💵 Total value: ${result['usd_total']:.2f}")
+        print(f"₿ BTC price: ${result['btc_price']:.2f}")
         
         # Test sats conversion
-        result_sats = await convert(btc_amount=10000000, sats=True, item='oil', direction='btc_to_item')
-        print(f"\n🪙 10M sats = {result_sats.quantity:.6f} barrels of oil")
+        result_sats = convert(btc_amount=10000000, sats=True, item='oil', direction='btc_to_item')
+        print(f"\n🪙 10M sats = {result_sats['quantity']:.6f} barrels of oil")
         
         # Test item to BTC conversion
-        result_reverse = await convert(quantity=1, item='gold', direction='item_to_btc')
-        print(f"\n🔄 1 ounce of gold = {result_reverse.quantity:.8f} BTC")
+        result_reverse = convert(quantity=1, item='gold', direction='item_to_btc')
+        print(f"\n🔄 1 ounce of gold = {result_reverse['quantity']:.8f} BTC")
         
         # Test item to sats conversion
-        result_reverse_sats = await convert(quantity=1, item='gold', direction='item_to_btc', sats=True)
-        print(f"🔄 1 ounce of gold = {result_reverse_sats.quantity:,} sats")
+        result_reverse_sats = convert(quantity=1, item='gold', direction='item_to_btc', sats=True)
+        print(f"🔄 1 ounce of gold = {result_reverse_sats['quantity']:,} sats")
         
         print("\n✅ All conversion tests passed")
         
@@ -0,0 +1,62 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+
+import server
+import main
+
+@pytest.fixture
+def client():
+    with patch('server.get_btc_quote', new=AsyncMock(return_value=(50000.0, "fresh"))) as quote:
+        yield TestClient(main.app), quote
+
+class TestConvertBatch:
+
+    def test_results_match_single_convert(self, client):
+        """Test that batch entries equal the matching /api/convert responses"""
+        http, _ = client
+        entries = [
+            {"item": "netflix", "direction": "btc_to_item", "btc_amount": 0.01},
+            {"item": "spotify", "direction": "btc_to_item", "btc_amount": 250000, "sats": True},
+            {"item": "netflix", "direction": "item_to_btc", "quantity": 3},
+            {"item": "movie_ticket", "direction": "item_to_btc", "quantity": 2, "sats": True}
+        ]
+
+        response = http.post("/api/convert/batch", json=entries)
+        assert response.status_code == 200
+        results = response.json()["results"]
+
+        for entry, result in zip(entries, results):
+            single = http.get("/api/convert", params=entry).json()
+            assert result["error"] is None
+            assert result["result"] == single
+
+    def test_invalid_entries_get_errors_in_place(self, client):
+        """Test that per-entry errors keep input order and don't fail the batch"""
+        http, _ = client
+        response = http.post("/api/convert/batch", json=[
+            {"item": "unobtainium", "btc_amount": 1},
+            {"item": "netflix", "btc_amount": 1},
+            {"item": "netflix", "direction": "item_to_btc"}
+        ])
+        results = response.json()["results"]
+
+        assert results[0]["error"] == "Item 'unobtainium' not found"
+        assert results[1]["result"]["usd_item"] == 15.49
+        assert results[2]["error"] == "quantity is required for item_to_btc conversion"
+
+    def test_btc_price_resolved_once(self, client):
+        """Test that one batch looks up the BTC price a single time"""
+        http, quote = client
+        http.post("/api/convert/batch", json=[
+            {"item": "netflix", "btc_amount": 1},
+            {"item": "spotify", "btc_amount": 1},
+            {"item": "netflix", "btc_amount": 2}
+        ])
+        quote.assert_awaited_once()
+
+    def test_batch_size_limit(self, client):
+        """Test that oversized batches are rejected"""
+        http, _ = client
+        entries = [{"item": "netflix", "btc_amount": 1}] * (server.MAX_BATCH_CONVERSIONS + 1)
+        assert http.post("/api/convert/batch", json=entries).status_code == 400
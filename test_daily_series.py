@@ -0,0 +1,194 @@
+import json
+import time
+from datetime import date, timedelta
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from cache_backend import DistributedPriceCache, MemoryCacheBackend
+from daily_series import DailySeries, DailySeriesParser, daily_series
+from fred_cache import SeriesRangeCache
+from price_cache import TTLCache
+from quota import ProviderQuota
+from settings import Settings
+
+WTI_RESPONSE = {
+    "name": "Crude Oil Prices WTI",
+    "interval": "daily",
+    "unit": "dollars per barrel",
+    "data": [
+        {"date": "2024-01-05", "value": "73.81"},
+        {"date": "2024-01-04", "value": "72.19"},
+        {"date": "2024-01-03", "value": "."},
+        {"date": "2024-01-02", "value": "70.38"}
+    ]
+}
+
+def parse_in_chunks(text, size):
+    parser = DailySeriesParser()
+    longest = 0
+    for i in range(0, len(text), size):
+        parser.feed(text[i:i + size])
+        longest = max(longest, len(parser._buffer))
+    return parser, longest
+
+class TestDailySeries:
+
+    def test_sorted_with_range_lookups(self):
+        series = DailySeries([("2024-01-03", 3.0), ("2024-01-01", 1.0), ("2024-01-02", 2.0)])
+        assert series.latest() == ("2024-01-03", 3.0)
+        assert series.slice("2024-01-02", "2024-01-31") == [("2024-01-02", 2.0), ("2024-01-03", 3.0)]
+        assert series.slice("2023-01-01", "2023-12-31") == []
+
+    def test_expiry(self):
+        series = DailySeries([("2024-01-01", 1.0)], fetched_at=time.time() - 600)
+        assert 290 < series.expires_in(900) <= 300
+        assert series.expires_in(60) == 0.0
+        assert series.expires_in(None) == float("inf")
+
+class TestDailySeriesParser:
+
+    @pytest.mark.parametrize("size", [1, 7, 4096])
+    def test_chunked_parse_matches_document(self, size):
+        parser, _ = parse_in_chunks(json.dumps(WTI_RESPONSE), size)
+        series = parser.close()
+        assert list(zip(series.dates, series.values)) == [
+            ("2024-01-02", 70.38), ("2024-01-04", 72.19), ("2024-01-05", 73.81)
+        ]
+
+    def test_only_current_point_buffered(self):
+        """Test that parsed points are dropped from the text buffer as they complete"""
+        days = [(date(2000, 1, 1) + timedelta(days=i)).isoformat() for i in range(5000)]
+        text = json.dumps(dict(WTI_RESPONSE, data=[{"date": day, "value": "70.00"} for day in reversed(days)]))
+        parser, longest = parse_in_chunks(text, 256)
+        assert parser.close().dates == days
+        assert longest < 512 < len(text)
+
+    def test_error_response_has_no_series(self):
+        parser, _ = parse_in_chunks(json.dumps({"Note": "Thank you for using Alpha Vantage!"}), 5)
+        assert parser.close() is None
+        assert parser.document() == {"Note": "Thank you for using Alpha Vantage!"}
+
+    def test_truncated_response_rejected(self):
+        parser, _ = parse_in_chunks(json.dumps(WTI_RESPONSE)[:120], 16)
+        with pytest.raises(ValueError):
+            parser.close()
+
+class TestOneFetchForSpotAndHistory:
+
+    @pytest.fixture
+    def alpha_vantage(self):
+        requested = []
+
+        def handler(request):
+            requested.append(request.url.params["function"])
+            return httpx.Response(200, json=WTI_RESPONSE)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        history = MagicMock()
+        history.closes_on_or_before.side_effect = lambda dates: [40000.0] * len(dates)
+        daily_series.clear()
+        with patch('items.get_http_client', return_value=client), \
+             patch('items.settings', Settings(alpha_vantage_api_key="test_key")), \
+             patch('items.alpha_vantage_quota', ProviderQuota("alpha_vantage", 5, 500)), \
+             patch('items.item_price_cache', TTLCache()), \
+             patch('server.btc_history', history), \
+             patch('server.get_http_client') as fred_client:
+            yield requested, fred_client
+        daily_series.clear()
+
+    @pytest.mark.asyncio
+    async def test_spot_price_is_newest_point(self, alpha_vantage):
+        import items
+        requested, _ = alpha_vantage
+        assert await items.fetch_item_price("oil") == 73.81
+        assert daily_series.get("WTI").latest() == ("2024-01-05", 73.81)
+        assert requested == ["WTI"]
+
+    def test_history_served_from_spot_fetch(self, alpha_vantage):
+        """Test that a chart request fetches the daily series once and the spot price reuses it"""
+        import items
+        import main
+        requested, fred_client = alpha_vantage
+        client = TestClient(main.app)
+        params = {"item": "oil", "from_date": "2024-01-01", "to_date": "2024-01-31"}
+
+        first = client.get("/api/historical", params=params)
+        again = client.get("/api/historical", params=params)
+        assert items.item_price_cache.get("oil") == 73.81
+
+        assert first.json() == {
+            "dates": ["2024-01-02", "2024-01-04", "2024-01-05"],
+            "btc_prices": [0.0017595, 0.00180475, 0.00184525]
+        }
+        assert again.json() == first.json()
+        assert requested == ["WTI"]
+        fred_client.assert_not_called()
+
+    def test_without_key_falls_back_to_fred(self, alpha_vantage):
+        import main
+        requested, fred_client = alpha_vantage
+        fred_response = MagicMock()
+        fred_response.json.return_value = {"observations": [{"date": "2024-01-01", "value": "2.00"}]}
+        fred_client.return_value.get = AsyncMock(return_value=fred_response)
+
+        with patch('items.settings', Settings()), \
+             patch('server.settings', Settings(fred_api_key="test_key")), \
+             patch('server.fred_range_cache', SeriesRangeCache(ttl=3600)):
+            data = TestClient(main.app).get("/api/historical", params={
+                "item": "natural_gas", "from_date": "2024-01-01", "to_date": "2024-01-31"
+            }).json()
+
+        assert data == {"dates": ["2024-01-01"], "btc_prices": [0.00005]}
+        assert requested == []
+        assert fred_client.return_value.get.await_args.kwargs["params"]["series_id"] == "MHHNGSP"
+
+    @pytest.mark.parametrize("target, shared", [
+        ('items.shared_price_table', MagicMock(is_follower=True)),
+        ('items.distributed_cache', DistributedPriceCache(MemoryCacheBackend()))
+    ])
+    def test_non_refreshing_node_charts_from_fred(self, alpha_vantage, target, shared):
+        """Test that a follower or a node behind a cache backend doesn't fetch the series per request"""
+        import main
+        requested, fred_client = alpha_vantage
+        fred_response = MagicMock()
+        fred_response.json.return_value = {"observations": [{"date": "2024-01-01", "value": "70.00"}]}
+        fred_client.return_value.get = AsyncMock(return_value=fred_response)
+
+        with patch(target, shared), \
+             patch('items.refresh_item_price') as refresh, \
+             patch('server.settings', Settings(fred_api_key="test_key")), \
+             patch('server.fred_range_cache', SeriesRangeCache(ttl=3600)):
+            data = TestClient(main.app).get("/api/historical", params={
+                "item": "oil", "from_date": "2024-01-01", "to_date": "2024-01-31"
+            }).json()
+
+        assert data == {"dates": ["2024-01-01"], "btc_prices": [0.00175]}
+        assert requested == []
+        refresh.assert_not_called()
+        assert fred_client.return_value.get.await_args.kwargs["params"]["series_id"] == "MCOILWTICO"
+
+    def test_cached_fallback_charts_from_fred(self, alpha_vantage):
+        """Test that chart requests don't retry Alpha Vantage while a fallback price is cached"""
+        import items
+        import main
+        requested, fred_client = alpha_vantage
+        fred_response = MagicMock()
+        fred_response.json.return_value = {"observations": [{"date": "2024-01-01", "value": "70.00"}]}
+        fred_client.return_value.get = AsyncMock(return_value=fred_response)
+        items.item_price_cache.set("oil", 70.0, items.FALLBACK_RETRY_TTL)
+
+        with patch('items.refresh_item_price') as refresh, \
+             patch('server.settings', Settings(fred_api_key="test_key")), \
+             patch('server.fred_range_cache', SeriesRangeCache(ttl=3600)):
+            client = TestClient(main.app)
+            for _ in range(3):
+                data = client.get("/api/historical", params={
+                    "item": "oil", "from_date": "2024-01-01", "to_date": "2024-01-31"
+                }).json()
+
+        assert data == {"dates": ["2024-01-01"], "btc_prices": [0.00175]}
+        assert requested == []
+        refresh.assert_not_called()
+        assert fred_client.return_value.get.await_args.kwargs["params"]["series_id"] == "MCOILWTICO"
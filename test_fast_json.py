@@ -0,0 +1,21 @@
+import json
+from unittest.mock import patch
+
+import fast_json
+import server
+
+class TestFastJson:
+
+    def test_model_bytes_matches_pydantic(self):
+        result = server.compute_conversion("btc_to_item", 0.5, None, False, 50000.0, "fresh", 2.5)
+
+        assert json.loads(fast_json.model_bytes(result)) == json.loads(result.model_dump_json())
+
+    def test_stdlib_fallback_without_orjson(self):
+        with patch('fast_json.orjson', None):
+            body = fast_json.dumps({"dates": ["2024-01-01"], "btc_prices": [5e-05]})
+
+        assert body == b'{"dates":["2024-01-01"],"btc_prices":[5e-05]}'
+
+    def test_catalog_encoded_once(self):
+        assert json.loads(server.ITEMS_CATALOG_JSON) == server.get_items_by_category()
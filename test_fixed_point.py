@@ -0,0 +1,89 @@
+import random
+from decimal import Decimal, ROUND_HALF_EVEN
+
+import pytest
+
+from conversion import btc_to_item, convert_amount, div_round, item_to_btc
+
+CASES = 2000
+
+def quantize(value: Decimal, places: str) -> float:
+    return float(value.quantize(Decimal(places), rounding=ROUND_HALF_EVEN))
+
+def decimal_btc_to_item(amount, sats, btc_price, item_price):
+    """The Decimal(str(...)) arithmetic the endpoints used before the integer core"""
+    btc_value = Decimal(str(amount))
+    if sats:
+        btc_value = btc_value / Decimal("100000000")
+    usd_total = btc_value * Decimal(str(btc_price))
+    return (
+        quantize(usd_total / Decimal(str(item_price)), "0.000001"),
+        quantize(Decimal(str(item_price)), "0.01"),
+        quantize(usd_total, "0.01"),
+        quantize(Decimal(str(btc_price)), "0.01")
+    )
+
+def decimal_item_to_btc(quantity, sats, btc_price, item_price):
+    usd_total = Decimal(str(quantity)) * Decimal(str(item_price))
+    btc_needed = usd_total / Decimal(str(btc_price))
+    if sats:
+        needed = quantize(btc_needed * Decimal("100000000"), "1")
+    else:
+        needed = quantize(btc_needed, "0.00000001")
+    return (
+        needed,
+        quantize(Decimal(str(item_price)), "0.01"),
+        quantize(usd_total, "0.01"),
+        quantize(Decimal(str(btc_price)), "0.01")
+    )
+
+def random_price(rng: random.Random, low: int, high: int) -> float:
+    """A USD price with up to 6 decimals (micro-USD precision)"""
+    return rng.randint(low * 1_000_000, high * 1_000_000) / 1_000_000
+
+@pytest.fixture
+def rng():
+    return random.Random(20240101)
+
+class TestMatchesDecimal:
+
+    def test_btc_to_item(self, rng):
+        for _ in range(CASES):
+            sats = rng.random() < 0.5
+            # Whole sats: the integer core's input precision
+            amount_sats = rng.randint(1, 21_000_000 * 100_000_000)
+            amount = amount_sats if sats else amount_sats / 100_000_000
+            btc_price = random_price(rng, 1_000, 500_000)
+            item_price = random_price(rng, 0, 1_000_000) or 0.01
+
+            expected = decimal_btc_to_item(amount, sats, btc_price, item_price)
+            assert tuple(btc_to_item(amount, sats, btc_price, item_price)) == expected, \
+                (amount, sats, btc_price, item_price)
+
+    def test_item_to_btc(self, rng):
+        for _ in range(CASES):
+            sats = rng.random() < 0.5
+            quantity = rng.randint(1, 10_000 * 1_000_000) / 1_000_000
+            btc_price = random_price(rng, 1_000, 500_000)
+            item_price = random_price(rng, 0, 1_000_000) or 0.01
+
+            expected = decimal_item_to_btc(quantity, sats, btc_price, item_price)
+            assert tuple(item_to_btc(quantity, sats, btc_price, item_price)) == expected, \
+                (quantity, sats, btc_price, item_price)
+
+class TestFixedPoint:
+
+    def test_div_round_is_half_even(self):
+        assert [div_round(n, 10) for n in (14, 15, 16, 25, 35)] == [1, 2, 2, 2, 4]
+
+    def test_examples(self):
+        assert convert_amount("btc_to_item", 0.1, False, 50000.0, 2.5) == (2000.0, 2.5, 5000.0, 50000.0)
+        assert convert_amount("item_to_btc", 1, True, 50000.0, 2000.0) == (4000000.0, 2000.0, 2000.0, 50000.0)
+
+    def test_compute_conversion_uses_core(self):
+        import server
+        single = server.compute_conversion("item_to_btc", None, 3, False, 43210.12, "fresh", 2.99)
+        assert single.model_dump() == {
+            "quantity": 0.00020759, "usd_item": 2.99, "usd_total": 8.97,
+            "btc_price": 43210.12, "btc_price_status": "fresh"
+        }
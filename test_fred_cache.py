@@ -0,0 +1,99 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.testclient import TestClient
+
+from fred_cache import SeriesRangeCache
+from settings import Settings
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestSeriesRangeCache:
+
+    def test_only_uncovered_subranges_are_missing(self):
+        """Test that requests overlapping cached intervals only miss the gaps"""
+        cache = SeriesRangeCache(ttl=3600)
+        cache.add("APU0000702111", "2023-01-01", "2023-06-30", [])
+        cache.add("APU0000702111", "2023-09-01", "2023-12-31", [])
+
+        assert cache.missing("APU0000702111", "2022-10-01", "2024-03-31") == [
+            ("2022-10-01", "2022-12-31"),
+            ("2023-07-01", "2023-08-31"),
+            ("2024-01-01", "2024-03-31")
+        ]
+        assert cache.missing("APU0000702111", "2023-02-01", "2023-05-01") == []
+
+    def test_adjacent_intervals_merge(self):
+        cache = SeriesRangeCache(ttl=3600)
+        cache.add("MSPUS", "2023-01-01", "2023-06-30", [])
+        cache.add("MSPUS", "2023-07-01", "2023-12-31", [])
+
+        assert cache.missing("MSPUS", "2023-01-01", "2023-12-31") == []
+
+    def test_slice_returns_sorted_observations(self):
+        """Test that observations from separate fetches come back in date order"""
+        cache = SeriesRangeCache(ttl=3600)
+        cache.add("MSPUS", "2023-07-01", "2023-12-31", [("2023-10-01", "410000"), ("2023-07-01", "420000")])
+        cache.add("MSPUS", "2023-01-01", "2023-06-30", [("2023-04-01", "415000"), ("2023-01-01", "430000")])
+
+        assert cache.slice("MSPUS", "2023-03-01", "2023-10-01") == [
+            ("2023-04-01", "415000"), ("2023-07-01", "420000"), ("2023-10-01", "410000")
+        ]
+
+    def test_series_expires_after_ttl(self):
+        clock = FakeClock()
+        cache = SeriesRangeCache(ttl=60, clock=clock)
+        cache.add("MSPUS", "2023-01-01", "2023-12-31", [("2023-01-01", "430000")])
+
+        clock.now += 60
+        assert cache.missing("MSPUS", "2023-01-01", "2023-12-31") == [("2023-01-01", "2023-12-31")]
+        assert cache.slice("MSPUS", "2023-01-01", "2023-12-31") == []
+
+    def test_version_only_for_covered_range(self):
+        clock = FakeClock()
+        cache = SeriesRangeCache(ttl=60, clock=clock)
+        cache.add("MSPUS", "2023-01-01", "2023-12-31", [])
+
+        assert cache.version("MSPUS", "2023-03-01", "2023-06-30") == 0.0
+        assert cache.version("MSPUS", "2023-03-01", "2024-06-30") is None
+        clock.now += 60
+        assert cache.version("MSPUS", "2023-03-01", "2023-06-30") is None
+
+class TestHistoricalRangeFetching:
+
+    def test_overlapping_request_fetches_only_new_months(self, tmp_path):
+        """Test that /api/historical asks FRED only for the uncached part of a range"""
+        import server
+        import main
+        from btc_history import BtcHistoryStore
+
+        def fred_response(url, params, timeout):
+            response = MagicMock()
+            response.json.return_value = {"observations": [
+                {"date": f"2024-{month:02d}-01", "value": "2.00"}
+                for month in range(1, 13)
+                if params["observation_start"] <= f"2024-{month:02d}-01" <= params["observation_end"]
+            ]}
+            return response
+
+        with patch('server.fred_range_cache', SeriesRangeCache(ttl=3600)), \
+             patch('server.btc_history', BtcHistoryStore(str(tmp_path / "btc.sqlite3"))), \
+             patch('server.get_btc_price', new=AsyncMock(return_value=40000.0)), \
+             patch('server.get_http_client') as mock_client, \
+             patch('server.settings', Settings(fred_api_key="test_key")):
+            mock_client.return_value.get = AsyncMock(side_effect=fred_response)
+            http = TestClient(main.app)
+
+            first = http.get("/api/historical", params={"item": "bread", "from_date": "2024-01-01", "to_date": "2024-06-30"})
+            second = http.get("/api/historical", params={"item": "bread", "from_date": "2024-03-01", "to_date": "2024-09-30"})
+
+        assert len(first.json()["dates"]) == 6
+        assert second.json()["dates"] == [f"2024-{month:02d}-01" for month in range(3, 10)]
+        requested = [call.kwargs["params"] for call in mock_client.return_value.get.await_args_list]
+        assert [(p["observation_start"], p["observation_end"]) for p in requested] == [
+            ("2024-01-01", "2024-06-30"), ("2024-07-01", "2024-09-30")
+        ]
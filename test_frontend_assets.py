@@ -0,0 +1,19 @@
+import os
+import pytest
+
+from settings import BASE_DIR
+
+def read_asset(*parts):
+    with open(os.path.join(BASE_DIR, *parts)) as f:
+        return f.read()
+
+class TestFrontendCopies:
+
+    @pytest.mark.parametrize("name", ["index.html", "script.js", "style.css"])
+    def test_vercel_public_copy_matches_root(self, name):
+        """Test that the copy Vercel serves from public/ is the same as the one the app serves"""
+        assert read_asset("public", name) == read_asset(name)
+
+    @pytest.mark.parametrize("name", ["script.js", "style.css"])
+    def test_static_copy_matches_root(self, name):
+        assert read_asset("static", name) == read_asset(name)
@@ -0,0 +1,139 @@
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.testclient import TestClient
+
+import server
+import main
+from btc_history import BtcHistoryStore
+from fred_cache import SeriesRangeCache
+from price_feed import PriceFeed
+from settings import Settings
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+class TestItemsCaching:
+
+    def test_catalog_is_cacheable_and_revalidates(self, client):
+        response = client.get("/api/items")
+        assert response.headers["cache-control"] == f"public, max-age={server.CATALOG_MAX_AGE}"
+
+        again = client.get("/api/items", headers={"If-None-Match": response.headers["etag"]})
+        assert again.status_code == 304
+
+    def test_catalog_built_once(self):
+        assert server.get_items_by_category() is server.get_items_by_category()
+
+class TestConvertCaching:
+
+    @pytest.fixture
+    def prices(self):
+        feed = PriceFeed()
+        now = time.time()
+        feed.update("btc", 50000.0, now - 100)
+        feed.update("gold", 2000.0, now - 600)
+        with patch('server.price_feed', feed), \
+             patch('server.get_btc_quote', new=AsyncMock(return_value=(50000.0, "fresh"))), \
+             patch.dict('server.btc_price_cache', {"price": 50000.0, "timestamp": time.monotonic() - 100}), \
+             patch('server.get_item_fetcher', return_value=AsyncMock(return_value=2000.0)):
+            yield feed
+
+    def test_max_age_from_freshest_expiry(self, client, prices):
+        response = client.get("/api/convert", params={"btc_amount": 1, "item": "gold"})
+
+        assert response.json()["quantity"] == 25.0
+        # Gold (15 min TTL) was fetched 10 minutes ago, BTC (5 min TTL) 100 s ago
+        max_age = int(response.headers["cache-control"].split("max-age=")[1])
+        assert 195 <= max_age <= 200
+        assert response.headers["last-modified"]
+
+    def test_conditional_requests(self, client, prices):
+        params = {"btc_amount": 1, "item": "gold"}
+        first = client.get("/api/convert", params=params)
+
+        with patch('server.compute_conversion') as compute:
+            assert client.get("/api/convert", params=params,
+                              headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+            assert client.get("/api/convert", params=params,
+                              headers={"If-Modified-Since": first.headers["last-modified"]}).status_code == 304
+        compute.assert_not_called()
+
+        prices.update("btc", 51000.0, time.time())
+        assert client.get("/api/convert", params=params,
+                          headers={"If-None-Match": first.headers["etag"]}).status_code == 200
+
+    def test_etag_from_prices_not_feed_versions(self, client):
+        """Test that workers with different prices never share an ETag, and equal prices do"""
+        fetched_at = time.time() - 100
+        params = {"btc_amount": 1, "item": "gold"}
+
+        def etag_with(btc_price, feed_updates):
+            feed = PriceFeed()
+            for _ in range(feed_updates):
+                feed.update("silver", 25.0 + feed.version, fetched_at)
+            feed.update("btc", btc_price, fetched_at)
+            feed.update("gold", 2000.0, fetched_at)
+            with patch('server.price_feed', feed), \
+                 patch('server.get_btc_quote', new=AsyncMock(return_value=(btc_price, "fresh"))), \
+                 patch('server.get_item_fetcher', return_value=AsyncMock(return_value=2000.0)):
+                return client.get("/api/convert", params=params).headers["etag"]
+
+        assert etag_with(50000.0, 0) != etag_with(65000.0, 0)
+        assert etag_with(50000.0, 0) == etag_with(50000.0, 3)
+
+class TestHistoricalCaching:
+
+    def test_etag_and_max_age_from_series_cache(self, client):
+        fred_response = MagicMock()
+        fred_response.raise_for_status.return_value = None
+        fred_response.json.return_value = {"observations": [{"date": "2024-01-01", "value": "2.00"}]}
+        history = MagicMock()
+        history.closes_on_or_before.return_value = [40000.0]
+        params = {"item": "bread", "from_date": "2024-01-01", "to_date": "2024-02-01"}
+
+        with patch('server.btc_history', history), \
+             patch('server.fred_range_cache', SeriesRangeCache(ttl=3600)), \
+             patch('server.get_http_client') as mock_client, \
+             patch('server.settings', Settings(fred_api_key="test_key")):
+            mock_client.return_value.get = AsyncMock(return_value=fred_response)
+            first = client.get("/api/historical", params=params)
+            again = client.get("/api/historical", params=params,
+                               headers={"If-None-Match": first.headers["etag"]})
+
+        assert first.headers["cache-control"] in ("public, max-age=3600", "public, max-age=3599")
+        assert again.status_code == 304
+
+    def test_conditional_request_answered_before_fetching(self, client, tmp_path):
+        """Test that a matching If-None-Match is answered from cache state alone"""
+        fred_response = MagicMock()
+        fred_response.raise_for_status.return_value = None
+        fred_response.json.return_value = {"observations": [{"date": "2024-01-01", "value": "2.00"}]}
+        history = BtcHistoryStore(str(tmp_path / "btc.sqlite3"))
+        history.upsert([("2023-12-01", 40000.0)])
+        params = {"item": "bread", "from_date": "2024-01-01", "to_date": "2024-02-01"}
+
+        with patch('server.btc_history', history), \
+             patch('server.fred_range_cache', SeriesRangeCache(ttl=3600)), \
+             patch('server.get_http_client') as mock_client, \
+             patch('server.settings', Settings(fred_api_key="test_key")):
+            mock_client.return_value.get = AsyncMock(return_value=fred_response)
+            first = client.get("/api/historical", params=params)
+            conditional = {"If-None-Match": first.headers["etag"]}
+
+            with patch.object(history, 'closes_on_or_before') as closes, \
+                 patch('server.model_bytes') as serialize:
+                again = client.get("/api/historical", params=params, headers=conditional)
+            closes.assert_not_called()
+            serialize.assert_not_called()
+            mock_client.return_value.get.assert_awaited_once()
+
+            # A backfilled close changes the chart
+            history.upsert([("2024-01-01", 42000.0)])
+            changed = client.get("/api/historical", params=params, headers=conditional)
+
+        assert again.status_code == 304
+        assert again.headers["etag"] == first.headers["etag"]
+        assert changed.status_code == 200
+        assert changed.json()["btc_prices"] == [round(2.0 / 42000.0, 8)]
@@ -0,0 +1,104 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from price_cache import TTLCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestTTLCache:
+
+    def test_entry_expires_after_ttl(self):
+        """Test that entries are served until their TTL runs out"""
+        clock = FakeClock()
+        cache = TTLCache(clock=clock)
+        cache.set("gold", 2000.0, ttl=60)
+
+        clock.now += 59
+        assert cache.get("gold") == 2000.0
+        clock.now += 1
+        assert cache.get("gold") is None
+        assert len(cache) == 0
+
+    def test_entry_without_ttl_never_expires(self):
+        """Test that ttl=None keeps constant prices forever"""
+        clock = FakeClock()
+        cache = TTLCache(clock=clock)
+        cache.set("netflix", 15.49, ttl=None)
+
+        clock.now += 10 ** 9
+        assert cache.get("netflix") == 15.49
+
+    def test_evicts_least_recently_used(self):
+        """Test that the cache stays within maxsize"""
+        cache = TTLCache(maxsize=2)
+        cache.set("oil", 75.0, ttl=None)
+        cache.set("gold", 2000.0, ttl=None)
+        cache.get("oil")
+        cache.set("silver", 25.0, ttl=None)
+
+        assert len(cache) == 2
+        assert cache.get("gold") is None
+        assert cache.get("oil") == 75.0
+
+    def test_hit_and_miss_counters(self):
+        """Test that stats report hits and misses"""
+        cache = TTLCache()
+        cache.get("oil")
+        cache.set("oil", 75.0, ttl=None)
+        cache.get("oil")
+        cache.get("oil")
+
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.6667)
+
+class TestCachedItemFetcher:
+
+    @pytest.mark.asyncio
+    async def test_fetcher_called_once_within_ttl(self):
+        """Test that repeated lookups reuse the cached item price"""
+        from items import cached_fetcher
+        fetcher = AsyncMock(return_value=2000.0)
+
+        with patch('items.item_price_cache', TTLCache()):
+            fetch = cached_fetcher("gold", fetcher, ttl=60)
+            assert await fetch() == 2000.0
+            assert await fetch() == 2000.0
+
+        fetcher.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_sync_fetcher_is_supported(self):
+        """Test that constant (non-async) fetchers can be awaited through the cache"""
+        from items import get_item_fetcher
+        price = await get_item_fetcher("brent_oil")()
+        assert price == 75.0
+
+    @pytest.mark.asyncio
+    async def test_fallback_cached_briefly_and_not_published(self):
+        """Test that a fallback price is retried soon and never stored or published as fresh"""
+        import items
+        from price_cache import FallbackPrice
+        clock = FakeClock()
+        cache = TTLCache(clock=clock)
+        fetcher = AsyncMock(side_effect=[FallbackPrice("bread", 2.50, "FRED down"), 2.75])
+
+        with patch('items.item_price_cache', cache), \
+             patch('items.save_item_price') as save:
+            fetch = items.cached_fetcher("bread", fetcher, ttl=24 * 60 * 60)
+            assert await fetch() == 2.50
+            save.assert_not_called()
+
+            clock.now += items.FALLBACK_RETRY_TTL - 1
+            assert await fetch() == 2.50
+            clock.now += 1
+            assert await fetch() == 2.75
+
+        assert fetcher.await_count == 2
+        save.assert_called_once()
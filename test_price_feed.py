@@ -0,0 +1,70 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import patch
+
+from price_cache import TTLCache
+from price_feed import PriceFeed
+
+class TestPriceFeed:
+
+    def test_versions_and_changes_since(self):
+        feed = PriceFeed()
+        feed.update("btc", 42000.0, 100.0)
+        feed.update("gold", 2000.0, 100.0)
+        seen = feed.version
+
+        assert not feed.update("gold", 2000.0, 100.0)  # unchanged
+        feed.update("btc", 43000.0, 200.0)
+
+        assert feed.changes_since(seen) == {
+            "version": 3, "prices": {"btc": {"price": 43000.0, "fetched_at": 200.0, "version": 3}}
+        }
+        assert set(feed.changes_since(0)["prices"]) == {"btc", "gold"}
+
+    @pytest.mark.asyncio
+    async def test_waiters_woken_by_update(self):
+        feed = PriceFeed()
+        waiter = asyncio.create_task(feed.wait_for_change(0, timeout=1))
+        await asyncio.sleep(0)
+
+        feed.update("btc", 42000.0)
+
+        assert await waiter
+        assert not await feed.wait_for_change(feed.version, timeout=0.01)
+
+class TestPriceEvents:
+
+    @pytest.mark.asyncio
+    async def test_snapshot_then_deltas(self):
+        import server
+        feed = PriceFeed()
+        feed.update("btc", 42000.0, 100.0)
+        feed.update("gold", 2000.0, 100.0)
+
+        with patch('server.price_feed', feed):
+            events = server.price_events(keepalive=0.01)
+            snapshot = await events.__anext__()
+            assert snapshot.startswith("event: snapshot\n")
+            assert set(json.loads(snapshot.split("data: ")[1])["prices"]) == {"btc", "gold"}
+
+            assert await events.__anext__() == ": keep-alive\n\n"
+
+            feed.update("gold", 2100.0, 200.0)
+            delta = await events.__anext__()
+            await events.aclose()
+
+        assert delta.startswith("event: delta\n")
+        assert json.loads(delta.split("data: ")[1]) == {
+            "version": 3, "prices": {"gold": {"price": 2100.0, "fetched_at": 200.0, "version": 3, "ttl": 900}}
+        }
+
+    @pytest.mark.asyncio
+    async def test_item_loads_reach_the_feed(self):
+        import items
+        feed = PriceFeed()
+
+        with patch('items.price_feed', feed), patch('items.item_price_cache', TTLCache()):
+            await items.load_item_price("big_mac", lambda: 5.69, None)
+
+        assert feed.entries["big_mac"]["price"] == 5.69
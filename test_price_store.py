@@ -0,0 +1,71 @@
+import time
+import pytest
+from unittest.mock import patch
+
+from price_cache import TTLCache
+from price_store import PersistentPriceStore
+
+@pytest.fixture
+def store(tmp_path):
+    return PersistentPriceStore(str(tmp_path / "prices.sqlite3"))
+
+class TestPersistentPriceStore:
+
+    def test_saved_prices_survive_reopen(self, store):
+        """Test that a new store instance loads what the previous one saved"""
+        store.save("btc", 42000.0, fetched_at=1700000000.0)
+        store.save("item:gold", 2000.0, fetched_at=1700000100.0)
+
+        reopened = PersistentPriceStore(store.path)
+        assert reopened.load_all() == {
+            "btc": (42000.0, 1700000000.0),
+            "item:gold": (2000.0, 1700000100.0)
+        }
+
+    def test_uses_wal_journal(self, store):
+        store.save("btc", 42000.0)
+        mode = store._connect().execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    @pytest.mark.asyncio
+    async def test_writes_are_batched_off_the_event_loop(self, store):
+        """Test that saves inside a running loop are flushed together in the background"""
+        store.save("item:oil", 75.0)
+        store.save("item:gold", 2000.0)
+        assert store._pending
+
+        await store._flush_task
+        assert not store._pending
+        assert set(PersistentPriceStore(store.path).load_all()) == {"item:oil", "item:gold"}
+
+class TestRestoreCachedPrices:
+
+    def test_items_restored_for_remaining_ttl(self):
+        """Test that fresh items go back into the cache and expired ones become last good prices"""
+        import items
+        now = time.time()
+        stored = {
+            "item:gold": (2100.0, now - 60),
+            "item:silver": (26.0, now - 2 * items.COMMODITY_TTL)
+        }
+
+        with patch('items.item_price_cache', TTLCache()) as cache, \
+             patch.dict('price_cache.last_good_prices', {}, clear=True):
+            assert items.restore_item_prices(stored) == 2
+            assert cache.get("gold") == 2100.0
+            assert cache.get("silver") is None
+            assert items.last_good_price("silver", 25.0) == 26.0
+
+    def test_btc_price_age_is_kept(self, store):
+        """Test that a restored BTC price older than its TTL is reported stale"""
+        import server
+        store.save("btc", 42000.0, fetched_at=time.time() - server.BTC_PRICE_TTL - 5)
+
+        with patch('server.price_store', store):
+            server.restore_cached_prices()
+        try:
+            assert server.btc_price_cache["price"] == 42000.0
+            age = time.monotonic() - server.btc_price_cache["timestamp"]
+            assert server.BTC_PRICE_TTL < age < server.BTC_PRICE_TTL + 60
+        finally:
+            server.btc_price_cache.update({"price": None, "timestamp": None})
@@ -0,0 +1,85 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+
+import server
+import main
+from price_feed import PriceFeed
+
+@pytest.fixture
+def feed():
+    feed = PriceFeed()
+    feed.update("btc", 42000.0, 100.0)
+    for item_name in server.ITEMS:
+        feed.update(item_name, 1.0, 100.0)
+    with patch('server.price_feed', feed), patch('server.warm_price_feed', new=AsyncMock()):
+        yield feed
+
+class TestPricesSnapshot:
+
+    def test_full_snapshot_with_units(self, feed):
+        response = TestClient(main.app).get("/api/prices")
+        data = response.json()
+
+        assert response.headers["etag"] == f'"{feed.epoch}-{feed.version}"'
+        assert data["epoch"] == feed.epoch and data["version"] == feed.version
+        assert set(data["prices"]) == {"btc", *server.ITEMS}
+        assert data["prices"]["btc"] == {"price": 42000.0, "fetched_at": 100.0, "ttl": 300, "unit": "BTC"}
+        assert data["prices"]["bread"]["unit"] == "loaf"
+
+    def test_not_modified_until_a_price_changes(self, feed):
+        client = TestClient(main.app)
+        etag = client.get("/api/prices").headers["etag"]
+
+        response = client.get("/api/prices", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        feed.update("btc", 43000.0, 200.0)
+        assert client.get("/api/prices", headers={"If-None-Match": etag}).status_code == 200
+
+    def test_since_returns_only_changes(self, feed):
+        seen = feed.version
+        feed.update("gold", 2100.0, 200.0)
+
+        data = TestClient(main.app).get("/api/prices", params={"since": seen, "epoch": feed.epoch}).json()
+
+        assert data == {
+            "epoch": feed.epoch,
+            "version": seen + 1,
+            "prices": {"gold": {"price": 2100.0, "fetched_at": 200.0, "ttl": 900, "unit": "ounce"}}
+        }
+
+    def test_since_from_another_process_gets_full_snapshot(self, feed):
+        """Test that a version issued by another worker or before a restart isn't trusted"""
+        client = TestClient(main.app)
+        other = PriceFeed()
+        other.update("btc", 65000.0, 300.0)
+        for item_name in server.ITEMS:
+            other.update(item_name, 2.0, 300.0)
+
+        with patch('server.price_feed', other):
+            elsewhere = client.get("/api/prices")
+        assert elsewhere.headers["etag"] != client.get("/api/prices").headers["etag"]
+
+        data = client.get("/api/prices", params={"since": elsewhere.json()["version"],
+                                                  "epoch": elsewhere.json()["epoch"]}).json()
+        assert set(data["prices"]) == {"btc", *server.ITEMS}
+        assert data["prices"]["btc"]["price"] == 42000.0
+
+class TestFeedWarming:
+
+    def test_restored_prices_refreshed_without_a_refresher(self):
+        """Test that prices already in the feed are still looked up, so expired ones get refetched"""
+        feed = PriceFeed()
+        feed.update("btc", 30000.0, 100.0)
+        for item_name in server.ITEMS:
+            feed.update(item_name, 1.0, 100.0)
+
+        with patch('server.price_feed', feed), \
+             patch('server.get_btc_quote', new=AsyncMock(return_value=(65000.0, "fresh"))) as quote, \
+             patch('server.get_item_prices', new=AsyncMock(return_value={})) as item_prices:
+            TestClient(main.app).get("/api/prices")
+
+        quote.assert_awaited_once()
+        item_prices.assert_awaited_once_with(list(server.ITEMS))
@@ -0,0 +1,48 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+
+import server
+import main
+from items import ITEMS
+
+@pytest.fixture
+def client():
+    prices = {item_name: 10.0 * (i + 1) for i, item_name in enumerate(ITEMS)}
+    prices["median_home"] = 420000.0
+    with patch('server.get_btc_quote', new=AsyncMock(return_value=(50000.0, "fresh"))):
+        with patch('server.get_item_prices', new=AsyncMock(side_effect=lambda names: {name: prices[name] for name in names})):
+            yield TestClient(main.app)
+
+class TestPurchasingPower:
+
+    def test_every_item_converted(self, client):
+        """Test that one amount is converted into every item"""
+        data = client.get("/api/purchasing-power", params={"btc_amount": 0.01}).json()
+
+        assert data["usd_total"] == 500.0
+        assert [entry["item"] for entry in data["items"]] == list(ITEMS)
+        netflix = next(entry for entry in data["items"] if entry["item"] == "netflix")
+        assert netflix["name"] == "Netflix (month)"
+        assert netflix["quantity"] == round(500.0 / netflix["usd_item"], 6)
+
+    def test_category_filter(self, client):
+        """Test that only items from the requested category are returned"""
+        data = client.get("/api/purchasing-power", params={"btc_amount": 0.01, "category": "Food"}).json()
+        assert {entry["category"] for entry in data["items"]} == {"Food"}
+
+    def test_unknown_category(self, client):
+        response = client.get("/api/purchasing-power", params={"btc_amount": 0.01, "category": "Yachts"})
+        assert response.status_code == 400
+
+    def test_affordable_only_and_sort(self, client):
+        """Test that unaffordable items are dropped and the rest sorted"""
+        data = client.get("/api/purchasing-power", params={
+            "btc_amount": 1000000, "sats": True, "affordable_only": True,
+            "sort": "quantity", "descending": True
+        }).json()
+
+        quantities = [entry["quantity"] for entry in data["items"]]
+        assert "median_home" not in [entry["item"] for entry in data["items"]]
+        assert all(quantity >= 1 for quantity in quantities)
+        assert quantities == sorted(quantities, reverse=True)
@@ -0,0 +1,82 @@
+import pytest
+
+from quota import ProviderQuota, TokenBucket
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1700000000.0
+
+    def __call__(self):
+        return self.now
+
+class TestTokenBucket:
+
+    def test_refills_evenly_over_period(self):
+        """Test that tokens come back at capacity / period per second"""
+        clock = FakeClock()
+        bucket = TokenBucket(5, 60.0, clock)
+        for _ in range(5):
+            bucket.take()
+        assert bucket.available() == 0
+
+        clock.now += 12
+        assert bucket.available() == pytest.approx(1.0)
+        clock.now += 600
+        assert bucket.available() == 5
+
+class TestProviderQuota:
+
+    def test_per_minute_limit(self):
+        """Test that the sixth call within a minute is denied"""
+        clock = FakeClock()
+        quota = ProviderQuota("alpha_vantage", 5, 500, clock=clock)
+        assert all(quota.try_acquire("high") for _ in range(5))
+        assert not quota.try_acquire("high")
+        assert quota.denied == 1
+
+        clock.now += 12
+        assert quota.try_acquire("high")
+
+    def test_low_priority_leaves_reserve(self):
+        """Test that low-priority items can't spend the reserved daily budget"""
+        clock = FakeClock()
+        quota = ProviderQuota("alpha_vantage", None, 10, clock=clock)
+        granted = 0
+        while quota.try_acquire("low"):
+            granted += 1
+        # 30% of the daily budget is reserved for higher priorities
+        assert granted == 7
+        assert quota.try_acquire("high")
+
+    def test_rate_limit_note_drains_minute_budget(self):
+        """Test that a provider rate-limit response stops further calls"""
+        quota = ProviderQuota("alpha_vantage", 5, 500, clock=FakeClock())
+        quota.report_rate_limited()
+        assert not quota.try_acquire("high")
+
+    def test_state_survives_restart(self, tmp_path):
+        """Test that a new quota instance resumes from the saved budget"""
+        clock = FakeClock()
+        path = str(tmp_path / "quota.json")
+        quota = ProviderQuota("alpha_vantage", 5, 500, state_path=path, clock=clock)
+        for _ in range(5):
+            quota.try_acquire("high")
+
+        restarted = ProviderQuota("alpha_vantage", 5, 500, state_path=path, clock=clock)
+        assert not restarted.try_acquire("high")
+        assert restarted.status()["day_tokens"] == pytest.approx(495)
+
+    def test_daily_limit_holds_from_the_first_day(self):
+        """Test that the day budget doesn't refill before the UTC day ends"""
+        clock = FakeClock()  # 2023-11-14 22:13:20 UTC
+        quota = ProviderQuota("alpha_vantage", None, 500, clock=clock)
+        granted = 0
+        while quota.try_acquire("high"):
+            granted += 1
+        assert granted == 500
+
+        clock.now += 60 * 60
+        assert not quota.try_acquire("high")
+        clock.now += 60 * 60  # past midnight
+        assert quota.try_acquire("high")
+        assert quota.status()["day_tokens"] == 499
@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from quota import ProviderQuota
+from refresher import PriceRefresher, RefreshJob, REFRESH_AHEAD
+
+def make_jobs(provider, count, ttl, calls):
+    async def refresh(name):
+        calls.append(name)
+    return [
+        RefreshJob(f"{provider}_{i}", provider, ttl, lambda name=f"{provider}_{i}": refresh(name))
+        for i in range(count)
+    ]
+
+class TestRefreshPlanning:
+
+    def test_calls_to_a_provider_are_spread_out(self):
+        """Test that first refreshes are staggered by the per-minute gap"""
+        jobs = make_jobs("alpha_vantage", 4, 900, [])
+        refresher = PriceRefresher(jobs, {"alpha_vantage": {"per_minute": 5, "per_day": 500}},
+                                   clock=lambda: 0.0)
+
+        assert [job.next_due for job in jobs] == [0.0, 12.0, 24.0, 36.0]
+        assert all(job.interval == 900 * REFRESH_AHEAD for job in jobs)
+
+    def test_interval_stretched_to_daily_budget(self):
+        """Test that jobs sharing a provider stay within its daily budget"""
+        jobs = make_jobs("alpha_vantage", 4, 900, [])
+        PriceRefresher(jobs, {"alpha_vantage": {"per_minute": 5, "per_day": 100}}, clock=lambda: 0.0)
+
+        # 4 jobs * 86400 / (100 calls per day, less one per job for the end of the day)
+        assert all(job.interval == pytest.approx(3600.0) for job in jobs)
+
+    def test_low_priority_jobs_never_hit_their_reserve(self):
+        """Test that a day of the planned schedule is never denied by the quota's reserves"""
+        async def refresh():
+            pass
+
+        jobs = [
+            RefreshJob(name, "alpha_vantage", 900, refresh, priority=priority)
+            for name, priority in [("oil", "high"), ("gold", "high"), ("natural_gas", "normal"), ("silver", "low")]
+        ]
+        PriceRefresher(jobs, {"alpha_vantage": {"per_minute": 5, "per_day": 500}}, clock=lambda: 0.0)
+
+        midnight = 1704067200.0  # 2024-01-01T00:00:00Z
+        now = [midnight]
+        quota = ProviderQuota("alpha_vantage", None, 500, clock=lambda: now[0])
+        calls = sorted(
+            (job.next_due + n * job.interval, job.priority)
+            for job in jobs for n in range(int(86400 // job.interval) + 1)
+            if job.next_due + n * job.interval < 86400
+        )
+        for offset, priority in calls:
+            now[0] = midnight + offset
+            assert quota.try_acquire(priority), f"{priority} refresh denied at {offset / 3600:.1f}h"
+        assert quota.denied == 0
+
+    def test_static_prices_refreshed_once(self):
+        """Test that jobs without a TTL are not rescheduled"""
+        jobs = make_jobs("static", 2, None, [])
+        PriceRefresher(jobs, {}, clock=lambda: 0.0)
+        assert all(job.interval is None for job in jobs)
+
+class TestRefreshLoop:
+
+    @pytest.mark.asyncio
+    async def test_prewarms_every_job(self):
+        """Test that the refresher fetches every job on start"""
+        calls = []
+        jobs = make_jobs("fred", 3, 86400, calls) + make_jobs("static", 2, None, calls)
+        refresher = PriceRefresher(jobs, {"fred": {"per_minute": 60000, "per_day": None}})
+
+        refresher.start()
+        await asyncio.sleep(0.05)
+        schedule = refresher.schedule()
+        await refresher.stop()
+
+        assert sorted(calls) == sorted(job.name for job in jobs)
+        assert schedule["static_0"]["next_refresh_in"] is None
+        assert schedule["fred_0"]["next_refresh_in"] > 0
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_is_recorded(self):
+        """Test that an upstream error is reported in the schedule"""
+        async def refresh():
+            raise RuntimeError("rate limited")
+
+        refresher = PriceRefresher([RefreshJob("gold", "alpha_vantage", 900, refresh)], {})
+        refresher.start()
+        await asyncio.sleep(0.01)
+        schedule = refresher.schedule()
+        await refresher.stop()
+
+        assert schedule["gold"]["last_error"] == "rate limited"
+
+    def test_batch_items_listed_in_schedule(self):
+        """Test that each item a batch job refreshes gets the job's next-due time"""
+        job = RefreshJob("fred_batch", "fred", 86400, AsyncMock(), items=["bread", "milk"])
+        schedule = PriceRefresher([job], {}, clock=lambda: 0.0).schedule()
+
+        assert schedule["bread"] == dict(schedule["fred_batch"], job="fred_batch")
+        assert schedule["milk"]["next_refresh_in"] == schedule["fred_batch"]["next_refresh_in"]
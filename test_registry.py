@@ -0,0 +1,139 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from cache_backend import DistributedPriceCache, MemoryCacheBackend
+from price_cache import TTLCache
+from registry import ItemRegistry, ItemSpec
+from settings import Settings
+
+@pytest.fixture
+def registry():
+    return ItemRegistry([
+        ItemSpec("gold", "Commodities", "ounce", "alpha_vantage", 2000.0, series="XAU"),
+        ItemSpec("bread", "Food", "loaf", "fred", 2.50, series="APU0000702111", bls_series="APU0000702111"),
+        ItemSpec("netflix", "Entertainment", "month", "static", 15.49),
+        ItemSpec("milk", "Food", "gallon", "fred", 3.80, series="APU0000709112")
+    ])
+
+class TestItemRegistry:
+
+    def test_lookup(self, registry):
+        assert registry["bread"].series == "APU0000702111"
+        assert "milk" in registry and "yacht" not in registry
+        assert registry.get("yacht") is None
+        assert list(registry) == ["gold", "bread", "netflix", "milk"]
+        assert dict(registry.bls_series()) == {"bread": "APU0000702111"}
+
+    def test_specs_have_no_instance_dict(self, registry):
+        with pytest.raises(AttributeError):
+            registry["gold"].colour = "yellow"
+
+    def test_duplicate_names_rejected(self):
+        spec = ItemSpec("gold", "Commodities", "ounce", "static", 2000.0)
+        with pytest.raises(ValueError):
+            ItemRegistry([spec, spec])
+
+    def test_plan_groups_by_provider(self, registry):
+        plan = registry.plan(["milk", "gold", "bread", "milk", "netflix"])
+        assert {provider: [spec.name for spec in specs] for provider, specs in plan.items()} == {
+            "fred": ["milk", "bread"], "alpha_vantage": ["gold"], "static": ["netflix"]
+        }
+
+    def test_plan_with_provider_override(self, registry):
+        plan = registry.plan(registry, lambda spec: "bls" if spec.bls_series else spec.provider)
+        assert [spec.name for spec in plan["bls"]] == ["bread"]
+
+    def test_transform(self):
+        from items import invert
+        spec = ItemSpec("silver", "Commodities", "ounce", "alpha_vantage", 25.0, transform=invert)
+        assert spec.to_usd(0.04) == 25.0
+
+class TestFetchPlanner:
+
+    @pytest.fixture
+    def fetchers(self):
+        fetchers = {
+            "alpha_vantage": AsyncMock(side_effect=lambda specs: {spec.name: 1.0 for spec in specs}),
+            "fred": AsyncMock(side_effect=lambda specs: {spec.name: 2.0 for spec in specs}),
+            "bls": AsyncMock(side_effect=lambda specs: {spec.name: 3.0 for spec in specs}),
+            "static": AsyncMock(side_effect=lambda specs: {spec.name: spec.fallback for spec in specs})
+        }
+        with patch.dict('items.PROVIDER_FETCHERS', fetchers), \
+             patch('items.item_price_cache', TTLCache()), \
+             patch('items.distributed_cache', DistributedPriceCache(MemoryCacheBackend())), \
+             patch('items.settings', Settings()):
+            yield fetchers
+
+    @pytest.mark.asyncio
+    async def test_one_call_per_provider(self, fetchers):
+        """Test that missing items are fetched with one call per provider"""
+        import items
+        names = ["bread", "milk", "coffee", "gold", "silver", "netflix"]
+
+        prices = await items.get_item_prices(names)
+
+        assert list(prices) == names
+        assert prices["bread"] == 2.0 and prices["gold"] == 1.0 and prices["netflix"] == 15.49
+        fetchers["fred"].assert_awaited_once()
+        fetchers["alpha_vantage"].assert_awaited_once()
+        fetchers["static"].assert_awaited_once()
+        assert [spec.name for spec in fetchers["fred"].await_args.args[0]] == ["bread", "milk", "coffee"]
+
+    @pytest.mark.asyncio
+    async def test_cached_items_not_fetched(self, fetchers):
+        import items
+        await items.get_item_prices(["bread", "milk"])
+        await items.get_item_prices(["bread", "milk"])
+        fetchers["fred"].assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_bls_items_batched_when_key_set(self, fetchers):
+        """Test that BLS-published items are grouped under BLS, the rest under their provider"""
+        import items
+        with patch('items.settings', Settings(bls_api_key="test_key")):
+            prices = await items.get_item_prices(["bread", "median_home"])
+
+        assert prices == {"bread": 3.0, "median_home": 2.0}
+        assert sorted(spec.name for spec in fetchers["bls"].await_args.args[0]) == sorted(items.bls_backed_items())
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_falls_back_to_own_provider(self, fetchers):
+        import items
+        fetchers["bls"].side_effect = RuntimeError("BLS down")
+        with patch('items.settings', Settings(bls_api_key="test_key", fred_api_key="test_key")):
+            assert await items.get_item_prices(["bread"]) == {"bread": 2.0}
+
+class TestProviderFetchers:
+
+    @pytest.mark.asyncio
+    async def test_fred_requests_pipelined_with_transform(self):
+        """Test that FRED items are fetched concurrently and index series converted to USD"""
+        import items
+        response = MagicMock()
+        response.raise_for_status.return_value = None
+        response.json.return_value = {"observations": [{"value": "150.0"}]}
+        specs = [items.ITEMS["new_car"], items.ITEMS["median_home"]]
+
+        with patch('items.get_http_client') as mock_client, \
+             patch('items.settings', Settings(fred_api_key="test_key")):
+            mock_client.return_value.get = AsyncMock(return_value=response)
+            prices = await items.fetch_fred(specs)
+
+        assert prices == {"new_car": 72000.0, "median_home": 150.0}
+        urls = [call.args[0] for call in mock_client.return_value.get.await_args_list]
+        assert any("series_id=CUSR0000SETA01" in url for url in urls)
+        assert any("series_id=MSPUS" in url for url in urls)
+
+class TestRefresherPlan:
+
+    def test_jobs_grouped_by_provider(self):
+        import server
+        with patch('items.settings', Settings()):
+            jobs = {job.name: job for job in server.build_price_refresher().jobs}
+
+        assert {"btc", "fred_batch", "bls_batch", "static_batch", "oil", "gold"} <= set(jobs)
+        assert jobs["fred_batch"].ttl == 24 * 60 * 60
+        assert jobs["static_batch"].ttl is None
+        assert "bread" not in jobs and "netflix" not in jobs
+        assert "netflix" in jobs["static_batch"].items
+        assert "bread" in jobs["fred_batch"].items
@@ -0,0 +1,146 @@
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from price_cache import TTLCache
+from shared_prices import SharedPriceTable, _HEADER, _SEQ, _SLOT
+
+KEYS = ["btc", "item:gold"]
+
+@pytest.fixture
+def tables(tmp_path):
+    path = str(tmp_path / "shared.bin")
+    leader, follower = SharedPriceTable(path), SharedPriceTable(path)
+    leader.open(KEYS)
+    follower.open(KEYS)
+    yield leader, follower
+    leader.close()
+    follower.close()
+
+class TestSharedPriceTable:
+
+    def test_only_one_worker_becomes_leader(self, tables):
+        leader, follower = tables
+
+        assert leader.try_become_leader()
+        assert not follower.try_become_leader()
+
+        # The lock is released when the leader goes away
+        leader.close()
+        assert follower.try_become_leader()
+
+    def test_leader_writes_are_visible_to_followers(self, tables):
+        leader, follower = tables
+        leader.try_become_leader()
+        assert follower.read("btc") is None
+
+        leader.publish("btc", 42000.0, 1700000000.0)
+        leader.publish("item:gold", 2000.0, 1700000001.0)
+
+        assert follower.read_all() == {"btc": (42000.0, 1700000000.0), "item:gold": (2000.0, 1700000001.0)}
+
+    def test_followers_cannot_write(self, tables):
+        leader, follower = tables
+        leader.try_become_leader()
+
+        follower.publish("btc", 1.0, 1.0)
+
+        assert leader.read("btc") is None
+
+    def test_torn_write_is_not_returned(self, tables):
+        """Test that readers skip a slot whose sequence number shows a write in progress"""
+        leader, follower = tables
+        leader.try_become_leader()
+        leader.publish("btc", 42000.0, 1700000000.0)
+
+        _SEQ.pack_into(leader._mm, _HEADER.size, 3)
+
+        assert follower.read("btc") is None
+
+    def test_changed_layout_is_reset_by_leader(self, tables, tmp_path):
+        leader, _ = tables
+        leader.try_become_leader()
+        leader.publish("btc", 42000.0, 1700000000.0)
+        leader.close()
+
+        other = SharedPriceTable(leader.path)
+        other.open(["btc", "item:silver", "item:gold"])
+        try:
+            assert other.read("btc") is None  # slot count no longer matches
+            other.try_become_leader()
+            assert other.read("btc") == (42000.0, 1700000000.0)
+            assert other.read("item:silver") is None
+            assert _SLOT.unpack_from(other._mm, _HEADER.size + _SLOT.size)[3].rstrip(b"\0") == b"item:silver"
+        finally:
+            other.close()
+
+class TestSyncSharedPrices:
+
+    def test_follower_copies_leader_prices_into_local_caches(self, tables):
+        import server
+        leader, follower = tables
+        leader.try_become_leader()
+        leader.publish("btc", 42000.0, time.time() - 10)
+        leader.publish("item:gold", 2000.0, time.time())
+
+        with patch('server.shared_price_table', follower), \
+             patch('items.item_price_cache', TTLCache()) as cache, \
+             patch.dict('server.btc_price_cache', {"price": None, "timestamp": None}):
+            assert server.sync_shared_prices() is False
+            assert server.btc_price_cache["price"] == 42000.0
+            assert time.monotonic() - server.btc_price_cache["timestamp"] >= 10
+            assert cache.get("gold") == 2000.0
+
+class TestFollowerNeverFetches:
+
+    @pytest.fixture
+    def follower(self, tables):
+        leader, follower = tables
+        leader.try_become_leader()
+        fetchers = {provider: AsyncMock(return_value={}) for provider in ("alpha_vantage", "fred", "bls", "static")}
+        with patch('server.shared_price_table', follower), \
+             patch('items.shared_price_table', follower), \
+             patch.dict('items.PROVIDER_FETCHERS', fetchers), \
+             patch('items.item_price_cache', TTLCache()), \
+             patch.dict('price_cache.last_good_prices', {}, clear=True), \
+             patch.dict('server.btc_price_cache', {"price": None, "timestamp": None}), \
+             patch('server.refresh_btc_price', new=AsyncMock()) as refresh_btc, \
+             patch('server._refresh_btc_price_in_background') as background:
+            yield leader, fetchers, [refresh_btc, background]
+
+    @pytest.mark.asyncio
+    async def test_nothing_published_yet(self, follower):
+        """Test that a follower without the leader's prices answers 503 / fallbacks instead of fetching"""
+        import items
+        import server
+        from fastapi import HTTPException
+        _, fetchers, btc_fetches = follower
+
+        with pytest.raises(HTTPException) as error:
+            await server.get_btc_quote()
+        assert error.value.status_code == 503
+        assert await items.get_item_prices(["gold", "bread"]) == {"gold": 2000.0, "bread": 2.50}
+        assert await items.get_item_fetcher("oil")() == 75.0
+        assert await items.refresh_item_price("silver") == 25.0
+
+        for fetch in list(fetchers.values()) + btc_fetches:
+            fetch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_expired_prices_served_stale_until_leader_refreshes(self, follower):
+        import items
+        import server
+        leader, fetchers, btc_fetches = follower
+        leader.publish("btc", 42000.0, time.time() - 3600)
+        leader.publish("item:gold", 2000.0, time.time() - 3600)
+
+        assert await server.get_btc_quote() == (42000.0, "stale")
+        assert await items.get_item_prices(["gold"]) == {"gold": 2000.0}
+
+        leader.publish("btc", 43000.0, time.time())
+        leader.publish("item:gold", 2100.0, time.time())
+        assert await server.get_btc_quote() == (43000.0, "fresh")
+        assert await items.get_item_fetcher("gold")() == 2100.0
+
+        for fetch in list(fetchers.values()) + btc_fetches:
+            fetch.assert_not_called()
@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+
+from singleflight import SingleFlight
+
+class TestSingleFlight:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        """Test that concurrent calls for one key run the function once"""
+        flight = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return 42000.0
+
+        waiters = [asyncio.create_task(flight.do("btc", fetch)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert results == [42000.0] * 10
+        assert calls == 1
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_error_is_shared(self):
+        """Test that every waiter sees the error of the shared call"""
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            *(flight.do("btc", fetch) for _ in range(3)), return_exceptions=True
+        )
+
+        assert calls == 1
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_new_call_after_completion(self):
+        """Test that a finished call is not reused for later callers"""
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.do("btc", fetch) == 1
+        assert await flight.do("btc", fetch) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test that cancelling the first caller leaves the shared call running"""
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "ok"
+
+        first = asyncio.create_task(flight.do("btc", fetch))
+        second = asyncio.create_task(flight.do("btc", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == "ok"
+        with pytest.raises(asyncio.CancelledError):
+            await first